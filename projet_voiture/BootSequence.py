@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+BootSequence.py
+---------------
+Ce module décrit l'initialisation du matériel sous forme de graphe de dépendances.
+Les étapes indépendantes (capteurs GPIO, capteur RGB, PCA9685...) sont lancées en parallèle
+dans un pool de threads ; une étape ne démarre que lorsque toutes ses dépendances sont terminées.
+La durée de chaque étape est mesurée, ce qui permet d'afficher le chemin critique jusqu'à
+l'état "prêt à courir".
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la classe BootSequence pour initialiser le matériel en parallèle.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class BootSequence:
+    """
+    Graphe d'étapes d'initialisation exécuté en parallèle.
+
+    Exemple :
+        boot = BootSequence()
+        boot.add("moteurs", ControllerMotor)
+        boot.add("servo", ControllerServo, depends_on=["moteurs"])   # même PCA9685
+        boot.add("balayage", sweep, depends_on=["servo"], essential=False)
+        results = boot.run(fast=True)
+    """
+
+    def __init__(self, name="démarrage", logger=None, log_file="lancement_voiture"):
+        """
+        :param name: Nom de la séquence (utilisé dans les journaux).
+        :param logger: Instance de Logging (optionnelle, sinon affichage console).
+        :param log_file: Nom du fichier de log utilisé avec ``logger``.
+        """
+        self.name = name
+        self.logger = logger
+        self.log_file = log_file
+        self.tasks = {}
+        self.results = {}
+        self.timings = {}
+        self.skipped = []
+
+    def add(self, name, func, depends_on=(), essential=True):
+        """
+        Ajoute une étape au graphe.
+
+        :param name: Nom unique de l'étape.
+        :param func: Fonction sans argument exécutée pour l'étape ; sa valeur de retour est conservée.
+        :param depends_on: Noms des étapes qui doivent être terminées avant celle-ci.
+        :param essential: False si l'étape peut être sautée en démarrage rapide.
+        """
+        if name in self.tasks:
+            raise ValueError(f"L'étape '{name}' existe déjà.")
+        self.tasks[name] = (func, tuple(depends_on), essential)
+
+    def result(self, name):
+        """Retourne la valeur produite par une étape terminée."""
+        return self.results[name]
+
+    def _selected_tasks(self, fast):
+        """Retourne les étapes à exécuter et vérifie que le graphe est cohérent (dépendances, cycles)."""
+        selected = {name: task for name, task in self.tasks.items() if task[2] or not fast}
+        self.skipped = [name for name in self.tasks if name not in selected]
+        for name, (_, deps, _) in selected.items():
+            for dep in deps:
+                if dep not in self.tasks:
+                    raise ValueError(f"L'étape '{name}' dépend de '{dep}', qui n'existe pas.")
+                if dep not in selected:
+                    raise ValueError(f"L'étape essentielle '{name}' dépend de '{dep}', qui n'est pas essentielle.")
+
+        # Détection de cycle par parcours en profondeur
+        state = {}
+
+        def visit(name, chemin):
+            if state.get(name) == "fait":
+                return
+            if state.get(name) == "en cours":
+                raise ValueError(f"Dépendance circulaire : {' -> '.join(chemin + [name])}")
+            state[name] = "en cours"
+            for dep in selected[name][1]:
+                visit(dep, chemin + [name])
+            state[name] = "fait"
+
+        for name in selected:
+            visit(name, [])
+        return selected
+
+    def run(self, fast=False, max_workers=None):
+        """
+        Exécute le graphe.
+
+        :param fast: Démarrage rapide : les étapes non essentielles sont sautées.
+        :param max_workers: Nombre maximal de threads (par défaut : une par étape).
+        :return: Dictionnaire {nom de l'étape: valeur retournée}.
+        :raises RuntimeError: Si une étape échoue (les étapes qui en dépendent ne sont pas lancées).
+        """
+        selected = self._selected_tasks(fast)
+        self.results = {}
+        self.timings = {}
+        remaining = dict(selected)
+        running = {}
+        errors = {}
+        t0 = time.perf_counter()
+
+        def execute(name, func):
+            start = time.perf_counter()
+            try:
+                return func()
+            finally:
+                self.timings[name] = (start - t0, time.perf_counter() - t0)
+
+        with ThreadPoolExecutor(max_workers=max_workers or max(1, len(selected))) as pool:
+            while remaining or running:
+                for name, (func, deps, _) in list(remaining.items()):
+                    if any(dep in errors for dep in deps):
+                        errors[name] = RuntimeError("dépendance en échec")
+                        del remaining[name]
+                    elif all(dep in self.results for dep in deps):
+                        running[pool.submit(execute, name, func)] = name
+                        del remaining[name]
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except Exception as e:
+                        errors[name] = e
+                        self._log(f"Échec de l'étape '{name}' : {e}", "ALERT")
+
+        # Étapes jamais lancées car une dépendance indirecte a échoué
+        for name in remaining:
+            errors[name] = RuntimeError("dépendance en échec")
+
+        self._log(self.report(), "INFO")
+        if errors:
+            details = ", ".join(f"{name} ({e})" for name, e in errors.items())
+            raise RuntimeError(f"Initialisation '{self.name}' en échec : {details}")
+        return self.results
+
+    def critical_path(self):
+        """
+        Retourne le chemin critique de la dernière exécution : la chaîne de dépendances
+        qui se termine le plus tard, de la première étape à la dernière.
+        """
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n][1])
+        chemin = [name]
+        while True:
+            deps = [dep for dep in self.tasks[name][1] if dep in self.timings]
+            if not deps:
+                break
+            name = max(deps, key=lambda n: self.timings[n][1])
+            chemin.append(name)
+        return list(reversed(chemin))
+
+    def report(self):
+        """Retourne un résumé texte des durées de chaque étape et du chemin critique."""
+        lignes = [f"Initialisation '{self.name}' :"]
+        for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1][0]):
+            lignes.append(f"  {name:<20} début {start * 1000:7.1f} ms  durée {(end - start) * 1000:7.1f} ms")
+        for name in self.skipped:
+            lignes.append(f"  {name:<20} sautée (démarrage rapide)")
+        if self.timings:
+            total = max(end for _, end in self.timings.values())
+            lignes.append(f"  Chemin critique : {' -> '.join(self.critical_path())} ({total * 1000:.1f} ms)")
+        return "\n".join(lignes)
+
+    def _log(self, message, level):
+        if self.logger is not None:
+            self.logger.log(message, self.log_file, level)
+        else:
+            print(message)
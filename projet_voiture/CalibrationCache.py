@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+CalibrationCache.py
+-------------------
+Ce module conserve sur disque les résultats de calibration (référence RGB, position du servo...)
+afin d'éviter de recalibrer à chaque démarrage lorsque rien n'a changé.
+
+Chaque section est horodatée. Une section est considérée comme invalide si le fichier a été
+écrit par une autre version du format, si elle est trop ancienne, ou si l'appelant détecte
+que la configuration a changé depuis (voir ``get(..., expected=...)``).
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la classe CalibrationCache pour lire et écrire le cache de calibration.
+"""
+
+import json
+import os
+import threading
+import time
+
+CACHE_VERSION = 2  # 2 : la calibration RGB ne contient plus de modèles de couleur a priori
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calibration_cache.json")
+DEFAULT_MAX_AGE = 7 * 24 * 3600  # Une semaine
+
+
+class CalibrationCache:
+    """
+    Cache persistant des calibrations, stocké au format JSON.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age=DEFAULT_MAX_AGE):
+        """
+        :param path: Chemin du fichier de cache.
+        :param max_age: Âge maximal (en secondes) d'une section avant recalibration.
+        """
+        if max_age <= 0:
+            raise ValueError("L'âge maximal du cache doit être supérieur à zéro.")
+        self.path = path
+        self.max_age = max_age
+        # Les étapes d'initialisation parallèles peuvent écrire leurs sections en même temps
+        self._lock = threading.Lock()
+        self._sections = self._load()
+
+    def _load(self):
+        """Charge le fichier de cache. Un fichier absent, corrompu ou d'une autre version donne un cache vide."""
+        try:
+            with open(self.path, "r") as f:
+                content = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Cache de calibration illisible ({e}) : il sera reconstruit.")
+            return {}
+        if not isinstance(content, dict) or content.get("version") != CACHE_VERSION:
+            print("Cache de calibration d'une autre version : il sera reconstruit.")
+            return {}
+        return content.get("sections", {})
+
+    def _save(self):
+        """Écrit le cache de façon atomique (fichier temporaire puis renommage)."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": CACHE_VERSION, "sections": self._sections}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, section, expected=None):
+        """
+        Retourne les données d'une section si elle est valide.
+
+        :param section: Nom de la section (ex : "rgb", "servo").
+        :param expected: Dictionnaire de valeurs qui doivent être identiques à celles enregistrées
+                         (paramètres de configuration dont dépend la calibration).
+        :return: Données de la section, ou None si elle est absente, périmée ou obsolète.
+        """
+        entry = self._sections.get(section)
+        if entry is None:
+            return None
+        age = time.time() - entry.get("timestamp", 0)
+        if not 0 <= age <= self.max_age:
+            print(f"Cache de calibration '{section}' périmé ({age / 3600:.1f} h).")
+            return None
+        data = entry.get("data", {})
+        if expected is not None:
+            for key, value in expected.items():
+                if data.get(key) != value:
+                    print(f"Cache de calibration '{section}' obsolète : '{key}' a changé.")
+                    return None
+        return data
+
+    def age(self, section):
+        """Retourne l'âge (en secondes) d'une section, ou None si elle est absente."""
+        entry = self._sections.get(section)
+        return None if entry is None else time.time() - entry.get("timestamp", 0)
+
+    def put(self, section, data):
+        """
+        Enregistre les données d'une section avec l'heure courante et sauvegarde le cache.
+
+        :param section: Nom de la section.
+        :param data: Données sérialisables en JSON.
+        """
+        with self._lock:
+            # Relecture du fichier : un autre processus (mode multiprocessus) a pu y écrire une autre section
+            self._sections = self._load()
+            self._sections[section] = {"timestamp": time.time(), "data": data}
+            self._save()
+
+    def invalidate(self, section=None):
+        """
+        Supprime une section (ou tout le cache si ``section`` vaut None).
+        """
+        with self._lock:
+            if section is None:
+                self._sections = {}
+            else:
+                self._sections = self._load()
+                self._sections.pop(section, None)
+            self._save()
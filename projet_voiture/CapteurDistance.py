@@ -6,13 +6,21 @@ Ce module gère la lecture d'un capteur de distance (ultrason) pour le projet vo
 Chaque instance de la classe représente UN capteur.
 Le filtrage de la mesure se fait en réalisant plusieurs lectures et en en faisant la moyenne.
 
+``read`` retourne une mesure (Reading) portant un statut de validité au lieu de lever une
+exception : la boucle de contrôle traite chaque cas (voir ControllerCar.distance_from_reading) et
+une mesure manquée ne l'arrête plus. Chaque capteur compte ses mesures par statut (``counts``).
+``get_distance`` garde son comportement historique (exceptions hors plage).
+
 Auteur : Vergeylen Anthony
 Date   : 08-04-2025
 Quoi   : Fournit la classe CapteurDistance pour obtenir une mesure filtrée d'un capteur unique.
 """
 
 import time
-from gpiozero import DistanceSensor
+from collections import Counter, namedtuple
+from Hardware import lazy_attr
+
+DistanceSensor = lazy_attr("gpiozero", "DistanceSensor")
 
 VALID_PIN_PAIRS = [
     (11, 9),  # Couple gauche
@@ -20,6 +28,28 @@ VALID_PIN_PAIRS = [
     (6, 5)     # Couple avant
 ]
 
+DISTANCE_MIN = 2    # Plus petite distance mesurable (cm)
+DISTANCE_MAX = 400  # Plus grande distance mesurable (cm)
+
+# Statuts d'une mesure
+OK = "ok"                    # Distance dans la plage du capteur
+TROP_PROCHE = "trop_proche"  # Obstacle plus proche que DISTANCE_MIN
+PAS_D_ECHO = "pas_d_echo"    # L'onde n'est pas revenue (aucune distance)
+SATURE = "sature"            # Rien dans la portée : distance au moins égale à la portée
+STATUSES = (OK, TROP_PROCHE, PAS_D_ECHO, SATURE)
+
+
+class Reading(namedtuple("Reading", ("distance", "status"))):
+    """
+    Mesure filtrée d'un capteur : distance moyenne en cm (None sans écho) et statut.
+    """
+    __slots__ = ()
+
+    @property
+    def valid(self):
+        return self.status == OK
+
+
 class CapteurDistance:
     """
     Classe de gestion d'un capteur de distance ultrason.
@@ -58,28 +88,56 @@ class CapteurDistance:
     
         self.sensor_sample_count = sensor_sample_count
         self.sensor_sample_delay = sensor_sample_delay
+        # Portée (cm) : gpiozero renvoie la distance maximale quand aucun écho ne revient à temps
+        self.range = min(DISTANCE_MAX, max_distance * 100)
+        self.counts = Counter()  # Statut -> nombre de mesures
+        self.last_error = None   # Dernière erreur du capteur (mesure sans écho)
 
-    def get_distance(self):
+    def read(self, sample_count=None):
         """
-        Retourne la distance mesurée par le capteur après filtrage (moyenne de plusieurs lectures).
+        Mesure filtrée (moyenne de plusieurs lectures) avec son statut, sans exception.
 
-        :return: Distance en centimètres.
+        :param sample_count: Nombre de lectures moyennées (``sensor_sample_count`` par défaut) ;
+                             1 pour une lecture rapide, sans attente.
+        :return: Reading ; la distance est la moyenne mesurée (même hors plage), None sans écho.
         """
+        count = self.sensor_sample_count if sample_count is None else sample_count
         total = 0.0
         try:
-            for _ in range(self.sensor_sample_count):
+            for i in range(count):
                 total += self.sensor.distance  # distance en mètres
-                time.sleep(self.sensor_sample_delay)
-                distance_total = (total / self.sensor_sample_count) * 100
-            if distance_total < 2:
-                print("Obstacle trop proche")
-                raise ValueError("Distance trop proche")
-            if distance_total > 400:
-                print("Obstacle trop loin")
-                raise ValueError("Distance trop loin")
+                if i < count - 1:
+                    time.sleep(self.sensor_sample_delay)  # Attente entre deux lectures seulement
+        except RuntimeError as e:
+            self.last_error = e
+            reading = Reading(None, PAS_D_ECHO)
+        else:
+            distance = (total / count) * 100
+            if distance < DISTANCE_MIN:
+                reading = Reading(distance, TROP_PROCHE)
+            elif distance > DISTANCE_MAX or distance >= self.range:
+                reading = Reading(distance, SATURE)
+            else:
+                reading = Reading(distance, OK)
+        self.counts[reading.status] += 1
+        return reading
 
-            return distance_total
+    def get_distance(self):
+        """
+        Retourne la distance mesurée par le capteur après filtrage (moyenne de plusieurs lectures).
 
-        except RuntimeError as e:
-            print(f"Erreur capteur : {e}")
-            raise RuntimeError(f"Onde pas revenu : {e}")
\ No newline at end of file
+        :return: Distance en centimètres.
+        :raises ValueError: Si la distance est hors de la plage du capteur.
+        :raises RuntimeError: Si l'onde n'est pas revenue.
+        """
+        reading = self.read()
+        if reading.status == PAS_D_ECHO:
+            print(f"Erreur capteur : {self.last_error}")
+            raise RuntimeError(f"Onde pas revenu : {self.last_error}")
+        if reading.status == TROP_PROCHE:
+            print("Obstacle trop proche")
+            raise ValueError("Distance trop proche")
+        if reading.distance > DISTANCE_MAX:
+            print("Obstacle trop loin")
+            raise ValueError("Distance trop loin")
+        return reading.distance
@@ -14,21 +14,209 @@ Vérfié : Matteo Di Leto
 """
 
 import time
-import board
-import busio
-import adafruit_tcs34725
 import threading
+import numpy as np
+from Hardware import lazy, lazy_attr
+
+board = lazy("board")
+busio = lazy("busio")
+adafruit_tcs34725 = lazy("adafruit_tcs34725")
+DigitalInputDevice = lazy_attr("gpiozero", "DigitalInputDevice")
+
+# Paramètres du mode départ rapide
+FAST_INTEGRATION_TIME = 2.4   # Temps d'intégration minimal du TCS34725 (ms)
+FAST_PERSISTENCE = 2          # Cycles consécutifs hors seuils avant interruption
+FAST_CLEAR_MARGIN = 0.15      # Marge relative autour du niveau "clear" de référence
+
+# Réglages possibles du TCS34725 pour l'auto-calibre
+GAINS = (1, 4, 16, 60)
+INTEGRATION_TIMES = (2.4, 4.8, 9.6, 19.2, 38.4, 76.8, 153.6, 307.2, 614.4)   # ms
+
+# Couleurs du feu : classées par le classifieur statistique une fois toutes deux calibrées
+# devant le vrai feu avec calibrate_class(), par la couleur dominante jusque-là.
+LIGHT_COLORS = ("rouge", "vert")
+
+
+class ColorClassifier:
+    """
+    Classifieur statistique de couleur.
+
+    Chaque classe ("fond", "rouge", "vert") est modélisée par une gaussienne (moyenne et
+    covariance) sur la chromaticité (R/C, G/C, B/C) normalisée par le canal "clear".
+    La normalisation rend le modèle insensible au niveau de lumière ambiante et au temps
+    d'intégration ; la classification d'un lot de mesures est entièrement vectorisée.
+
+    Auteur : Vergeylen Anthony
+    Quoi   : Calcule la classe la plus probable de mesures brutes (R, G, B, clear).
+    """
+
+    UNKNOWN = "indéterminé"
+
+    def __init__(self, regularization=1e-5, max_distance=4.0):
+        """
+        :param regularization: Terme ajouté à la diagonale des covariances (évite les matrices singulières).
+        :param max_distance: Distance de Mahalanobis au-delà de laquelle une mesure est "indéterminé".
+        """
+        self.regularization = regularization
+        self.max_distance = max_distance
+        self.labels = []
+        self._models = {}
+        self._means = np.empty((0, 3))
+        self._inv_covs = np.empty((0, 3, 3))
+        self._log_dets = np.empty(0)
+
+    @staticmethod
+    def chromaticity(samples):
+        """
+        Convertit des mesures brutes (N, 4) en chromaticités (N, 3).
+
+        :param samples: Mesures (R, G, B, clear), une par ligne.
+        :return: Tableau numpy des rapports R/C, G/C, B/C.
+        """
+        samples = np.asarray(samples, dtype=float).reshape(-1, 4)
+        clear = np.maximum(samples[:, 3:4], 1.0)
+        return samples[:, :3] / clear
+
+    def fit(self, label, samples):
+        """
+        Construit le modèle d'une classe à partir de mesures brutes.
+
+        :param label: Nom de la classe.
+        :param samples: Mesures (R, G, B, clear), une par ligne.
+        """
+        x = self.chromaticity(samples)
+        if len(x) == 0:
+            raise ValueError(f"Aucune mesure pour calibrer la classe '{label}'.")
+        cov = np.cov(x, rowvar=False) if len(x) > 1 else np.zeros((3, 3))
+        self.set_model(label, x.mean(axis=0), cov)
+
+    def set_model(self, label, mean, cov):
+        """
+        Enregistre (ou remplace) le modèle gaussien d'une classe.
+
+        :param label: Nom de la classe.
+        :param mean: Moyenne de la chromaticité (3 valeurs).
+        :param cov: Matrice de covariance 3x3.
+        """
+        mean = np.asarray(mean, dtype=float).reshape(3)
+        cov = np.asarray(cov, dtype=float).reshape(3, 3)
+        sign, _ = np.linalg.slogdet(cov + self.regularization * np.eye(3))
+        if sign <= 0:
+            raise ValueError(f"Covariance invalide pour la classe '{label}'.")
+        self._models[label] = (mean, cov)
+
+        # Les modèles sont empilés pour que classify() traite toutes les classes d'un coup
+        self.labels = list(self._models)
+        covs = np.array([c for _, c in self._models.values()]) + self.regularization * np.eye(3)
+        self._means = np.array([m for m, _ in self._models.values()])
+        self._inv_covs = np.linalg.inv(covs)
+        self._log_dets = np.linalg.slogdet(covs)[1]
+
+    def model(self, label):
+        """Retourne (moyenne, covariance) de la classe ``label``."""
+        return self._models[label]
+
+    def has_model(self, label):
+        return label in self._models
+
+    def classify(self, samples):
+        """
+        Classe un lot de mesures brutes.
+
+        :param samples: Mesures (R, G, B, clear), une par ligne (ou une seule mesure).
+        :return: Tableau numpy des noms de classe ("indéterminé" si aucune classe n'est assez proche).
+        """
+        x = self.chromaticity(samples)
+        d = x[:, None, :] - self._means[None, :, :]
+        d2 = np.einsum('nki,kij,nkj->nk', d, self._inv_covs, d)
+        best = np.argmin(d2 + self._log_dets, axis=1)
+        labels = np.array(self.labels + [self.UNKNOWN], dtype=object)
+        rejected = d2[np.arange(len(x)), best] > self.max_distance ** 2
+        return labels[np.where(rejected, len(self.labels), best)]
+
+
+class AutoRange:
+    """
+    Contrôleur d'auto-calibre du TCS34725.
+
+    À partir du niveau du canal "clear", estime le flux lumineux (coups par ms et par unité
+    de gain) et choisit le temps d'intégration le plus court - puis le gain le plus élevé -
+    qui donne au moins ``min_counts`` coups sans dépasser ``max_fraction`` de la pleine échelle.
+    En lieu très lumineux, la cadence de mesure augmente donc sans saturer le capteur.
+
+    Auteur : Vergeylen Anthony
+    Quoi   : Choisit le couple (gain, temps d'intégration) de la prochaine mesure.
+    """
+
+    def __init__(self, min_counts=200, max_fraction=0.75, saturation_fraction=0.95):
+        """
+        :param min_counts: Nombre de coups minimal sur "clear" (rapport signal/bruit utilisable).
+        :param max_fraction: Fraction maximale de la pleine échelle visée.
+        :param saturation_fraction: Fraction de la pleine échelle considérée comme saturée.
+        """
+        if not 0 < max_fraction < saturation_fraction <= 1:
+            raise ValueError("Il faut 0 < max_fraction < saturation_fraction <= 1.")
+        self.min_counts = min_counts
+        self.max_fraction = max_fraction
+        self.saturation_fraction = saturation_fraction
+
+    @staticmethod
+    def full_scale(integration_time):
+        """Valeur maximale du canal "clear" pour un temps d'intégration (1024 coups par cycle de 2.4 ms)."""
+        return min(0xFFFF, 1024 * round(integration_time / 2.4))
+
+    def is_saturated(self, clear, integration_time):
+        return clear >= self.saturation_fraction * self.full_scale(integration_time)
+
+    def _fits(self, counts, integration_time):
+        return self.min_counts <= counts <= self.max_fraction * self.full_scale(integration_time)
+
+    def choose(self, clear, gain, integration_time):
+        """
+        Choisit le réglage de la prochaine mesure.
+
+        :param clear: Valeur du canal "clear" mesurée avec le réglage courant.
+        :param gain: Gain courant.
+        :param integration_time: Temps d'intégration courant (ms).
+        :return: Tuple (gain, integration_time).
+        """
+        flux = max(clear, 1) / (gain * integration_time)
+        if self.is_saturated(clear, integration_time):
+            # Le flux réel est inconnu (seulement minoré) : on vise une sensibilité 4 fois plus faible
+            flux *= 4
+
+        # Réglage courant satisfaisant : on ne change que pour une intégration plus courte (hystérésis)
+        current_ok = not self.is_saturated(clear, integration_time) and self._fits(clear, integration_time)
+
+        for it in INTEGRATION_TIMES:
+            if current_ok and it >= integration_time:
+                return gain, integration_time
+            for g in reversed(GAINS):
+                if self._fits(flux * g * it, it):
+                    return g, it
+
+        if current_ok:
+            return gain, integration_time
+        if flux * GAINS[0] * INTEGRATION_TIMES[0] > self.max_fraction * self.full_scale(INTEGRATION_TIMES[0]):
+            return GAINS[0], INTEGRATION_TIMES[0]     # Trop lumineux : réglage le moins sensible
+        return GAINS[-1], INTEGRATION_TIMES[-1]       # Trop sombre : réglage le plus sensible
+
 
 class CapteurRGB:
-    def __init__(self, threshold=5, integration_time=100, calibration_duration=5):
+    def __init__(self, threshold=5, integration_time=100, calibration_duration=5, auto_range=False):
         """
         Initialise le capteur RGB et configure les paramètres de calibration.
 
         :param threshold: Seuil de variation pour déclencher une détection (par défaut 5).
         :param integration_time: Temps d'intégration du capteur en millisecondes (par défaut 100).
         :param calibration_duration: Durée de la calibration en secondes (par défaut 5).
+        :param auto_range: Ajuste automatiquement gain et temps d'intégration (par défaut False).
 
         """
+        if not INTEGRATION_TIMES[0] <= integration_time <= INTEGRATION_TIMES[-1]:
+            raise ValueError(f"Le temps d'intégration doit être compris entre {INTEGRATION_TIMES[0]} "
+                             f"et {INTEGRATION_TIMES[-1]} ms.")
+
         self.threshold = threshold
         self.integration_time = integration_time
         self.calibration_duration = calibration_duration
@@ -38,29 +226,187 @@ class CapteurRGB:
         self.sensor = adafruit_tcs34725.TCS34725(self.i2c)
         self.sensor.enable = True
         self.sensor.integration_time = integration_time
+        self.gain = 1
+        self.sensor.gain = self.gain
+
+        self.auto_range = AutoRange() if auto_range else None
+        self._last_read = None
+        self.telemetry = {
+            "gain": self.gain,
+            "integration_time": self.integration_time,
+            "clear": None,
+            "saturated": False,
+            "readings_per_second": 0.0,
+        }
 
         self.ref_r = None
         self.ref_g = None
         self.ref_b = None
 
-    def calibrate(self):
-        #Effectue la calibration du capteur RGB pour établir une référence de couleur.
-        
-        print("Calibration RGB en cours... Ne touchez à rien pendant 5 secondes.")
-        nb_mesures = 0
-        somme_r, somme_g, somme_b = 0, 0, 0
+        # Dernier temps de réaction mesuré en mode départ rapide (secondes)
+        self.reaction_time = None
+
+        # Classifieur statistique : le fond est appris par calibrate(), rouge et vert
+        # par calibrate_class() (voir classify_raw).
+        self.classifier = ColorClassifier()
+
+    def read_raw(self):
+        """
+        Lit une mesure brute (R, G, B, clear) et, si l'auto-calibre est actif, ajuste gain
+        et temps d'intégration pour la mesure suivante. Met à jour la télémétrie.
+
+        :return: Tuple (R, G, B, clear).
+        """
+        r, g, b, clear = self.sensor.color_raw
+        now = time.perf_counter()
+        if self._last_read is not None and now > self._last_read:
+            rate = 1.0 / (now - self._last_read)
+            self.telemetry["readings_per_second"] = 0.8 * self.telemetry["readings_per_second"] + 0.2 * rate
+        self._last_read = now
+
+        self.telemetry["clear"] = clear
+        if self.auto_range is not None:
+            self.telemetry["saturated"] = self.auto_range.is_saturated(clear, self.integration_time)
+            gain, integration_time = self.auto_range.choose(clear, self.gain, self.integration_time)
+            if (gain, integration_time) != (self.gain, self.integration_time):
+                self.set_range(gain, integration_time)
+        return r, g, b, clear
+
+    def set_range(self, gain, integration_time):
+        """
+        Applique un gain et un temps d'intégration au capteur.
+
+        :param gain: Gain (1, 4, 16 ou 60).
+        :param integration_time: Temps d'intégration en millisecondes.
+        """
+        if gain not in GAINS:
+            raise ValueError(f"Le gain doit être l'une des valeurs {GAINS}.")
+        self.sensor.gain = gain
+        self.sensor.integration_time = integration_time
+        self.gain = gain
+        self.integration_time = integration_time
+        self.telemetry["gain"] = gain
+        self.telemetry["integration_time"] = integration_time
+
+    def get_telemetry(self):
+        """Retourne une copie de la télémétrie du capteur (réglages courants, niveau, cadence)."""
+        return dict(self.telemetry)
+
+    def _collect_samples(self, duration):
+        """
+        Lit le capteur pendant ``duration`` secondes, au rythme du temps d'intégration.
+
+        :return: Tableau numpy (N, 4) des mesures brutes (R, G, B, clear).
+        """
+        samples = []
         debut = time.time()
-        while time.time() - debut < self.calibration_duration:
-            r, g, b = self.sensor.color_rgb_bytes
-            somme_r += r
-            somme_g += g
-            somme_b += b
-            nb_mesures += 1
-            time.sleep(0.1)
-        self.ref_r = somme_r // nb_mesures
-        self.ref_g = somme_g // nb_mesures
-        self.ref_b = somme_b // nb_mesures
-        print(f"Calibration RGB terminée. Référence: R={self.ref_r}, G={self.ref_g}, B={self.ref_b}")
+        while time.time() - debut < duration:
+            samples.append(self.read_raw())
+            time.sleep(self.integration_time / 1000.0)
+        return np.array(samples, dtype=float).reshape(-1, 4)
+
+    def calibrate(self):
+        """
+        Effectue la calibration du capteur RGB pour établir une référence de couleur.
+        Les mesures brutes servent à construire le modèle "fond" du classifieur ; la
+        référence RGB entière (ref_r, ref_g, ref_b) est conservée pour la détection par seuil.
+        """
+        print(f"Calibration RGB en cours... Ne touchez à rien pendant {self.calibration_duration} secondes.")
+        samples = self._collect_samples(self.calibration_duration)
+        self.classifier.fit("fond", samples)
+        rgb = np.array([self._raw_to_rgb_bytes(*sample) for sample in samples])
+        self.ref_r, self.ref_g, self.ref_b = (int(v) for v in rgb.mean(axis=0))
+        print(f"Calibration RGB terminée ({len(samples)} mesures). Référence: R={self.ref_r}, G={self.ref_g}, B={self.ref_b}")
+
+    def calibrate_class(self, label, duration=2):
+        """
+        Apprend le modèle d'une couleur de feu ("rouge" ou "vert") en mesurant le vrai feu.
+
+        :param label: Nom de la classe à apprendre.
+        :param duration: Durée de mesure en secondes.
+        """
+        print(f"Calibration de la classe '{label}' : présentez le feu pendant {duration} secondes.")
+        self.classifier.fit(label, self._collect_samples(duration))
+        mean, _ = self.classifier.model(label)
+        print(f"Classe '{label}' calibrée. Chromaticité moyenne: {np.round(mean, 3)}")
+
+    def export_calibration(self):
+        """
+        Retourne la calibration courante sous une forme sérialisable (pour CalibrationCache).
+        Les paramètres de configuration sont inclus pour détecter un changement de réglage.
+        """
+        models = {}
+        for label in self.classifier.labels:
+            mean, cov = self.classifier.model(label)
+            models[label] = {"mean": mean.tolist(), "cov": cov.tolist()}
+        return {
+            "threshold": self.threshold,
+            "auto_range": self.auto_range is not None,
+            "ref": [self.ref_r, self.ref_g, self.ref_b],
+            "gain": self.gain,
+            "integration_time": self.integration_time,
+            "models": models,
+        }
+
+    def import_calibration(self, data):
+        """
+        Restaure une calibration exportée par ``export_calibration``.
+
+        :param data: Données de calibration.
+        :return: True si la calibration a été appliquée.
+        """
+        try:
+            models = data["models"]
+            if "fond" not in models:
+                return False
+            for label, model in models.items():
+                self.classifier.set_model(label, model["mean"], model["cov"])
+            self.ref_r, self.ref_g, self.ref_b = (int(v) for v in data["ref"])
+            self.set_range(data["gain"], data["integration_time"])
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Calibration RGB en cache invalide : {e}")
+            return False
+        return True
+
+    def check_calibration(self, samples=3):
+        """
+        Lecture rapide de contrôle : vérifie que quelques mesures sont toujours classées
+        comme "fond", c'est-à-dire que l'éclairage n'a pas changé depuis la calibration.
+
+        :param samples: Nombre de mesures de contrôle.
+        :return: True si la calibration peut être réutilisée.
+        """
+        if not self.classifier.has_model("fond"):
+            return False
+        mesures = []
+        for _ in range(samples):
+            time.sleep(self.integration_time / 1000.0)
+            mesures.append(self.read_raw())
+        labels = self.classifier.classify(mesures)
+        return bool(all(label == "fond" for label in labels))
+
+    def colors_calibrated(self):
+        """Indique si rouge et vert ont été calibrés devant le vrai feu."""
+        return all(self.classifier.has_model(label) for label in LIGHT_COLORS)
+
+    def classify_raw(self, r, g, b, clear):
+        """
+        Classe une mesure brute. Une fois le fond calibré, le classifieur statistique décide
+        si la mesure s'écarte du fond ; la couleur est donnée par le classifieur si rouge et
+        vert ont été calibrés, sinon par la couleur dominante (détection historique). Sans
+        calibration du fond : écart à la référence puis couleur dominante.
+
+        :return: "fond", "rouge", "vert", "bleu" ou "indéterminé".
+        """
+        if self.classifier.has_model("fond"):
+            label = self.classifier.classify((r, g, b, clear))[0]
+            if label == "fond" or self.colors_calibrated():
+                return label
+            return self.detect_color(*self._raw_to_rgb_bytes(r, g, b, clear))
+        r, g, b = self._raw_to_rgb_bytes(r, g, b, clear)
+        if not self._differs_from_reference(r, g, b):
+            return "fond"
+        return self.detect_color(r, g, b)
 
     def detect_color(self, r, g, b):
         """
@@ -89,17 +435,128 @@ class CapteurRGB:
         """
         print("Surveillance RGB en cours...")
         car_launched = False
+        derniere_couleur = "fond"
         while True:
-            r, g, b = self.sensor.color_rgb_bytes
-            diff_r = abs(r - self.ref_r)
-            diff_g = abs(g - self.ref_g)
-            diff_b = abs(b - self.ref_b)
-            if diff_r > self.threshold or diff_g > self.threshold or diff_b > self.threshold:
-                couleur = self.detect_color(r, g, b)
-                print(f"RGB: R={r}, G={g}, B={b} -> Couleur détectée: {couleur}")
-                if couleur == "vert" and not car_launched:
-                    print("Couleur verte détectée ! Lancement de la voiture autonome.")
-                    thread = threading.Thread(target=car_launcher.launch)
-                    thread.start()
-                    car_launched = True
-            time.sleep(1)
+            r, g, b, clear = self.read_raw()
+            couleur = self.classify_raw(r, g, b, clear)
+            if couleur != derniere_couleur:
+                print(f"RGB: R={r}, G={g}, B={b}, C={clear} -> Couleur détectée: {couleur}")
+                derniere_couleur = couleur
+            if couleur == "vert" and not car_launched:
+                print("Couleur verte détectée ! Lancement de la voiture autonome.")
+                thread = threading.Thread(target=car_launcher.launch)
+                thread.start()
+                car_launched = True
+            time.sleep(self.integration_time / 1000.0)
+
+    def _raw_to_rgb_bytes(self, r, g, b, clear):
+        """
+        Convertit une mesure brute (R, G, B, clear) en octets RGB, avec la même
+        normalisation par le canal "clear" que ``color_rgb_bytes`` de la librairie.
+        Évite une seconde lecture I²C lorsque la mesure brute est déjà disponible.
+        """
+        if clear == 0:
+            return 0, 0, 0
+        return tuple(min(255, int(pow(int((v / clear) * 256) / 255, 2.5) * 255)) for v in (r, g, b))
+
+    def _differs_from_reference(self, r, g, b):
+        """Indique si la mesure s'écarte de la référence de calibration d'au moins ``threshold``."""
+        if self.ref_r is None:
+            return True
+        return (abs(r - self.ref_r) > self.threshold or abs(g - self.ref_g) > self.threshold
+                or abs(b - self.ref_b) > self.threshold)
+
+    def configure_fast_start(self, integration_time=FAST_INTEGRATION_TIME, persistence=FAST_PERSISTENCE,
+                             clear_margin=FAST_CLEAR_MARGIN):
+        """
+        Configure le capteur pour le départ rapide : temps d'intégration court, filtre de
+        persistance et seuils d'interruption du canal "clear" autour du niveau actuel.
+
+        :param integration_time: Temps d'intégration en millisecondes (2.4 ms minimum).
+        :param persistence: Nombre de cycles hors seuils avant de lever l'interruption.
+        :param clear_margin: Marge relative de la fenêtre de seuils autour du niveau actuel.
+        :return: Niveau "clear" de référence.
+        """
+        old_integration_time = self.integration_time
+        self.set_range(self.gain, integration_time)
+        self.sensor.cycles = persistence
+        # Laisse se terminer le cycle en cours avec l'ancien temps d'intégration
+        time.sleep((old_integration_time + integration_time) / 1000.0)
+        clear = self.sensor.color_raw[3]
+        self._arm_interrupt(clear, clear_margin)
+        return clear
+
+    def _arm_interrupt(self, clear, clear_margin):
+        """Place la fenêtre de seuils AILT/AIHT autour de ``clear`` et acquitte l'interruption."""
+        marge = max(1, int(clear * clear_margin))
+        self.sensor.min_value = max(0, clear - marge)
+        self.sensor.max_value = min(0xFFFF, clear + marge)
+        self.sensor.interrupt = False
+
+    def monitor_fast_start(self, car_launcher, interrupt_pin=None, integration_time=FAST_INTEGRATION_TIME,
+                           persistence=FAST_PERSISTENCE, clear_margin=FAST_CLEAR_MARGIN):
+        """
+        Surveillance à faible latence du feu de départ.
+
+        Si ``interrupt_pin`` est fourni (broche INT du TCS34725, active à l'état bas),
+        le thread dort jusqu'à ce que le capteur lève son interruption : le canal "clear"
+        est sorti de la fenêtre de seuils pendant ``persistence`` cycles. Sinon, le capteur
+        est interrogé en continu au rythme du temps d'intégration court.
+
+        Le temps de réaction entre l'observation du changement de lumière et l'appel de
+        ``car_launcher.launch`` est mesuré et conservé dans ``self.reaction_time``.
+
+        :param car_launcher: Instance de CarLauncher qui permet de lancer le contrôle autonome.
+        :param interrupt_pin: Broche GPIO reliée à la sortie INT du capteur (None = scrutation).
+        :param integration_time: Temps d'intégration en millisecondes.
+        :param persistence: Nombre de cycles hors seuils avant interruption.
+        :param clear_margin: Marge relative de la fenêtre de seuils.
+        """
+        mode = "interruption" if interrupt_pin is not None else "scrutation"
+        print(f"Surveillance RGB (départ rapide, {mode}) en cours...")
+        clear_ref = self.configure_fast_start(integration_time, persistence, clear_margin)
+        period = integration_time / 1000.0
+        if interrupt_pin is not None:
+            # Le changement est visible au plus tard après persistence + 1 cycles d'intégration
+            sensor_latency = (persistence + 1) * period
+            interrupt = DigitalInputDevice(interrupt_pin, pull_up=True)
+        else:
+            # Un changement en cours d'intégration n'apparaît qu'à la fin du cycle suivant
+            sensor_latency = 2 * period
+            interrupt = None
+
+        try:
+            while True:
+                if interrupt is not None:
+                    if not interrupt.wait_for_active(timeout=1):
+                        continue
+                else:
+                    time.sleep(period)
+                t_change = time.perf_counter()
+                r, g, b, clear = self.sensor.color_raw
+                if self.classify_raw(r, g, b, clear) == "vert":
+                    print(f"RGB: R={r}, G={g}, B={b}, C={clear} -> Couleur verte détectée ! Lancement de la voiture autonome.")
+                    self._launch_timed(car_launcher, t_change, sensor_latency)
+                    return
+                if interrupt is not None:
+                    # Nouveau niveau lumineux (feu rouge, ombre...) : la fenêtre suit la lumière ambiante
+                    print(f"RGB: R={r}, G={g}, B={b}, C={clear} -> changement de lumière (clear {clear_ref} -> {clear})")
+                    clear_ref = clear
+                    self._arm_interrupt(clear, clear_margin)
+        finally:
+            if interrupt is not None:
+                interrupt.close()
+
+    def _launch_timed(self, car_launcher, t_change, sensor_latency):
+        """
+        Lance la voiture dans un thread et mesure le temps écoulé depuis ``t_change``
+        jusqu'à l'entrée dans ``car_launcher.launch``.
+        """
+        def launch():
+            self.reaction_time = time.perf_counter() - t_change
+            print(f"⏱️ Temps de réaction feu vert -> lancement : {self.reaction_time * 1000:.1f} ms "
+                  f"(+ latence capteur ≤ {sensor_latency * 1000:.1f} ms)")
+            car_launcher.launch()
+
+        thread = threading.Thread(target=launch)
+        thread.start()
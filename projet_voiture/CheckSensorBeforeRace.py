@@ -1,11 +1,28 @@
 #!/usr/bin/env python3
-import RPi.GPIO as GPIO
+"""
+CheckSensorBeforeRace.py
+------------------------
+Vérifications d'avant-course de tous les capteurs et actionneurs, et mode banc (--bench)
+pour caractériser les capteurs (cadence, bruit, pertes, latence, diaphonie).
+Les vérifications indépendantes sont exécutées en parallèle, chacune avec son propre délai
+maximal ; les trois capteurs à ultrasons restent séquentiels entre eux pour ne pas capter
+l'écho d'un voisin. Le résultat peut être affiché en tableau ou exporté en JSON.
+"""
+import argparse
+import json
+import math
+import statistics
+import threading
 import time
-import board
-import busio
-import adafruit_tcs34725
 from projet_voiture import PWM as PCA
-from gpiozero import DistanceSensor, DigitalInputDevice  # Import nécessaire pour le capteur de ligne
+from Hardware import lazy, lazy_attr
+
+GPIO = lazy("RPi.GPIO")
+board = lazy("board")
+busio = lazy("busio")
+adafruit_tcs34725 = lazy("adafruit_tcs34725")
+DistanceSensor = lazy_attr("gpiozero", "DistanceSensor")
+DigitalInputDevice = lazy_attr("gpiozero", "DigitalInputDevice")  # Nécessaire pour le capteur de ligne
 
 # --- Vérification GPIO moteurs ---
 def test_gpio_moteur(pins):
@@ -15,13 +32,11 @@ def test_gpio_moteur(pins):
         for pin in pins:
             GPIO.setup(pin, GPIO.OUT)
             GPIO.output(pin, GPIO.HIGH)
-            time.sleep(0.1)
+            time.sleep(0.01)
             GPIO.output(pin, GPIO.LOW)
         return {"Nom": "GPIO moteurs", "Etat": "✅ OK"}
     except Exception as e:
         return {"Nom": "GPIO moteurs", "Etat": f"❌ ERREUR -> {e}"}
-    finally:
-        GPIO.cleanup()
 
 # --- Vérification capteur RGB ---
 def test_rgb_sensor():
@@ -83,63 +98,396 @@ def test_servo_moteur_presence():
         return {"Nom": "Servo moteur", "Etat": f"❌ ERREUR -> {e}"}
 
 # --- Vérification capteurs ultrason HC-SR04 ---
-def test_hcsr04(TRIG, ECHO, place):
+VITESSE_SON_CM_PAR_NS = 34300 / 1e9   # cm/ns
+DUREE_ECHO_MAX_NS = 25_000_000        # au-delà de 4 m (~25 ms)
+
+def _attendre_echos_bas(echos, timeout):
+    """
+    Attend que toutes les broches ECHO soient au niveau bas (impulsion précédente terminée).
+
+    :return: Ensemble des broches ECHO encore hautes à l'échéance.
+    """
+    echeance = time.perf_counter() + timeout
+    hauts = {echo for echo in echos if GPIO.input(echo)}
+    while hauts and time.perf_counter() < echeance:
+        time.sleep(0.0005)
+        hauts = {echo for echo in hauts if GPIO.input(echo)}
+    return hauts
+
+def mesurer_echos_ns(paires, timeout=0.05):
+    """
+    Émet simultanément une impulsion sur chaque TRIG et mesure la durée de chaque impulsion ECHO
+    par détection de fronts : les fronts sont horodatés par time.perf_counter_ns dans la fonction
+    de rappel, sans boucle d'attente active.
+
+    Le déclenchement n'a lieu qu'une fois chaque ECHO revenu au niveau bas, et chaque front est
+    identifié par le niveau lu dans la fonction de rappel : un front descendant sans front montant
+    (fin d'une impulsion précédente) est ignoré, seule la durée montant -> descendant est mesurée.
+
+    :param paires: Liste de couples (TRIG, ECHO) déjà configurés (sortie / entrée).
+    :param timeout: Délai maximal d'attente des échos (secondes), et du retour au niveau bas.
+    :return: Liste des durées d'impulsion en nanosecondes (None si l'écho n'est pas revenu,
+             ou si ECHO est resté haut avant le déclenchement).
+    """
+    fronts = {echo: [] for _, echo in paires}
+    restants = [len(paires)]
+    fin = threading.Event()
+
+    def on_edge(channel):
+        horodatage = time.perf_counter_ns()
+        horodatages = fronts[channel]
+        if GPIO.input(channel):
+            if not horodatages:  # Front montant : début de l'écho
+                horodatages.append(horodatage)
+        elif len(horodatages) == 1:  # Front descendant qui suit le front montant
+            horodatages.append(horodatage)
+            restants[0] -= 1
+            if restants[0] == 0:
+                fin.set()
+
+    bloques = _attendre_echos_bas([echo for _, echo in paires], timeout)
+    for echo in bloques:
+        fronts[echo] = None
+        restants[0] -= 1
+    if restants[0] == 0:
+        return [None] * len(paires)
+
+    actifs = [echo for _, echo in paires if fronts[echo] is not None]
+    for echo in actifs:
+        GPIO.add_event_detect(echo, GPIO.BOTH, callback=on_edge)
+    try:
+        for trig, echo in paires:
+            if echo in actifs:
+                GPIO.output(trig, True)
+        time.sleep(0.00001)  # 10 µs
+        for trig, echo in paires:
+            if echo in actifs:
+                GPIO.output(trig, False)
+        fin.wait(timeout)
+        return [fronts[echo][1] - fronts[echo][0] if fronts[echo] is not None and len(fronts[echo]) == 2 else None
+                for _, echo in paires]
+    finally:
+        for echo in actifs:
+            GPIO.remove_event_detect(echo)
+
+def mesurer_echo_ns(TRIG, ECHO, timeout=0.05):
+    """
+    Mesure la durée de l'impulsion ECHO d'un seul capteur (voir ``mesurer_echos_ns``).
+
+    :return: Durée de l'impulsion ECHO en nanosecondes, ou None si l'écho n'est pas revenu.
+    """
+    return mesurer_echos_ns([(TRIG, ECHO)], timeout)[0]
+
+def test_hcsr04(TRIG, ECHO, place, timeout=0.05):
     try:
         GPIO.setmode(GPIO.BCM)
         GPIO.setup(TRIG, GPIO.OUT)
         GPIO.setup(ECHO, GPIO.IN)
 
-        # S'assurer que TRIG est bas
-        GPIO.output(TRIG, False)
-        time.sleep(0.5)
-
-        # Envoi d’une impulsion TRIG
-        GPIO.output(TRIG, True)
-        time.sleep(0.00001)  # 10 µs
+        # S'assurer que TRIG est bas (un cycle de mesure HC-SR04 dure 60 ms)
         GPIO.output(TRIG, False)
+        time.sleep(0.06)
 
-        # Mesure du temps de réponse sur ECHO
-        timeout = time.time() + 0.05  # Timeout à 50 ms
-
-        while GPIO.input(ECHO) == 0:
-            pulse_start = time.time()
-            if pulse_start > timeout:
-                raise TimeoutError("Aucune réponse du capteur (ECHO reste bas)")
+        pulse_duration = mesurer_echo_ns(TRIG, ECHO, timeout)
+        if pulse_duration is None:
+            raise TimeoutError("Aucune réponse du capteur (ECHO)")
+        if pulse_duration > DUREE_ECHO_MAX_NS:
+            raise TimeoutError("Durée d'impulsion trop longue")
 
-        while GPIO.input(ECHO) == 1:
-            pulse_end = time.time()
-            if pulse_end - pulse_start > 0.025:  # au-delà de 4m (~25ms)
-                raise TimeoutError("Durée d'impulsion trop longue")
-
-        pulse_duration = pulse_end - pulse_start
-        distance = pulse_duration * 17150  # Conversion en cm
-        distance = round(distance, 2)
+        distance = round(pulse_duration * VITESSE_SON_CM_PAR_NS / 2, 2)  # aller-retour
 
         return {"Nom": f"Capteur HC-SR04 {place}", "Etat": f"✅ OK - Distance mesurée : {distance} cm"}
 
     except Exception as e:
         return {"Nom": f"Capteur HC-SR04 {place}", "Etat": f"❌ ERREUR -> {e}"}
-    finally:
-        GPIO.cleanup()
+
+# --- Exécution des vérifications ---
+def _executer_avec_timeout(nom, fonction, timeout):
+    """
+    Exécute une vérification dans un thread démon et la chronomètre.
+    Si elle dépasse ``timeout``, elle est déclarée en échec sans bloquer les autres.
+    """
+    resultat = {}
+
+    def cible():
+        try:
+            resultat.update(fonction())
+        except Exception as e:
+            resultat.update({"Nom": nom, "Etat": f"❌ ERREUR -> {e}"})
+
+    debut = time.perf_counter()
+    thread = threading.Thread(target=cible, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    duree_ms = round((time.perf_counter() - debut) * 1000, 1)
+    if thread.is_alive():
+        resultat = {"Nom": nom, "Etat": f"❌ ERREUR -> délai dépassé ({timeout} s)"}
+    resultat["Duree_ms"] = duree_ms
+    resultat["OK"] = resultat["Etat"].startswith("✅")
+    return resultat
+
+def groupes_de_verifications():
+    """
+    Retourne les vérifications regroupées : les groupes s'exécutent en parallèle,
+    les vérifications d'un même groupe l'une après l'autre.
+    Chaque vérification est un tuple (nom, fonction, délai maximal en secondes).
+    """
+    return [
+        [("GPIO moteurs", lambda: test_gpio_moteur([17, 18, 27, 22]), 1.0)],
+        [("Capteur RGB", test_rgb_sensor, 2.0)],
+        [("Capteur Line Follower", test_line_follower_sensor, 1.0)],   # Test du capteur de suivi de ligne
+        [("Servo moteur", test_servo_moteur_presence, 2.0)],
+        # Les ultrasons partagent le même milieu acoustique : mesures séquentielles
+        [
+            ("Capteur HC-SR04 DROIT", lambda: test_hcsr04(26, 19, "DROIT"), 0.5),
+            ("Capteur HC-SR04 AVANT", lambda: test_hcsr04(6, 5, "AVANT"), 0.5),
+            ("Capteur HC-SR04 GAUCHE", lambda: test_hcsr04(11, 9, "GAUCHE"), 0.5),
+        ],
+    ]
+
+def executer_verifications(groupes=None):
+    """
+    Exécute toutes les vérifications et retourne (résultats, durée totale en ms).
+    Les résultats sont dans l'ordre de déclaration des vérifications.
+    """
+    groupes = groupes_de_verifications() if groupes is None else groupes
+    resultats = [[None] * len(groupe) for groupe in groupes]
+
+    def executer_groupe(i, groupe):
+        for j, (nom, fonction, timeout) in enumerate(groupe):
+            resultats[i][j] = _executer_avec_timeout(nom, fonction, timeout)
+
+    debut = time.perf_counter()
+    threads = [threading.Thread(target=executer_groupe, args=(i, groupe), daemon=True)
+               for i, groupe in enumerate(groupes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duree_totale_ms = round((time.perf_counter() - debut) * 1000, 1)
+    return [resultat for groupe in resultats for resultat in groupe], duree_totale_ms
+
+def rapport_json(results, duree_totale_ms):
+    """
+    Construit le rapport JSON structuré des vérifications.
+    """
+    return json.dumps({
+        "ok": all(result["OK"] for result in results),
+        "duree_totale_ms": duree_totale_ms,
+        "verifications": [
+            {"nom": result["Nom"], "etat": result["Etat"], "ok": result["OK"], "duree_ms": result["Duree_ms"]}
+            for result in results
+        ],
+    }, ensure_ascii=False, indent=2)
 
 def main():
     # Lancer les tests des capteurs et stocker les résultats dans une liste
-    test_results = []
-    test_results.append(test_gpio_moteur([17, 18, 27, 22]))
-    test_results.append(test_rgb_sensor())
-    test_results.append(test_line_follower_sensor())  # Test du capteur de suivi de ligne
-    test_results.append(test_hcsr04(26, 19, "DROIT"))
-    test_results.append(test_hcsr04(6, 5, "AVANT"))
-    test_results.append(test_hcsr04(11, 9, "GAUCHE"))
-    test_results.append(test_servo_moteur_presence())
+    try:
+        test_results, _ = executer_verifications()
+    finally:
+        # Un seul nettoyage à la fin : les vérifications ne défont plus la configuration des autres
+        GPIO.cleanup()
 
     # Retourne un tableau des résultats sous forme de liste de dictionnaires
     return test_results
 
+# --- Banc de caractérisation des capteurs ---
+CAPTEURS_ULTRASON = [(26, 19, "DROIT"), (6, 5, "AVANT"), (11, 9, "GAUCHE")]
+PERIODE_MIN_ULTRASON = 0.06  # Cycle de mesure HC-SR04 : en dessous, l'écho précédent peut être capté
+
+def _statistiques(valeurs):
+    """Résumé statistique d'une série (moyenne, écart-type, min, max, percentiles)."""
+    if not valeurs:
+        return None
+    q = statistics.quantiles(valeurs, n=100) if len(valeurs) > 1 else [valeurs[0]] * 99
+    return {
+        "n": len(valeurs),
+        "moyenne": round(statistics.fmean(valeurs), 4),
+        "ecart_type": round(statistics.pstdev(valeurs), 4),
+        "min": round(min(valeurs), 4),
+        "max": round(max(valeurs), 4),
+        "p50": round(q[49], 4),
+        "p95": round(q[94], 4),
+        "p99": round(q[98], 4),
+    }
+
+def _configurer_ultrasons(capteurs):
+    GPIO.setmode(GPIO.BCM)
+    for trig, echo, _ in capteurs:
+        GPIO.setup(trig, GPIO.OUT)
+        GPIO.setup(echo, GPIO.IN)
+        GPIO.output(trig, False)
+    time.sleep(0.06)
+
+def _banc_echos(capteurs, n, periode, timeout):
+    """
+    Réalise ``n`` salves de mesures sur les capteurs donnés (déclenchés ensemble).
+
+    :return: Pour chaque capteur : distances (cm), latences (ms), nombre de pertes ; et cadence (Hz).
+    """
+    paires = [(trig, echo) for trig, echo, _ in capteurs]
+    distances = [[] for _ in capteurs]
+    latences = [[] for _ in capteurs]
+    pertes = [0] * len(capteurs)
+    debut = time.perf_counter()
+    prochaine = debut
+    for _ in range(n):
+        t0 = time.perf_counter_ns()
+        durees = mesurer_echos_ns(paires, timeout)
+        latence_ms = (time.perf_counter_ns() - t0) / 1e6
+        for i, duree in enumerate(durees):
+            if duree is None or duree > DUREE_ECHO_MAX_NS:
+                pertes[i] += 1
+            else:
+                distances[i].append(duree * VITESSE_SON_CM_PAR_NS / 2)
+                latences[i].append(latence_ms)
+        # Cadence imposée (période absolue, sans dérive)
+        prochaine += periode
+        attente = prochaine - time.perf_counter()
+        if attente > 0:
+            time.sleep(attente)
+    cadence = n / (time.perf_counter() - debut)
+    return distances, latences, pertes, cadence
+
+def banc_ultrasons(n=1000, periode=PERIODE_MIN_ULTRASON, timeout=0.05, precision_cm=1.0, capteurs=None):
+    """
+    Caractérise les capteurs à ultrasons : chaque capteur seul, puis les trois déclenchés ensemble
+    pour mesurer la diaphonie (écho capté par un voisin).
+
+    :param n: Nombre de mesures par capteur.
+    :param periode: Période imposée entre deux mesures (s), au moins PERIODE_MIN_ULTRASON.
+    :param timeout: Délai maximal d'attente d'un écho (s).
+    :param precision_cm: Précision visée, utilisée pour recommander ``sensor_sample_count``.
+    :return: Dictionnaire de résultats par capteur et de diaphonie.
+    """
+    if periode < PERIODE_MIN_ULTRASON:
+        raise ValueError(f"La période doit être d'au moins {PERIODE_MIN_ULTRASON} s (cycle de mesure HC-SR04).")
+    capteurs = CAPTEURS_ULTRASON if capteurs is None else capteurs
+    _configurer_ultrasons(capteurs)
+    rapport = {}
+    for capteur in capteurs:
+        distances, latences, pertes, cadence = _banc_echos([capteur], n, periode, timeout)
+        stats = _statistiques(distances[0])
+        ecart_type = stats["ecart_type"] if stats else None
+        rapport[capteur[2]] = {
+            "cadence_max_hz": round(cadence, 1),
+            "distance_cm": stats,
+            "bruit_ecart_type_cm": ecart_type,
+            "taux_perte": round(pertes[0] / n, 4),
+            "latence_ms": _statistiques(latences[0]),
+            # Moyenne de k mesures : écart-type divisé par racine(k)
+            "sensor_sample_count_recommande": max(1, math.ceil((ecart_type / precision_cm) ** 2)) if ecart_type else None,
+        }
+
+    # Diaphonie : mêmes mesures avec les trois capteurs déclenchés en même temps
+    distances, latences, pertes, cadence = _banc_echos(capteurs, n, periode, timeout)
+    diaphonie = {}
+    for i, (_, _, place) in enumerate(capteurs):
+        seul = rapport[place]
+        stats = _statistiques(distances[i])
+        diaphonie[place] = {
+            "distance_cm": stats,
+            "taux_perte": round(pertes[i] / n, 4),
+            "ecart_moyenne_cm": round(stats["moyenne"] - seul["distance_cm"]["moyenne"], 3)
+                                if stats and seul["distance_cm"] else None,
+            "hausse_bruit_cm": round(stats["ecart_type"] - seul["bruit_ecart_type_cm"], 3)
+                               if stats and seul["distance_cm"] else None,
+            "hausse_taux_perte": round(pertes[i] / n - seul["taux_perte"], 4),
+        }
+    rapport["diaphonie"] = {"cadence_hz": round(cadence, 1), "capteurs": diaphonie}
+
+    # Fréquence de boucle atteignable : les trois capteurs lus l'un après l'autre, k mesures chacun
+    periode_boucle = 0.0
+    for _, _, place in capteurs:
+        r = rapport[place]
+        if r["cadence_max_hz"] > 0 and r["sensor_sample_count_recommande"]:
+            periode_boucle += r["sensor_sample_count_recommande"] / r["cadence_max_hz"]
+    rapport["frequence_boucle_recommandee_hz"] = round(1 / periode_boucle, 1) if periode_boucle else None
+    return rapport
+
+def banc_rgb(n=1000, integration_time=2.4):
+    """
+    Caractérise le capteur RGB : cadence, bruit par canal, lectures invalides et latence.
+
+    :param n: Nombre de lectures.
+    :param integration_time: Temps d'intégration utilisé (ms).
+    """
+    i2c = busio.I2C(board.SCL, board.SDA)
+    capteur = adafruit_tcs34725.TCS34725(i2c)
+    capteur.enable = True
+    capteur.integration_time = integration_time
+    canaux = {"r": [], "g": [], "b": [], "clear": []}
+    latences = []
+    pertes = 0
+    debut = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter_ns()
+        try:
+            mesure = capteur.color_raw
+            latences.append((time.perf_counter_ns() - t0) / 1e6)
+            if mesure[3] == 0:
+                pertes += 1
+                continue
+            for nom, valeur in zip(canaux, mesure):
+                canaux[nom].append(valeur)
+        except Exception:
+            pertes += 1
+        finally:
+            # Une nouvelle valeur n'est disponible qu'à la fin de chaque cycle d'intégration,
+            # y compris après une lecture en échec
+            time.sleep(integration_time / 1000.0)
+    cadence = n / (time.perf_counter() - debut)
+    return {
+        "integration_time_ms": integration_time,
+        "cadence_max_hz": round(cadence, 1),
+        "canaux": {nom: _statistiques(valeurs) for nom, valeurs in canaux.items()},
+        "taux_perte": round(pertes / n, 4),
+        "latence_ms": _statistiques(latences),
+    }
+
+def banc_line_follower(n=1000, gpio_pin=20):
+    """
+    Caractérise le capteur de ligne : cadence de lecture, latence et instabilité
+    (nombre de changements d'état, qui devrait être nul devant une surface fixe).
+    """
+    sensor = DigitalInputDevice(gpio_pin, pull_up=True)
+    try:
+        valeurs = []
+        latences = []
+        debut = time.perf_counter()
+        for _ in range(n):
+            t0 = time.perf_counter_ns()
+            valeurs.append(int(sensor.value))
+            latences.append((time.perf_counter_ns() - t0) / 1e6)
+        cadence = n / (time.perf_counter() - debut)
+    finally:
+        sensor.close()
+    transitions = sum(1 for a, b in zip(valeurs, valeurs[1:]) if a != b)
+    return {
+        "cadence_max_hz": round(cadence, 1),
+        "valeur_moyenne": round(statistics.fmean(valeurs), 4),
+        "taux_transitions": round(transitions / max(1, n - 1), 4),
+        "latence_ms": _statistiques(latences),
+    }
+
+def banc(n=1000, precision_cm=1.0):
+    """
+    Mode banc : caractérise tous les capteurs et retourne un rapport complet.
+    """
+    try:
+        return {
+            "echantillons": n,
+            "ultrasons": banc_ultrasons(n, precision_cm=precision_cm),
+            "rgb": banc_rgb(n),
+            "line_follower": banc_line_follower(n),
+        }
+    finally:
+        GPIO.cleanup()
+
 def afficher_tableau(results):
     # Données de la table
-    headers = ["Nom", "Etat"]
-    data = [[result["Nom"], result["Etat"]] for result in results]
+    headers = ["Nom", "Etat", "Durée (ms)"]
+    data = [[result["Nom"], result["Etat"], result.get("Duree_ms", "")] for result in results]
 
     # Calcul de la largeur de chaque colonne
     col_widths = [max(len(str(row[i])) for row in [headers] + data) for i in range(len(headers))]
@@ -160,7 +508,25 @@ def afficher_tableau(results):
     print(separator)
 
 if __name__ == "__main__":
-    # Appeler la fonction main et récupérer les résultats
-    results = main()
-    # Afficher les résultats sous forme de tableau
-    afficher_tableau(results)
+    parser = argparse.ArgumentParser(description="Vérification des capteurs avant la course.")
+    parser.add_argument("--json", action="store_true", help="Affiche le rapport au format JSON.")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="Mode banc : caractérise chaque capteur sur N mesures (rapport JSON).")
+    parser.add_argument("--precision", type=float, default=1.0,
+                        help="Précision visée en cm pour la recommandation de sensor_sample_count.")
+    args = parser.parse_args()
+
+    if args.bench:
+        print(json.dumps(banc(args.bench, args.precision), ensure_ascii=False, indent=2))
+        raise SystemExit(0)
+
+    try:
+        results, duree_totale_ms = executer_verifications()
+    finally:
+        GPIO.cleanup()
+    if args.json:
+        print(rapport_json(results, duree_totale_ms))
+    else:
+        # Afficher les résultats sous forme de tableau
+        afficher_tableau(results)
+        print(f"Durée totale : {duree_totale_ms} ms")
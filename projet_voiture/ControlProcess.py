@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+ControlProcess.py
+-----------------
+Ce module permet d'exécuter la boucle de contrôle de la voiture dans un processus séparé du
+serveur web et de la surveillance RGB : le travail de Flask (analyse des requêtes, rendu des
+templates) ne se dispute plus le GIL avec la boucle de contrôle.
+
+Les deux processus communiquent uniquement par mémoire partagée :
+  - TelemetryBlock : bloc de télémétrie (distances, vitesse estimée, commandes...) publié par le
+    processus de contrôle sans verrou partagé : chaque publication est un enregistrement complet
+    protégé par une somme de contrôle ; le lecteur ne bloque jamais l'écrivain, il recommence
+    simplement sa lecture s'il a vu une écriture à moitié faite ;
+  - CommandRing : file circulaire à un producteur et un consommateur, sans verrou partagé, qui
+    transporte les commandes (lancer, arrêter, tour en 8...) vers le processus de contrôle ;
+    chaque case porte son numéro et une somme de contrôle, vérifiés avant de la retirer.
+
+Côté serveur web, ControllerProxy remplace ControllerCar, CarLauncher et VoitureController :
+les lectures viennent de la télémétrie et les actions deviennent des commandes.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit TelemetryBlock, CommandRing, ControllerProxy, ControlService et ControlProcess.
+"""
+
+import math
+import multiprocessing
+import os
+import struct
+import threading
+import time
+import zlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+TELEMETRY_FIELDS = (
+    "timestamp", "state", "front", "left", "right", "speed", "speed_confidence",
+    "heading", "odometer", "x", "y", "efficiency", "motor_command", "steer",
+)
+
+# États publiés dans le champ "state"
+STATE_BOOT, STATE_READY, STATE_RUNNING, STATE_STOPPED, STATE_ERROR = range(5)
+
+# Codes des commandes
+CMD_LANCER, CMD_AVANCER, CMD_RELANCER, CMD_TOUR_EN_8, CMD_ROTATION, CMD_ARRET = range(1, 7)
+
+
+class TelemetryBlock:
+    """
+    Bloc de télémétrie en mémoire partagée, sans verrou partagé.
+
+    Disposition : un enregistrement ``struct`` (little-endian) formé d'un numéro de séquence
+    (int64), d'un float64 par champ et d'un CRC32 (uint64) de la séquence et des valeurs.
+
+    Aucune barrière mémoire n'ordonne les écritures entre processus : sur ARM (Raspberry Pi),
+    le lecteur peut voir une partie des octets d'une publication et une partie de la
+    précédente. L'écrivain recopie donc à chaque publication l'enregistrement complet, d'un
+    seul bloc, et le lecteur n'accepte une copie que si sa somme de contrôle correspond :
+    toute lecture déchirée, quel que soit l'ordre dans lequel les octets sont devenus visibles,
+    est détectée et recommencée.
+    """
+
+    def __init__(self, name=None, fields=TELEMETRY_FIELDS):
+        """
+        :param name: Nom d'un segment existant à ouvrir, ou None pour en créer un.
+        :param fields: Noms des champs publiés.
+        """
+        self.fields = tuple(fields)
+        self._index = {field: i for i, field in enumerate(self.fields)}
+        self._payload = struct.Struct(f"<q{len(self.fields)}d")
+        self._checksum = struct.Struct("<Q")
+        size = self._payload.size + self._checksum.size
+        self._owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+        # Copie locale de l'écrivain : chaque publication réécrit l'enregistrement entier
+        self._seq = 0
+        self._latest = [math.nan] * len(self.fields)
+        if self._owner:
+            self._write()
+        else:
+            record = self._read_record()
+            if record is not None:
+                self._seq, self._latest = record[0], list(record[1:])
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _write(self):
+        payload = self._payload.pack(self._seq, *self._latest)
+        self.shm.buf[:self._payload.size + self._checksum.size] = payload + self._checksum.pack(zlib.crc32(payload))
+
+    def _read_record(self):
+        """:return: Tuple (séquence, valeurs...) d'une copie cohérente, ou None si elle est déchirée."""
+        data = bytes(self.shm.buf[:self._payload.size + self._checksum.size])
+        payload = data[:self._payload.size]
+        if self._checksum.unpack_from(data, self._payload.size)[0] != zlib.crc32(payload):
+            return None
+        return self._payload.unpack(payload)
+
+    def publish(self, **values):
+        """Écrit les champs donnés (un seul écrivain : le processus de contrôle)."""
+        for field, value in values.items():
+            self._latest[self._index[field]] = math.nan if value is None else value
+        self._seq += 1
+        self._write()
+
+    def read(self, retries=1000):
+        """
+        Lit une copie cohérente de tous les champs.
+
+        :return: Dictionnaire {champ: valeur ou None si jamais publiée}.
+        :raises RuntimeError: Si aucune lecture cohérente n'a pu être faite.
+        """
+        for _ in range(retries):
+            record = self._read_record()
+            if record is not None:
+                return {field: (None if math.isnan(v) else float(v)) for field, v in zip(self.fields, record[1:])}
+            time.sleep(0)  # Laisse l'écrivain terminer (même processus : GIL)
+        raise RuntimeError("Télémétrie illisible : écriture en cours trop longue.")
+
+    def close(self):
+        """Ferme le segment (et le supprime s'il a été créé par cette instance)."""
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+class CommandRing:
+    """
+    File circulaire de commandes (code entier, argument réel) en mémoire partagée.
+
+    Un seul producteur et un seul consommateur : le producteur n'écrit que ``head``, le
+    consommateur n'écrit que ``tail``, aucun verrou n'est partagé entre les processus.
+    Côté producteur, un verrou local sérialise les threads d'un même processus (Flask, RGB).
+
+    Comme pour TelemetryBlock, rien ne garantit que le consommateur voit la case écrite avant
+    la nouvelle valeur de ``head`` : chaque case est un enregistrement ``struct`` (numéro de la
+    commande, code, argument) suivi d'un CRC32. Le consommateur n'accepte une case que si la
+    somme de contrôle correspond et si le numéro est celui attendu ; sinon il la relit, puis
+    la laisse en place pour l'appel suivant (la commande est retardée, jamais perdue).
+    """
+
+    def __init__(self, name=None, capacity=64):
+        """
+        :param name: Nom d'un segment existant à ouvrir, ou None pour en créer un.
+        :param capacity: Nombre de commandes en attente au maximum.
+        """
+        self.capacity = capacity
+        self._record = struct.Struct("<qqd")  # Numéro de la commande, code, argument
+        self._checksum = struct.Struct("<Q")
+        self._slot_size = self._record.size + self._checksum.size
+        self._owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self._owner, size=16 + self._slot_size * capacity)
+        self._indices = np.ndarray((2,), dtype=np.int64, buffer=self.shm.buf, offset=0)
+        if self._owner:
+            self._indices[:] = 0
+        self._producer_lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _slot_offset(self, index):
+        return 16 + (index % self.capacity) * self._slot_size
+
+    def _read_slot(self, index):
+        """:return: Tuple (code, argument) de la commande ``index``, ou None si la case n'est pas encore cohérente."""
+        offset = self._slot_offset(index)
+        data = bytes(self.shm.buf[offset:offset + self._slot_size])
+        payload = data[:self._record.size]
+        if self._checksum.unpack_from(data, self._record.size)[0] != zlib.crc32(payload):
+            return None
+        number, code, arg = self._record.unpack(payload)
+        if number != index:
+            return None  # Case d'un tour précédent
+        return code, arg
+
+    def push(self, code, arg=0.0):
+        """
+        Ajoute une commande.
+
+        :return: False si la file est pleine (la commande est perdue).
+        """
+        with self._producer_lock:
+            head, tail = int(self._indices[0]), int(self._indices[1])
+            if head - tail >= self.capacity:
+                return False
+            payload = self._record.pack(head, code, arg)
+            offset = self._slot_offset(head)
+            self.shm.buf[offset:offset + self._slot_size] = payload + self._checksum.pack(zlib.crc32(payload))
+            self._indices[0] = head + 1
+            return True
+
+    def pop(self, retries=10):
+        """
+        Retire la plus ancienne commande.
+
+        :param retries: Nombre de relectures d'une case publiée mais pas encore cohérente.
+        :return: Tuple (code, argument) ou None si la file est vide (ou sa première case pas
+                 encore visible : elle sera relue au prochain appel).
+        """
+        head, tail = int(self._indices[0]), int(self._indices[1])
+        if tail == head:
+            return None
+        for _ in range(retries):
+            command = self._read_slot(tail)
+            if command is not None:
+                # Écrit seulement après la vérification : la case n'est libérée qu'une fois lue
+                self._indices[1] = tail + 1
+                return int(command[0]), float(command[1])
+            time.sleep(0)
+        return None
+
+    def close(self):
+        del self._indices
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+class ControllerProxy:
+    """
+    Remplaçant de ControllerCar / CarLauncher / VoitureController dans le processus du serveur web.
+    """
+
+    def __init__(self, telemetry, commands, owner=None):
+        """
+        :param telemetry: TelemetryBlock publié par le processus de contrôle.
+        :param commands: CommandRing vers le processus de contrôle.
+        :param owner: ControlProcess à arrêter lors de ``shutdown`` (optionnel).
+        """
+        self.telemetry = telemetry
+        self.commands = commands
+        self.owner = owner
+
+    def _send(self, code, arg=0.0):
+        if not self.commands.push(code, arg):
+            print("⚠️ File de commandes pleine : commande ignorée.")
+
+    # --- Lectures (télémétrie) ---------------------------------------------------------------
+
+    def get_distances(self):
+        data = self.telemetry.read()
+        return {"front": data["front"], "left": data["left"], "right": data["right"]}
+
+    def get_speed_estimate(self):
+        data = self.telemetry.read()
+        return {
+            "speed": data["speed"] or 0.0,
+            "confidence": data["speed_confidence"] or 0.0,
+            "efficiency": data["efficiency"],
+            "heading": data["heading"] or 0.0,
+            "odometer": data["odometer"] or 0.0,
+            "x": data["x"],
+            "y": data["y"],
+        }
+
+    def get_speed(self):
+        return self.get_speed_estimate()["speed"]
+
+    def state(self):
+        """État du processus de contrôle (STATE_*), ou None s'il n'a encore rien publié."""
+        state = self.telemetry.read()["state"]
+        return None if state is None else int(state)
+
+    # --- Actions (commandes) -----------------------------------------------------------------
+
+    def run(self):
+        self._send(CMD_LANCER)
+
+    def launch(self):
+        self._send(CMD_LANCER)
+
+    def lancer_voiture(self):
+        self._send(CMD_AVANCER)
+
+    def restart_car(self):
+        self._send(CMD_RELANCER)
+
+    def tour_en_8(self):
+        self._send(CMD_TOUR_EN_8)
+
+    def rotation_sur_place(self):
+        self._send(CMD_ROTATION)
+
+    def shutdown(self):
+        """Arrête la voiture dans le processus de contrôle, attend sa fin puis quitte (comme CarLauncher)."""
+        print("🔒 Arrêt de la voiture en cours...")
+        if self.owner is not None:
+            self.owner.stop()
+        else:
+            self._send(CMD_ARRET)
+        os._exit(0)
+
+
+class ControlService:
+    """
+    Côté processus de contrôle : crée la voiture, exécute les commandes reçues et publie
+    la télémétrie à fréquence fixe.
+    """
+
+    def __init__(self, car, launcher, basic_controller, telemetry, commands, publish_period=0.05, poll_period=0.005):
+        self.car = car
+        self.launcher = launcher
+        self.basic_controller = basic_controller
+        self.telemetry = telemetry
+        self.commands = commands
+        self.publish_period = publish_period
+        self.poll_period = poll_period
+        self._threads = {}
+
+    def _start(self, name, target):
+        """Lance une action longue dans un thread, sauf si la même action tourne déjà."""
+        thread = self._threads.get(name)
+        if thread is not None and thread.is_alive():
+            print(f"Action '{name}' déjà en cours.")
+            return
+        self._threads[name] = threading.Thread(target=target, daemon=True)
+        self._threads[name].start()
+
+    def handle(self, code):
+        """
+        Exécute une commande.
+
+        :return: False pour la commande d'arrêt, True sinon.
+        """
+        if code == CMD_LANCER:
+            self._start("lancer", self.launcher.launch)
+        elif code == CMD_AVANCER:
+            self._start("avancer", self.basic_controller.lancer_voiture)
+        elif code == CMD_RELANCER:
+            self._start("relancer", self.car.restart_car)
+        elif code == CMD_TOUR_EN_8:
+            self._start("tour_en_8", self.car.tour_en_8)
+        elif code == CMD_ROTATION:
+            self._start("rotation", self.car.rotation_sur_place)
+        elif code == CMD_ARRET:
+            return False
+        else:
+            print(f"Commande inconnue : {code}")
+        return True
+
+    def publish(self):
+        """Publie l'état courant de la voiture."""
+        snapshot = self.car.last_snapshot
+        estimate = self.car.speed_estimator.state()
+        running = self._threads.get("lancer")
+        self.telemetry.publish(
+            timestamp=time.time(),
+            state=STATE_RUNNING if running is not None and running.is_alive() else STATE_READY,
+            front=None if snapshot is None else snapshot.front,
+            left=None if snapshot is None else snapshot.left,
+            right=None if snapshot is None else snapshot.right,
+            speed=estimate["speed"],
+            speed_confidence=estimate["confidence"],
+            heading=estimate["heading"],
+            odometer=estimate["odometer"],
+            x=estimate["x"],
+            y=estimate["y"],
+            efficiency=estimate["efficiency"],
+            motor_command=self.car.motor_ctrl.commanded_speed,
+            steer=self.car.servo_ctrl.current_angle,
+        )
+
+    def serve(self):
+        """Boucle du service : commandes scrutées toutes les ``poll_period``, télémétrie toutes les ``publish_period``."""
+        next_publish = time.monotonic()
+        try:
+            while True:
+                command = self.commands.pop()
+                while command is not None:
+                    if not self.handle(command[0]):
+                        return
+                    command = self.commands.pop()
+                if time.monotonic() >= next_publish:
+                    self.publish()
+                    next_publish += self.publish_period
+                time.sleep(self.poll_period)
+        finally:
+            self.car.cleanup()
+            self.telemetry.publish(timestamp=time.time(), state=STATE_STOPPED)
+
+
+def _control_process_main(telemetry_name, commands_name, strategy, use_calibration_cache, fast_boot, realtime=None):
+    """Point d'entrée du processus de contrôle."""
+    # Imports locaux : le matériel n'est initialisé que dans ce processus
+    from ControllerCar import ControllerCar
+    from CarLauncher import CarLauncher
+    from VoitureController import VoitureController
+    from CalibrationCache import CalibrationCache
+
+    telemetry = TelemetryBlock(name=telemetry_name)
+    commands = CommandRing(name=commands_name)
+    try:
+        car = ControllerCar()
+        car.set_strategy(strategy)
+        car.realtime = realtime
+        car.calibration_cache = CalibrationCache() if use_calibration_cache else None
+        car.init_servo(sweep=not fast_boot)  # Démarrage rapide : roues centrées, sans balayage
+        service = ControlService(car, CarLauncher(car), VoitureController(), telemetry, commands)
+        service.publish()
+        service.serve()
+    except Exception as e:
+        print(f"Erreur dans le processus de contrôle : {e}")
+        telemetry.publish(timestamp=time.time(), state=STATE_ERROR)
+        raise
+    finally:
+        telemetry.close()
+        commands.close()
+
+
+class ControlProcess:
+    """
+    Côté processus principal : crée la mémoire partagée, lance le processus de contrôle et
+    fournit le ControllerProxy utilisé par le serveur web et la surveillance RGB.
+    """
+
+    def __init__(self, strategy="seuils", use_calibration_cache=True, fast_boot=False, realtime=None):
+        self.telemetry = TelemetryBlock()
+        self.commands = CommandRing()
+        # "spawn" : le processus de contrôle ne hérite ni des threads ni des verrous du parent
+        context = multiprocessing.get_context("spawn")
+        self.process = context.Process(
+            target=_control_process_main,
+            args=(self.telemetry.name, self.commands.name, strategy, use_calibration_cache, fast_boot, realtime),
+            name="controle_voiture",
+            daemon=True,
+        )
+        self.proxy = ControllerProxy(self.telemetry, self.commands, self)
+        self._stopped = False
+
+    def start(self, timeout=30):
+        """
+        Lance le processus de contrôle et attend qu'il ait publié son premier état.
+
+        :return: Le ControllerProxy.
+        :raises RuntimeError: Si le processus échoue ou ne répond pas à temps.
+        """
+        self.process.start()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            state = self.proxy.state()
+            if state in (STATE_READY, STATE_RUNNING):
+                return self.proxy
+            if state == STATE_ERROR or not self.process.is_alive():
+                break
+            time.sleep(0.05)
+        self.process.terminate()
+        raise RuntimeError("Le processus de contrôle n'a pas démarré.")
+
+    def stop(self, timeout=3):
+        """Demande l'arrêt du processus de contrôle et libère la mémoire partagée (une seule fois)."""
+        if self._stopped:
+            return
+        self._stopped = True
+        if self.process.pid is not None and self.process.is_alive():
+            self.commands.push(CMD_ARRET)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.telemetry.close()
+        self.commands.close()
@@ -14,9 +14,26 @@ Quoi   : Fournit la classe ControllerCar qui utilise trois capteurs pour la navi
 import time
 from ControllerMotor import ControllerMotor
 from ControllerServo import ControllerServo
-from CapteurDistance import CapteurDistance
-import RPi.GPIO as GPIO
+from CapteurDistance import CapteurDistance, DISTANCE_MIN, OK, TROP_PROCHE, PAS_D_ECHO
+from BootSequence import BootSequence
+from SpeedEstimator import SpeedEstimator
+from Trajectory import Trajectory
+from OccupancyGrid import OccupancyGrid
+from DynamicWindow import DynamicWindowPlanner
+from Manoeuvre import Manoeuvre, ManoeuvreRunner, Step, LIBRE
+from SensorSnapshot import SensorSnapshot
+from RealTime import LoopTimer, IterationTimer
+from Watchdog import EmergencyStop, Watchdog
+from Tuning import TuningConfig
+from Decision import decide, TOUT_DROIT, URGENCE, OBSTACLE_AVANT, OBSTACLE_DOUBLE, OBSTACLE_GAUCHE, OBSTACLE_DROIT
+from Hardware import lazy
 import math
+import threading
+from collections import Counter
+
+GPIO = lazy("RPi.GPIO")
+
+STRATEGIES = ("seuils", "fenetre_dynamique")
 
 class ControllerCar:
     """
@@ -33,196 +50,555 @@ class ControllerCar:
         if hasattr(self, '_initialized') and self._initialized:
             return
 
-        # Seuils de détection (en cm)
-        self.side_threshold = 12         # Seuil pour obstacles latéraux
-        self.front_threshold = 41        # Seuil pour alerte obstacle frontal
-        self.emergency_threshold = 40    # Seuil pour urgence obstacle frontal
-
-        # Paramètres de virage
-        self.angle_virage_gauche = -30
-        self.angle_virage_droite = 30
-        self.angle_central = 45
-
-        # Durées (en secondes)
-        self.duree_virage = 0.4
-        self.duree_marche_arriere = 0.35
-        self.reverse_pause = 0.5
+        # Réglages de conduite (seuils en cm, angles de virage, durées en s, vitesses) : valeurs
+        # par défaut ou fichier tuning.json, rechargés à chaud entre deux itérations (voir Tuning)
+        self.tuning = TuningConfig()
 
         # Création des trois capteurs en instanciant la classe CapteurDistance
         max_distance = 4  # Distance maximale en mètres détectable par les capteurs
 
-        self.capteur_left = CapteurDistance(trigger=26, echo=19, max_distance=max_distance)
-        self.capteur_right = CapteurDistance(trigger=11, echo=9, max_distance=max_distance)
-        self.capteur_front = CapteurDistance(trigger=6, echo=5, max_distance=max_distance)
+        # Les capteurs GPIO s'initialisent en parallèle de la chaîne PCA9685 ;
+        # moteurs et servo partagent le même PCA9685 et sont donc initialisés l'un après l'autre.
+        boot = BootSequence("ControllerCar")
+        boot.add("capteurs_distance", lambda: (
+            CapteurDistance(trigger=26, echo=19, max_distance=max_distance),
+            CapteurDistance(trigger=11, echo=9, max_distance=max_distance),
+            CapteurDistance(trigger=6, echo=5, max_distance=max_distance),
+        ))
+        # Moteur de rampes : accélérations et inversions progressives (pas d'à-coups ni de patinage)
+        boot.add("moteurs", lambda: ControllerMotor(ramp=True))
+        boot.add("servo", ControllerServo, depends_on=["moteurs"])
+        boot.run()
+        self.boot_timings = boot.timings
+
+        self.capteur_left, self.capteur_right, self.capteur_front = boot.result("capteurs_distance")
 
         # Initialisation des contrôleurs de moteurs et du servo
-        self.motor_ctrl = ControllerMotor()
-        self.servo_ctrl = ControllerServo()
+        self.motor_ctrl = boot.result("moteurs")
+        self.servo_ctrl = boot.result("servo")
 
-        # Simulation de la vitesse dynamique
-        self.current_speed = 0.0     # Vitesse actuelle en m/s
-        self.max_speed = 2.0         # Vitesse maximale simulée en m/s
-        self.acceleration = 0.1      # Accélération (m/s par cycle)
-        self.deceleration = 0.2      # Décélération en cas d'interruption
+        self._init_control(clock=time.monotonic, sleep=time.sleep)
+
+        # Chien de garde : créé au premier ``run`` (ni thread ni écriture sur le PCA9685 pour un
+        # usage sans boucle de contrôle, serveur web seul par exemple)
+        self.watchdog = None
 
         self._initialized = True
 
-        self.motor_speed_forwards = 35
-        self.motor_speed_backwards = 40
+    def _init_control(self, clock, sleep):
+        """
+        État de conduite indépendant du matériel (réglages, estimation, planification, manœuvres),
+        partagé avec la voiture simulée (voir Simulation.SimulatedCar).
+
+        :param clock: Horloge monotone de la boucle de contrôle.
+        :param sleep: Fonction d'attente de la boucle de contrôle.
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.apply_tuning(self.tuning.values)
+
+        # Estimation de la vitesse réelle (commande moteur + variation de la distance avant)
+        self.max_speed = 2.0         # Vitesse à pleine commande (m/s), modèle non calibré
+        self.speed_estimator = SpeedEstimator(gain=self.max_speed / 100)
+        # Anticipation (s) : les seuils avant sont augmentés de la distance parcourue pendant ce délai
+        self.speed_margin = 0.0
+        # Dernier instantané des capteurs et âge maximal (s) toléré avant une nouvelle lecture
+        self.last_snapshot = None
+        self.snapshot_max_age = 0.15
+        # Mesures sans écho : dernière distance connue reprise au plus ``echo_loss_limit`` fois de suite
+        self.echo_loss_limit = 3
+        self.echo_losses = Counter()  # Capteur -> mesures sans écho consécutives
+
+        # Grille d'occupation locale : mémoire des obstacles vus récemment pour le choix du virage
+        self.occupancy = OccupancyGrid(clock=clock)
+
+        # Stratégie de conduite : "seuils" (historique) ou "fenetre_dynamique" (planificateur)
+        self.strategy = "seuils"
+        self.planner = DynamicWindowPlanner(speed_gain=self.max_speed / 100)
+        self.planner_period = 0.1  # Période de la boucle du planificateur (secondes)
+        self.loop_tolerance = 0.02  # Écart à la durée médiane d'une itération "seuils" compté comme dépassement
+        self.loop_timer = None     # Gigue de la boucle de contrôle (planificateur ou "seuils")
+
+        # Réglages temps réel du thread de contrôle (RealTimeConfig, optionnels) et leur résultat
+        self.realtime = None
+        self.realtime_report = None
+
+        # Cache de calibration (optionnel) permettant d'éviter le balayage du servo
+        self.calibration_cache = None
+
+        # Manœuvre exécutée pour chaque action de la stratégie "seuils" (voir Decision.decide)
+        self.obstacle_handlers = {
+            URGENCE: self.handle_emergency_obstacle,
+            OBSTACLE_AVANT: self.handle_front_obstacle,
+            OBSTACLE_DOUBLE: self.handle_double_side_obstacle,
+            OBSTACLE_GAUCHE: self.handle_left_obstacle,
+            OBSTACLE_DROIT: self.handle_right_obstacle,
+        }
+
+        # Ordonnanceur unique des manœuvres : mesure pendant les attentes, interruptible
+        self.manoeuvres = ManoeuvreRunner(
+            self.servo_ctrl.setToDegree,
+            self.apply_speed,
+            release_steer=self.servo_ctrl.disable_pwm,
+            sense=self.sense,
+            conditions={"obstacle_avant": self.front_obstacle_detected},
+            clock=clock,
+            sleep=None if sleep is time.sleep else sleep,
+            apply_turn=self.servo_ctrl.rotate,
+        )
+
+    def sense(self):
+        """Mesure pendant les attentes des manœuvres : signal de vie et estimation de vitesse."""
+        if self.watchdog is not None:
+            self.watchdog.feed()
+        return self.update_speed_estimate()
+
+    def _arm_watchdog(self):
+        """
+        Crée si besoin puis arme le chien de garde : s'il n'est plus nourri, il fige le moteur
+        de rampes (sans verrou) puis coupe les moteurs par le chemin d'arrêt direct sur le PCA9685.
+        """
+        if self.watchdog is None:
+            emergency_stop = EmergencyStop(*self.motor_ctrl.pwm_address, halt=self.motor_ctrl.halt)
+            self.watchdog = Watchdog(emergency_stop.trigger, deadline=0.5, on_trip=self._on_watchdog_trip)
+        self.watchdog.arm()
+
+    def _on_watchdog_trip(self):
+        """
+        Après l'arrêt d'urgence : interrompt la manœuvre en cours et remet les contrôleurs en
+        cohérence avec le PCA9685 (dans un thread, le verrou des moteurs pouvant être bloqué).
+        """
+        self.manoeuvres.cancel()
+        self.manoeuvres.forget_outputs()
+        threading.Thread(target=self.motor_ctrl.reset_after_emergency_stop, daemon=True).start()
+
+    def apply_tuning(self, values):
+        """Affecte un jeu de réglages de conduite (déjà validé) aux attributs de la voiture."""
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def reload_tuning(self):
+        """
+        Applique, entre deux itérations de la boucle de contrôle, les réglages modifiés depuis
+        l'itération précédente (serveur web ou fichier).
+
+        :return: Dictionnaire des réglages changés (vide si aucun).
+        """
+        changes = self.tuning.poll()
+        if not changes:
+            return {}
+        self.apply_tuning(changes)
+        print(f"🔧 Réglages appliqués : {', '.join(f'{name}={value}' for name, value in changes.items())}")
+        return changes
+
+    def set_strategy(self, strategy):
+        """
+        Choisit la stratégie de conduite utilisée par ``run``.
+
+        :param strategy: "seuils" ou "fenetre_dynamique".
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Stratégie inconnue : '{strategy}' (valeurs possibles : {', '.join(STRATEGIES)})")
+        self.strategy = strategy
 
     def run(self):
         """
         Lance la boucle principale de contrôle autonome de la voiture.
         """
+        if self.realtime is not None and self.realtime.enabled:
+            # Appliqué ici : l'affinité et la priorité ne concernent que le thread appelant
+            self.realtime_report = self.realtime.apply()
+        self.manoeuvres.resume()  # Nouvelle session : lève l'annulation laissée par cleanup ou le chien de garde
+        self._arm_watchdog()
+        if self.strategy == "fenetre_dynamique":
+            return self.run_planner()
         print("Démarrage : la voiture avance en ligne droite...")
         self.motor_ctrl.forward(self.motor_speed_forwards)
-        self.current_speed = 0.0
+        self.speed_estimator.reset()
         self.servo_ctrl.setToDegree(self.angle_central)
+        # Boucle non cadencée : la gigue est l'écart de chaque itération à la durée médiane
+        # (lecture des trois capteurs comprise), pas le dépassement d'une période fixe
+        self.loop_timer = IterationTimer(self.loop_tolerance, clock=self.clock)
+        self.loop_timer.restart()
 
         try:
-            while True:
-                # Accélération progressive si aucune perturbation
-                if self.current_speed < self.max_speed:
-                    self.current_speed += self.acceleration
-                    if self.current_speed > self.max_speed:
-                        self.current_speed = self.max_speed
-
-                # Lecture des distances à partir des trois capteurs
-                distance_front = self.capteur_front.get_distance()
-                distance_left  = self.capteur_left.get_distance()
-                distance_right = self.capteur_right.get_distance()
-
-                print(f"Distances -> Avant: {round(distance_front, 2)} cm, Gauche: {round(distance_left, 2)} cm, Droite: {round(distance_right, 2)} cm")
+            while not self.watchdog.tripped:
+                self.watchdog.feed()
+                changes = self.reload_tuning()
+                if "motor_speed_forwards" in changes:
+                    self.apply_speed(self.motor_speed_forwards)
+                if "angle_central" in changes:
+                    self.servo_ctrl.setToDegree(self.angle_central)
+                # Lecture des trois capteurs : un seul instantané pour tout le chemin de décision
+                snapshot = self.take_snapshot()
+
+                print(f"Distances -> Avant: {round(snapshot.front, 2)} cm, Gauche: {round(snapshot.left, 2)} cm, Droite: {round(snapshot.right, 2)} cm")
 
                 # Gestion des obstacles en fonction des distances mesurées
-                if distance_front < self.emergency_threshold:
-                    self.handle_emergency_obstacle()
-                elif distance_front < self.front_threshold:
-                    self.handle_front_obstacle()
-                elif distance_left < self.side_threshold and distance_right < self.side_threshold:
-                    self.handle_double_side_obstacle()
-                elif distance_left < self.side_threshold:
-                    self.handle_left_obstacle()
-                elif distance_right < self.side_threshold:
-                    self.handle_right_obstacle()
+                action = self.decide(snapshot)
+                if action != TOUT_DROIT:
+                    self.obstacle_handlers[action](snapshot)
+                    self.loop_timer.restart()  # La durée d'une manœuvre n'est pas un retard de la boucle
+                else:
+                    self.loop_timer.record()
 
         except KeyboardInterrupt:
             print("Ctrl+C détecté : arrêt en cours...")
         finally:
             self.cleanup()
 
-    def handle_emergency_obstacle(self):
-        """Gère un obstacle frontal en situation d'urgence."""
-        distance_front = self.capteur_front.get_distance()
-        print(f"URGENCE! Obstacle frontal très proche ({round(distance_front, 2)} cm).")
-        self.motor_ctrl.stop()
-        self.current_speed = 0.0
-        time.sleep(0.4)
-        self.motor_ctrl.backward(-self.motor_speed_backwards)
-        self.current_speed = -0.5  # Vitesse de recul simulée
-        time.sleep(self.duree_marche_arriere * 1.5)
-        self.turn_to_most_space()
-        self.motor_ctrl.forward(self.motor_speed_forwards)
-        self.current_speed = self.max_speed  # Reprise de la vitesse
+    def decide(self, snapshot):
+        """Action d'évitement (voir Decision.decide) pour un instantané, aux seuils effectifs actuels."""
+        return decide(snapshot.front, snapshot.left, snapshot.right,
+                      self.speed_threshold(self.emergency_threshold),
+                      self.speed_threshold(self.front_threshold),
+                      self.side_threshold)
 
-    def handle_front_obstacle(self):
-        """Gère un obstacle frontal en reculant et en tournant vers le côté le plus dégagé."""
-        distance_front = self.capteur_front.get_distance()
-        print(f"Obstacle frontal détecté ({round(distance_front, 2)} cm).")
-        self.motor_ctrl.stop()
-        self.current_speed = 0.0
-        time.sleep(self.reverse_pause)
-        print("Marche arrière pour dégager l'obstacle frontal...")
-        self.motor_ctrl.backward(-self.motor_speed_backwards)
-        self.current_speed = -0.5
-        time.sleep(self.duree_marche_arriere)
-        self.turn_to_most_space()
-        self.motor_ctrl.forward(self.motor_speed_forwards)
-        self.current_speed = self.max_speed  # Reprise de la vitesse
+    def capteur(self, sensor):
+        """Capteur de distance "front", "left" ou "right"."""
+        return {"front": self.capteur_front, "left": self.capteur_left, "right": self.capteur_right}[sensor]
 
-    def turn_to_most_space(self):
-        """Tourne vers le côté où il y a le plus d'espace disponible."""
-        distance_left = self.capteur_left.get_distance()
-        distance_right = self.capteur_right.get_distance()
-        
-        if distance_left > distance_right:
+    def read_sensor(self, sensor):
+        """Distance (cm) d'un capteur pour la décision, quel que soit le statut de sa mesure."""
+        return self.distance_from_reading(sensor, self.capteur(sensor).read())
+
+    def distance_from_reading(self, sensor, reading):
+        """
+        Distance (cm) retenue pour une mesure (voir CapteurDistance.read), selon son statut :
+          - ok : la distance mesurée ;
+          - trop proche : DISTANCE_MIN (obstacle au contact) ;
+          - saturé : la portée du capteur (rien à portée) ;
+          - sans écho : la dernière distance connue du capteur, au plus ``echo_loss_limit`` fois
+            de suite, puis la portée (convention de gpiozero : pas d'écho, pas d'obstacle).
+        """
+        if reading.status != PAS_D_ECHO:
+            self.echo_losses[sensor] = 0
+        if reading.status == OK:
+            return reading.distance
+        if reading.status == TROP_PROCHE:
+            return DISTANCE_MIN
+        if reading.status == PAS_D_ECHO:
+            self.echo_losses[sensor] += 1
+            if self.echo_losses[sensor] <= self.echo_loss_limit and self.last_snapshot is not None:
+                return getattr(self.last_snapshot, sensor)
+            if self.echo_losses[sensor] == self.echo_loss_limit + 1:
+                print(f"⚠️ Capteur {sensor} : {self.echo_loss_limit} mesures sans écho de suite, distance supposée libre.")
+        return self.capteur(sensor).range
+
+    def get_sensor_counts(self):
+        """Nombre de mesures par statut pour chaque capteur : {capteur: {statut: nombre}}."""
+        return {sensor: dict(self.capteur(sensor).counts) for sensor in ("front", "left", "right")}
+
+    def take_snapshot(self, sensors=("front", "left", "right"), base=None):
+        """
+        Mesure les capteurs demandés, publie l'instantané (dernier instantané, estimation de
+        vitesse, grille d'occupation) et le retourne.
+
+        :param sensors: Capteurs à mesurer ; les autres valeurs sont reprises de ``base``.
+        :param base: Instantané à compléter (mesure partielle).
+        """
+        snapshot = SensorSnapshot.measure(self.read_sensor, sensors, base, clock=self.clock)
+        self.last_snapshot = snapshot
+        estimate = self.update_speed_estimate(snapshot.front if "front" in sensors else None)
+        self.update_occupancy(estimate, {sensor: getattr(snapshot, sensor) for sensor in sensors})
+        return snapshot
+
+    def refresh_snapshot(self, snapshot, sensors=("front", "left", "right"), max_age=None):
+        """
+        Politique de fraîcheur : retourne ``snapshot`` (le dernier instantané s'il n'est pas fourni)
+        si les mesures demandées ont au plus ``max_age`` secondes (``snapshot_max_age`` par défaut),
+        sinon mesure à nouveau ces capteurs seulement.
+        """
+        max_age = self.snapshot_max_age if max_age is None else max_age
+        if snapshot is None:
+            snapshot = self.last_snapshot
+        if snapshot is None:
+            return self.take_snapshot()
+        if snapshot.is_fresh(max_age, sensors, now=self.clock()):
+            return snapshot
+        return self.take_snapshot(sensors, base=snapshot)
+
+    def apply_speed(self, speed, spin=False, immediate=False):
+        """
+        Applique une vitesse moteur signée : avant (> 0), arrière (< 0), arrêt (0)
+        ou rotation sur place si ``spin``. Ignorée après un arrêt du chien de garde.
+
+        :param immediate: Arrêt sans rampe de décélération (obstacle proche).
+        """
+        if self.watchdog is not None and self.watchdog.tripped:
+            return
+        if spin:
+            self.motor_ctrl.spin(speed)
+        elif speed > 0:
+            self.motor_ctrl.forward(speed)
+        elif speed < 0:
+            self.motor_ctrl.backward(speed)
+        else:
+            self.motor_ctrl.stop(immediate=immediate)
+
+    def front_obstacle_detected(self):
+        """
+        Condition d'arrêt des manœuvres : obstacle avant sous le seuil d'urgence. Vérifiée à chaque
+        pas de l'ordonnanceur : une seule lecture, sans filtrage, pour ne pas allonger le pas.
+        """
+        reading = self.capteur_front.read(sample_count=1)
+        if reading.status == PAS_D_ECHO:
+            return False  # Écho perdu : pas d'information
+        return self.distance_from_reading("front", reading) < self.speed_threshold(self.emergency_threshold)
+
+    def update_occupancy(self, estimate, distances):
+        """
+        Met à jour la grille d'occupation avec la pose estimée et des distances en cm.
+
+        :param estimate: État de SpeedEstimator (x, y, heading).
+        :param distances: Dictionnaire {"front"/"left"/"right": distance en cm}.
+        """
+        self.occupancy.update_pose(estimate["x"], estimate["y"], estimate["heading"])
+        self.occupancy.add_distances({sensor: distance / 100 for sensor, distance in distances.items()})
+
+    def most_space_turn(self, snapshot=None):
+        """
+        Retourne le braquage relatif (rotate) qui oriente la voiture vers le côté le plus dégagé.
+        La grille d'occupation (mesures récentes comprises) décide ; si elle ne départage pas
+        les deux côtés, les distances latérales sont comparées. Les capteurs latéraux ne sont
+        relus que si l'instantané est périmé (par exemple après une marche arrière).
+        """
+        snapshot = self.refresh_snapshot(snapshot, ("left", "right"))
+        side = self.occupancy.best_turn()
+        if side == "left" or (side is None and snapshot.left > snapshot.right):
             print("Plus d'espace à gauche - virage à gauche")
-            self.servo_ctrl.rotate(self.angle_virage_gauche)
+            return self.angle_virage_gauche
+        print("Plus d'espace à droite - virage à droite")
+        return self.angle_virage_droite
+
+    def steer_relative(self, steer):
+        """
+        Braque les roues de ``steer`` degrés par rapport au centre : roues droites par
+        setToDegree(angle_central), virages par rotate, comme les manœuvres d'évitement.
+        """
+        if steer == 0:
+            self.servo_ctrl.setToDegree(self.angle_central)
         else:
-            print("Plus d'espace à droite - virage à droite")
-            self.servo_ctrl.rotate(self.angle_virage_droite)
-        
-        time.sleep(self.duree_virage)
-        self.servo_ctrl.setToDegree(self.angle_central)
+            self.servo_ctrl.rotate(steer)
 
-    def handle_double_side_obstacle(self):
-        distance_left = self.capteur_left.get_distance()
-        distance_right = self.capteur_right.get_distance()
-        print(f"Obstacle double détecté (Gauche: {round(distance_left, 2)} cm, Droite: {round(distance_right, 2)} cm).")
-        self.motor_ctrl.backward(-self.motor_speed_backwards)
-        self.current_speed = 0.0
-        time.sleep(self.duree_marche_arriere)
-        self.turn_to_most_space()
-        self.motor_ctrl.forward(self.motor_speed_forwards)
-        self.current_speed = self.max_speed
+    def turn_steps(self, snapshot=None):
+        """Étapes communes : virage vers le côté le plus dégagé puis reprise en ligne droite."""
+        return [
+            Step(turn=lambda: self.most_space_turn(snapshot), duration=self.duree_virage, name="virage"),
+            Step(steer=self.angle_central, speed=self.motor_speed_forwards, name="reprise"),
+        ]
 
-    def handle_left_obstacle(self):
-        distance_left = self.capteur_left.get_distance()
-        print(f"Obstacle détecté sur le côté gauche ({round(distance_left, 2)} cm). Virage à gauche.")
-        self.motor_ctrl.forward(self.motor_speed_forwards)
-        self.current_speed = 0.5
-        self.servo_ctrl.rotate(self.angle_virage_gauche)
-        time.sleep(self.duree_virage)
+    def run_planner(self):
+        """
+        Boucle de conduite par fenêtre dynamique : à chaque période, le planificateur choisit
+        un arc (braquage et vitesse continus) à partir des dernières distances. S'il n'existe
+        aucun arc sûr, la manœuvre de dégagement d'obstacle frontal est exécutée.
+        """
+        print("Démarrage : conduite par fenêtre dynamique...")
+        self.speed_estimator.reset()
         self.servo_ctrl.setToDegree(self.angle_central)
-        self.motor_ctrl.forward(self.motor_speed_forwards)
-        self.current_speed = self.max_speed
+        steer = 0
+        self.loop_timer = LoopTimer(self.planner_period, clock=self.clock, sleep=self.sleep)
+        self.loop_timer.restart()
+        try:
+            while not self.watchdog.tripped:
+                self.watchdog.feed()
+                if "angle_central" in self.reload_tuning():
+                    self.steer_relative(steer)
+                snapshot = self.take_snapshot()
+                command = self.planner.plan({sensor: distance / 100 for sensor, distance in snapshot.distances().items()},
+                                            current_speed=self.motor_ctrl.commanded_speed, current_steer=steer)
+                if command is None:
+                    self.handle_front_obstacle(snapshot)
+                    steer = 0
+                    self.loop_timer.restart()
+                    continue
+                new_steer, speed = command
+                if new_steer != steer:
+                    self.steer_relative(new_steer)
+                    steer = new_steer
+                self.apply_speed(speed)
+
+                # Horloge absolue : la durée des mesures est absorbée dans la période
+                self.loop_timer.wait()
+        except KeyboardInterrupt:
+            print("Ctrl+C détecté : arrêt en cours...")
+        finally:
+            self.cleanup()
 
-    def handle_right_obstacle(self):
-        distance_right = self.capteur_right.get_distance()
-        print(f"Obstacle détecté sur le côté droit ({round(distance_right, 2)} cm). Virage à droite.")
-        self.motor_ctrl.forward(self.motor_speed_forwards)
-        self.current_speed = 0.5
-        self.servo_ctrl.rotate(self.angle_virage_droite)
-        time.sleep(self.duree_virage)
-        self.servo_ctrl.setToDegree(self.angle_central)
-        self.motor_ctrl.forward(self.motor_speed_forwards)
-        self.current_speed = self.max_speed
+    def handle_emergency_obstacle(self, snapshot=None):
+        """Gère un obstacle frontal en situation d'urgence."""
+        snapshot = self.refresh_snapshot(snapshot, ("front",))
+        print(f"URGENCE! Obstacle frontal très proche ({round(snapshot.front, 2)} cm).")
+        return self.manoeuvres.run(Manoeuvre("urgence", [
+            Step(speed=0, duration=0.4, immediate=True, name="arrêt"),
+            Step(speed=-self.motor_speed_backwards, duration=self.duree_marche_arriere * 1.5, name="recul"),
+        ] + self.turn_steps(snapshot)))
+
+    def handle_front_obstacle(self, snapshot=None):
+        """Gère un obstacle frontal en reculant et en tournant vers le côté le plus dégagé."""
+        snapshot = self.refresh_snapshot(snapshot, ("front",))
+        print(f"Obstacle frontal détecté ({round(snapshot.front, 2)} cm).")
+        return self.manoeuvres.run(Manoeuvre("obstacle_avant", [
+            Step(speed=0, duration=self.reverse_pause, immediate=True, name="arrêt"),
+            Step(speed=-self.motor_speed_backwards, duration=self.duree_marche_arriere, name="recul"),
+        ] + self.turn_steps(snapshot)))
+
+    def turn_to_most_space(self, snapshot=None):
+        """Tourne vers le côté où il y a le plus d'espace disponible."""
+        self.manoeuvres.run(Manoeuvre("virage_espace", [
+            Step(turn=lambda: self.most_space_turn(snapshot), duration=self.duree_virage, name="virage"),
+            Step(steer=self.angle_central, name="centre"),
+        ]))
+
+    def handle_double_side_obstacle(self, snapshot=None):
+        snapshot = self.refresh_snapshot(snapshot, ("left", "right"))
+        print(f"Obstacle double détecté (Gauche: {round(snapshot.left, 2)} cm, Droite: {round(snapshot.right, 2)} cm).")
+        return self.manoeuvres.run(Manoeuvre("obstacle_double", [
+            Step(speed=-self.motor_speed_backwards, duration=self.duree_marche_arriere, name="recul"),
+        ] + self.turn_steps(snapshot)))
+
+    def handle_left_obstacle(self, snapshot=None):
+        snapshot = self.refresh_snapshot(snapshot, ("left",))
+        print(f"Obstacle détecté sur le côté gauche ({round(snapshot.left, 2)} cm). Virage à gauche.")
+        return self.manoeuvres.run(Manoeuvre("obstacle_gauche", [
+            Step(turn=self.angle_virage_gauche, speed=self.motor_speed_forwards,
+                 duration=self.duree_virage, abort="obstacle_avant", name="virage"),
+            Step(steer=self.angle_central, name="centre"),
+        ]))
+
+    def handle_right_obstacle(self, snapshot=None):
+        snapshot = self.refresh_snapshot(snapshot, ("right",))
+        print(f"Obstacle détecté sur le côté droit ({round(snapshot.right, 2)} cm). Virage à droite.")
+        return self.manoeuvres.run(Manoeuvre("obstacle_droit", [
+            Step(turn=self.angle_virage_droite, speed=self.motor_speed_forwards,
+                 duration=self.duree_virage, abort="obstacle_avant", name="virage"),
+            Step(steer=self.angle_central, name="centre"),
+        ]))
 
     def cleanup(self):
-        self.motor_ctrl.stop()
+        if self.watchdog is not None:
+            self.watchdog.disarm()
+        self.manoeuvres.cancel()
+        self.motor_ctrl.stop(immediate=True)
         self.servo_ctrl.disable_pwm()
         GPIO.cleanup()
         print("Nettoyage des GPIO terminé. La voiture est arrêtée.")
 
+    def update_speed_estimate(self, distance_front=None):
+        """
+        Met à jour l'estimation de vitesse avec la commande moteur actuelle, l'angle des roues
+        et, si elle est fournie, la distance avant (en cm).
+
+        :return: État estimé (vitesse, confiance, cap, odométrie).
+        """
+        return self.speed_estimator.update(
+            self.motor_ctrl.commanded_speed,
+            self.servo_ctrl.current_angle,
+            None if distance_front is None else distance_front / 100,
+            timestamp=self.clock(),
+        )
+
+    def speed_threshold(self, threshold):
+        """
+        Retourne un seuil de distance avant (cm) augmenté de la distance parcourue à la vitesse
+        estimée pendant ``speed_margin`` secondes (seuil inchangé si la marge vaut 0).
+        """
+        return threshold + self.speed_margin * max(0.0, self.speed_estimator.speed) * 100
+
     def get_speed(self):
         """
-        Renvoie la vitesse actuelle du véhicule en m/s.
+        Renvoie la vitesse estimée du véhicule en m/s (lecture seule, voir ``get_speed_estimate``).
         """
-        return self.current_speed
+        return self.speed_estimator.state()["speed"]
+
+    def get_speed_estimate(self):
+        """
+        Renvoie l'estimation complète : vitesse (m/s), confiance (0 à 1), cap (degrés),
+        distance parcourue et position (mètres).
+        Lecture seule : seule la boucle de contrôle fait avancer l'estimation (un appel depuis le
+        serveur web ne doit modifier ni l'odométrie ni la vitesse).
+        """
+        return self.speed_estimator.state()
+
+    def get_loop_jitter(self):
+        """
+        Gigue de la boucle de contrôle (voir LoopTimer.report), ou None si elle n'a pas tourné :
+        retard de réveil pour le planificateur, écart à la durée médiane d'une itération pour
+        "seuils" (voir IterationTimer).
+        """
+        return None if self.loop_timer is None else self.loop_timer.report()
+
+    def get_distances(self):
+        """
+        Renvoie les dernières distances mesurées (en cm) par la boucle de contrôle,
+        ou une nouvelle lecture des capteurs si la boucle n'a pas encore tourné.
+        """
+        if self.last_snapshot is not None:
+            return self.last_snapshot.distances()
+        distances = {}
+        for nom, capteur in (("front", self.capteur_front), ("left", self.capteur_left), ("right", self.capteur_right)):
+            try:
+                distances[nom] = capteur.get_distance()
+            except (ValueError, RuntimeError):
+                distances[nom] = None
+        return distances
     
+    def servo_calibration(self):
+        """
+        Retourne les paramètres dont dépend la position des roues (pour le cache de calibration).
+        """
+        return {
+            "center": self.servo_ctrl.center_val,
+            "minimum": self.servo_ctrl.min_val,
+            "maximum": self.servo_ctrl.max_val,
+            "angle_central": self.angle_central,
+        }
+
+    def servo_sweep(self):
+        """
+        Séquence de mise en position des roues : centre, butée, centre, butée, centre.
+        """
+        self.manoeuvres.run(Manoeuvre("balayage_servo", [
+            Step(steer=angle, duration=0.3) for angle in (self.angle_central, 0, self.angle_central, 90, self.angle_central)
+        ] + [Step(steer=LIBRE)]))
+
+    def init_servo(self, sweep=True):
+        """
+        Met les roues en position initiale. Si le cache de calibration contient une position
+        de servo identique à la configuration actuelle, le balayage complet (1.5 s) est remplacé
+        par une simple mise au centre.
+
+        :param sweep: False pour un démarrage rapide : roues toujours mises au centre, sans balayage.
+        :return: True si le balayage a été évité grâce au cache.
+        """
+        cache = self.calibration_cache
+        cached = cache is not None and cache.get("servo", expected=self.servo_calibration()) is not None
+        if cached or not sweep:
+            self.servo_ctrl.setToDegree(self.angle_central)
+            self.servo_ctrl.disable_pwm()
+            return cached
+        self.servo_sweep()
+        if cache is not None:
+            cache.put("servo", self.servo_calibration())
+        return False
+
     def restart_car(self):
         """
         Redémarre le module : arrêt des moteurs, remise de la vitesse à 0 et réinitialisation de la position du servo.
         Le module est ensuite en attente d'une commande de démarrage (LED verte ou bouton start).
         """
         print("🔄 Redémarrage du module (restart_car) en cours...")
-        # Arrêt en douceur des moteurs
+        # Interruption de la manœuvre en cours puis arrêt en douceur des moteurs
+        self.manoeuvres.cancel()
+        if self.watchdog is not None:
+            self.watchdog.clear()
         self.motor_ctrl.stop()
-        self.current_speed = 0.0
+        self.speed_estimator.reset()
+        self.manoeuvres.resume()  # Après la fin de la manœuvre interrompue : le balayage peut s'exécuter
 
         try:
-            # Séquence d'initialisation du servo (similaire à celle du main.py)
-            self.servo_ctrl.setToDegree(self.angle_central)
-            time.sleep(0.3)
-            self.servo_ctrl.setToDegree(0)
-            time.sleep(0.3)
-            self.servo_ctrl.setToDegree(self.angle_central)
-            time.sleep(0.3)
-            self.servo_ctrl.setToDegree(90)
-            time.sleep(0.3)
-            self.servo_ctrl.setToDegree(self.angle_central)
-            time.sleep(0.3)
-            self.servo_ctrl.disable_pwm()
+            self.init_servo()
         except Exception as e:
             print("Erreur lors de la réinitialisation du servo dans restart_car :", e)
 
@@ -234,7 +610,8 @@ class ControllerCar:
         Réalise un parcours en 8.
         
         Pendant chaque cycle, le servo module sa position en fonction d'une fonction sinusoïdale,
-        ce qui crée une trajectoire en 8 lorsque la voiture avance.
+        ce qui crée une trajectoire en 8 lorsque la voiture avance. La trajectoire est précalculée
+        (seuls les changements de consigne sont écrits) puis rejouée sur une horloge absolue.
         
         :param speed: Vitesse de déplacement pendant le 8.
         :param cycle_time: Durée d'un cycle complet (influence la fréquence des oscillations).
@@ -246,18 +623,18 @@ class ControllerCar:
         """
         try:
             print("🎯 Lancement du parcours en 8...")
-            for _ in range(cycles):
-                start = time.time()
-                while time.time() - start < cycle_time:
-                    t = time.time() - start
-                    # Calcule l'angle du servo : position centrale 45° modulée par une sinusoïde.
-                    angle = 45 + amplitude * math.sin(2 * math.pi * t / cycle_time)
-                    self.servo_ctrl.setToDegree(angle)
-                    self.motor_ctrl.forward(speed)
-                    time.sleep(dt)
+            # Position centrale 45° modulée par une sinusoïde, vitesse constante
+            trajectory = Trajectory.compile(
+                cycles * cycle_time, dt,
+                servo=lambda t: 45 + amplitude * math.sin(2 * math.pi * t / cycle_time),
+                motor=lambda t: speed,
+            )
+            report = trajectory.play(self.servo_ctrl.setToDegree, self.motor_ctrl.forward)
             self.motor_ctrl.stop()
             self.servo_ctrl.setToDegree(45)
-            print("✅ Parcours en 8 terminé.")
+            print(f"✅ Parcours en 8 terminé : {report['writes']} consignes, retard moyen "
+                  f"{report['mean_late_ms']:.2f} ms, max {report['max_late_ms']:.2f} ms, "
+                  f"écart de durée {report['duration_error_ms']:.2f} ms.")
         except Exception as e:
             print("Erreur pendant le tour en 8 :", e)
         finally:
@@ -273,25 +650,12 @@ class ControllerCar:
         :param duration: Durée de la rotation en secondes (par défaut 10).
         :param speed: Vitesse de rotation (0 à 100).
         
-        Attention : cette méthode utilise les attributs internes du moteur (précédés de __)
-        et réalise une gestion directe. Assurez-vous que cela correspond à votre implémentation.
-
         :raises Exception: Si une erreur se produit pendant la rotation.
         """
         try:
             print("🔁 Rotation sur place...")
-            pwm_val = self.motor_ctrl._MotorController__scale_speed(speed)
-            self.motor_ctrl._MotorController__apply_motor_state(
-                self.motor_ctrl.moteur0_pin_a,
-                self.motor_ctrl.moteur0_pin_b,
-                pwm_val
-            )
-            self.motor_ctrl._MotorController__apply_motor_state(
-                self.motor_ctrl.moteur1_pin_a,
-                self.motor_ctrl.moteur1_pin_b,
-                -pwm_val
-            )
-            time.sleep(duration)
+            self.manoeuvres.resume()
+            self.manoeuvres.run(Manoeuvre("rotation_sur_place", [Step(speed=speed, spin=True, duration=duration)]))
             print("🛑 Arrêt du mouvement")
             self.motor_ctrl.stop()
         except Exception as e:
@@ -1,6 +1,48 @@
-import RPi.GPIO as GPIO
+import threading
 import time
 import PWM as PCA
+from Hardware import lazy
+
+GPIO = lazy("RPi.GPIO")
+
+MAX_DUTY = 4095
+
+
+class MotorLUT:
+    """
+    Table de conversion vitesse (-100 à 100) -> rapport cyclique PWM entier signé.
+
+    La table est construite une seule fois. Une compensation de zone morte (``dead_band``)
+    fait démarrer toute vitesse non nulle au rapport cyclique minimal qui fait tourner le moteur,
+    le reste de la plage étant réparti linéairement jusqu'à ``max_duty``.
+
+    Auteur : Anthony Vergeylen
+    """
+
+    def __init__(self, dead_band=0, max_duty=MAX_DUTY):
+        """
+        :param dead_band: Rapport cyclique en dessous duquel le moteur ne tourne pas.
+        :param max_duty: Rapport cyclique maximal (vitesse 100).
+        """
+        if not 0 <= dead_band < max_duty:
+            raise ValueError("La zone morte doit être comprise entre 0 et le rapport cyclique maximal.")
+        self.dead_band = dead_band
+        self.max_duty = max_duty
+        self.table = []
+        for speed in range(-100, 101):
+            if speed == 0:
+                duty = 0
+            else:
+                duty = dead_band + int(round(abs(speed) * (max_duty - dead_band) / 100))
+            self.table.append(duty if speed > 0 else -duty)
+
+    def duty(self, speed):
+        """
+        Retourne le rapport cyclique signé pour une vitesse (bornée à [-100, 100]).
+        """
+        speed = max(-100, min(100, speed))
+        return self.table[int(round(speed)) + 100]
+
 
 class ControllerMotor:
     """
@@ -10,10 +52,20 @@ class ControllerMotor:
     Date   : 08-04-2025
     Quoi   : Contrôle de deux moteurs à courant continu via un pont en H.
     """
-    def __init__(self):
+    def __init__(self, dead_band=0, ramp=False, acceleration=200, deceleration=300, brake_time=0.05, tick=0.02,
+                 clock=time.monotonic):
         """
         Initialise le contrôleur des moteurs.
         Configure les broches GPIO et l'objet PWM.
+
+        :param dead_band: Compensation de zone morte des moteurs (rapport cyclique minimal, 0 à 4095).
+        :param ramp: Active le moteur de rampes : les consignes sont atteintes progressivement
+                     par un thread de fond au lieu d'être appliquées immédiatement.
+        :param acceleration: Accélération maximale (points de vitesse par seconde).
+        :param deceleration: Décélération maximale (points de vitesse par seconde).
+        :param brake_time: Durée du maintien à l'arrêt lors d'une inversion de sens (secondes).
+        :param tick: Période du moteur de rampes (secondes).
+        :param clock: Horloge monotone des rampes (remplaçable pour les tests, voir ``update_ramps``).
         
         Auteur : Anthony Vergeylen
         Date   : 08-04-2025
@@ -50,6 +102,8 @@ class ControllerMotor:
         def moteur1_pin_b(self):
             return self.__moteur1_pin_b
 
+        self.__lut = MotorLUT(dead_band)
+
         self.__gpio_pins = [
             self.__moteur0_pin_a,
             self.__moteur0_pin_b,
@@ -65,6 +119,32 @@ class ControllerMotor:
         for pin in self.__gpio_pins:
             GPIO.setup(pin, GPIO.OUT)
 
+        if acceleration <= 0 or deceleration <= 0:
+            raise ValueError("L'accélération et la décélération doivent être supérieures à zéro.")
+        if brake_time < 0 or tick <= 0:
+            raise ValueError("La durée de freinage doit être positive et la période supérieure à zéro.")
+
+        # Consignes, vitesses commandées (-100 à 100) et rapports cycliques réellement appliqués
+        self.__lock = threading.RLock()
+        self.__target = [0.0, 0.0]
+        self.__current = [0.0, 0.0]
+        self.__brake_until = [0.0, 0.0]
+        self.__applied = [None, None]
+        self.__acceleration = acceleration
+        self.__deceleration = deceleration
+        self.__brake_time = brake_time
+        self.__tick = tick
+        self.__clock = clock
+        self.__last_ramp = clock()
+
+        # Posé sans verrou par l'arrêt d'urgence : plus aucune écriture PWM jusqu'à la remise à zéro
+        self.__halted = threading.Event()
+        self.__ramp_stop = threading.Event()
+        self.__ramp_thread = None
+        if ramp:
+            self.__ramp_thread = threading.Thread(target=self.__ramp_loop, daemon=True)
+            self.__ramp_thread.start()
+
     def __apply_motor_state(self, pin_a, pin_b, pwm_value):
         """
         Applique l'état des sorties pour un moteur.
@@ -80,7 +160,121 @@ class ControllerMotor:
         GPIO.output(pin_a, GPIO.HIGH if pwm_value > 0 else GPIO.LOW)
         GPIO.output(pin_b, GPIO.LOW if pwm_value > 0 else GPIO.HIGH)
         channel = self.__moteur0_enable_pin if pin_a == self.__moteur0_pin_a else self.__moteur1_enable_pin
-        self.__pwm_controller.write(channel, 0, int(abs(pwm_value)))
+        self.__pwm_controller.write(channel, 0, abs(pwm_value))
+
+    def __apply_speeds(self, speeds):
+        """
+        Convertit les vitesses des deux moteurs en rapports cycliques et ne les écrit
+        que s'ils ont changé (économise le bus I²C).
+        """
+        pins = ((self.__moteur0_pin_a, self.__moteur0_pin_b), (self.__moteur1_pin_a, self.__moteur1_pin_b))
+        for i, (pin_a, pin_b) in enumerate(pins):
+            if self.__halted.is_set():
+                return
+            pwm_val = self.__scale_speed(speeds[i])
+            if pwm_val != self.__applied[i]:
+                self.__apply_motor_state(pin_a, pin_b, pwm_val)
+                self.__applied[i] = pwm_val
+
+    def __command(self, speed0, speed1, immediate=False):
+        """
+        Fixe la consigne des deux moteurs. Sans moteur de rampes (ou si ``immediate``),
+        la consigne est appliquée tout de suite.
+        """
+        with self.__lock:
+            self.__target = [float(max(-100, min(100, speed0))), float(max(-100, min(100, speed1)))]
+            if self.__ramp_thread is None or immediate:
+                self.__current = list(self.__target)
+                self.__brake_until = [0.0, 0.0]
+                self.__apply_speeds(self.__current)
+
+    def update_ramps(self):
+        """
+        Fait avancer les rampes jusqu'à l'instant présent (horloge ``clock``) : chaque moteur se
+        rapproche de sa consigne en respectant les limites d'accélération et de décélération.
+        Une inversion de sens passe par zéro puis par un court maintien à l'arrêt (phase de
+        freinage). Appelée à chaque période par le thread de rampes.
+        """
+        if self.__halted.is_set():
+            return
+        now = self.__clock()
+        with self.__lock:
+            dt = max(0.0, now - self.__last_ramp)
+            self.__last_ramp = now
+            for i in range(2):
+                if now < self.__brake_until[i]:
+                    continue
+                current, target = self.__current[i], self.__target[i]
+                reversing = current != 0 and (target == 0 or (target > 0) != (current > 0))
+                goal = 0.0 if reversing else target
+                rate = self.__acceleration if abs(goal) > abs(current) else self.__deceleration
+                step = rate * dt
+                new = current + max(-step, min(step, goal - current))
+                if reversing and new == 0 and target != 0:
+                    self.__brake_until[i] = now + self.__brake_time
+                self.__current[i] = new
+            self.__apply_speeds(self.__current)
+
+    def __ramp_loop(self):
+        """Boucle du moteur de rampes, cadencée sur une horloge absolue (sans dérive)."""
+        next_tick = time.monotonic()
+        while not self.__ramp_stop.is_set():
+            next_tick += self.__tick
+            if self.__ramp_stop.wait(max(0.0, next_tick - time.monotonic())):
+                break
+            if not self.__halted.is_set():
+                self.update_ramps()
+
+    @property
+    def commanded_speed(self):
+        """Vitesse moyenne réellement commandée aux moteurs (-100 à 100), rampes comprises."""
+        with self.__lock:
+            return (self.__current[0] + self.__current[1]) / 2
+
+    @property
+    def pwm_address(self):
+        """Tuple (numéro du bus I²C, adresse) du PCA9685 des moteurs."""
+        return self.__pwm_controller.bus_number, self.__pwm_controller.address
+
+    def halt(self):
+        """
+        Fige le contrôleur pour un arrêt d'urgence fait hors de lui (Watchdog) : plus aucune
+        écriture PWM (rampes comprises) jusqu'à ``reset_after_emergency_stop``. Sans verrou,
+        donc utilisable même si le thread qui le détient est bloqué ; à appeler avant l'arrêt.
+        """
+        self.__halted.set()
+
+    @property
+    def halted(self):
+        """True entre ``halt`` et ``reset_after_emergency_stop``."""
+        return self.__halted.is_set()
+
+    def reset_after_emergency_stop(self):
+        """
+        Remet le contrôleur en cohérence après un arrêt d'urgence fait hors de lui (Watchdog) :
+        les consignes repassent à zéro et l'arrêt est réécrit (le cache des rapports cycliques
+        ne correspond plus à l'état du PCA9685), puis les écritures sont de nouveau permises.
+        Attend le verrou, qui peut être détenu par le thread bloqué : à appeler depuis un
+        thread dédié.
+        """
+        with self.__lock:
+            self.__applied = [None, None]
+            self.__halted.clear()
+            self.__command(0, 0, immediate=True)
+
+    @property
+    def commanded_duty(self):
+        """Rapports cycliques signés réellement écrits sur les deux moteurs (None avant la première commande)."""
+        with self.__lock:
+            return tuple(self.__applied)
+
+    def close(self):
+        """Arrête le moteur de rampes (les moteurs sont arrêtés immédiatement)."""
+        self.__ramp_stop.set()
+        if self.__ramp_thread is not None:
+            self.__ramp_thread.join()
+            self.__ramp_thread = None
+        self.stop(immediate=True)
 
     def forward(self, speed=100):
         """
@@ -92,9 +286,7 @@ class ControllerMotor:
         Date   : 08-04-2025
         Quoi   : Faire avancer les moteurs à la vitesse spécifiée.
         """
-        pwm_val = self.__scale_speed(speed)
-        self.__apply_motor_state(self.__moteur0_pin_a, self.__moteur0_pin_b, pwm_val)
-        self.__apply_motor_state(self.__moteur1_pin_a, self.__moteur1_pin_b, pwm_val)
+        self.__command(speed, speed)
 
     def backward(self, speed=-100):
         """
@@ -107,32 +299,40 @@ class ControllerMotor:
         Quoi   : Faire reculer les moteurs à la vitesse spécifiée.
         """
         if speed < 0:
-            pwm_val = self.__scale_speed(speed)
-            self.__apply_motor_state(self.__moteur0_pin_a, self.__moteur0_pin_b, pwm_val)
-            self.__apply_motor_state(self.__moteur1_pin_a, self.__moteur1_pin_b, pwm_val)
+            self.__command(speed, speed)
         else:
             raise ValueError("La vitesse doit être négative pour le mouvement arrière")
 
-    def stop(self):
+    def spin(self, speed=100):
+        """
+        Fait tourner la voiture sur place : un moteur en avant, l'autre en arrière.
+
+        :param speed: Vitesse de 0 à 100 (le signe choisit le sens de rotation).
+        """
+        self.__command(speed, -speed)
+
+    def stop(self, immediate=False):
         """
         Arrête les moteurs.
+
+        :param immediate: Coupe les moteurs sans rampe de décélération.
         
         Auteur : Anthony Vergeylen
         Date   : 08-04-2025
         Quoi   : Arrêter les moteurs.
         """
-        self.__apply_motor_state(self.__moteur0_pin_a, self.__moteur0_pin_b, 0)
-        self.__apply_motor_state(self.__moteur1_pin_a, self.__moteur1_pin_b, 0)
+        self.__command(0, 0, immediate)
 
     def __scale_speed(self, speed):
         """
-        Convertit une vitesse de 0 à 100 en une valeur PWM comprise entre 0 et 4095.
+        Convertit une vitesse de 0 à 100 en une valeur PWM entière comprise entre 0 et 4095
+        (lecture dans la table construite à l'initialisation).
 
         :param speed: Vitesse (positive pour avancer, négative pour reculer).
-        :return: Valeur PWM correspondante.
+        :return: Valeur PWM correspondante (entier signé).
         
         Auteur : Anthony Vergeylen
         Date   : 08-04-2025
         Quoi   : Convertir une vitesse de 0 à 100 en une valeur PWM.
         """
-        return speed * 4095 / 100
+        return self.__lut.duty(speed)
@@ -2,6 +2,60 @@
 import PWM as PCA
 import time
 
+RELATIVE_RANGE = 50     # Débattement relatif maximal (degrés, de part et d'autre du centre)
+ABSOLUTE_CENTER = 45    # Angle absolu des roues droites pour ControllerCar (angle_central)
+ANGLE_RESOLUTION = 10   # Nombre d'entrées de table par degré (pas de 0.1°)
+
+
+class ServoLUT:
+    """
+    Table de conversion angle relatif -> impulsion PWM entière.
+
+    La table est construite une seule fois par interpolation linéaire entre les points de
+    calibration (par défaut : minimum à -50°, centre à 0°, maximum à +50°, complétés par des
+    points mesurés optionnels). Chaque commande de rotate() se réduit ensuite à une lecture
+    de table, avec une correspondance monotone.
+
+    Auteur : Anthony Vergeylen
+    """
+
+    def __init__(self, center, minimum, maximum, calibration_points=None, resolution=ANGLE_RESOLUTION):
+        """
+        :param center: Impulsion des roues droites.
+        :param minimum: Impulsion à -50° (butée gauche).
+        :param maximum: Impulsion à +50° (butée droite).
+        :param calibration_points: Points mesurés optionnels {angle relatif: impulsion}.
+        :param resolution: Nombre d'entrées de table par degré.
+        """
+        points = {-RELATIVE_RANGE: minimum, 0: center, RELATIVE_RANGE: maximum}
+        for angle, pulse in (calibration_points or {}).items():
+            if not -RELATIVE_RANGE <= angle <= RELATIVE_RANGE:
+                raise ValueError(f"Point de calibration hors plage : {angle}°")
+            points[angle] = pulse
+        angles = sorted(points)
+        pulses = [points[a] for a in angles]
+        if any(b < a for a, b in zip(pulses, pulses[1:])):
+            raise ValueError("Les points de calibration du servo doivent être croissants avec l'angle.")
+
+        self.resolution = resolution
+        self.table = []
+        segment = 0
+        for i in range(2 * RELATIVE_RANGE * resolution + 1):
+            angle = i / resolution - RELATIVE_RANGE
+            while angle > angles[segment + 1]:
+                segment += 1
+            a0, a1 = angles[segment], angles[segment + 1]
+            p0, p1 = pulses[segment], pulses[segment + 1]
+            self.table.append(int(round(p0 + (angle - a0) * (p1 - p0) / (a1 - a0))))
+
+    def pulse(self, angle):
+        """
+        Retourne l'impulsion PWM pour un angle relatif (borné à [-50, 50]).
+        """
+        angle = max(-RELATIVE_RANGE, min(RELATIVE_RANGE, angle))
+        return self.table[int(round((angle + RELATIVE_RANGE) * self.resolution))]
+
+
 class ControllerServo:
     """
     Contrôleur de servo pour les roues.
@@ -13,12 +67,24 @@ class ControllerServo:
     Date   : 08-04-2025
     """
 
-    def __init__(self, center=320, minimum=200, maximum=500):
+    def __init__(self, center=320, minimum=200, maximum=500, calibration_points=None):
+        """
+        :param center: Impulsion PWM des roues droites.
+        :param minimum: Impulsion PWM en butée gauche (-50°).
+        :param maximum: Impulsion PWM en butée droite (+50°).
+        :param calibration_points: Points mesurés optionnels {angle relatif: impulsion}.
+        """
         self.pwm = PCA.PWM()
         self.pwm.frequency = 60
         self.center_val = center
         self.min_val = minimum
         self.max_val = maximum
+        self.lut = ServoLUT(center, minimum, maximum, calibration_points)
+        # Correspondance historique de setToDegree (0° -> center, 180° -> center + max - min),
+        # précalculée au pas de 0.1° : les réglages des roues (angle_central...) en dépendent
+        self.degree_table = [int(center + (i / ANGLE_RESOLUTION / 180.0) * (maximum - minimum))
+                             for i in range(180 * ANGLE_RESOLUTION + 1)]
+        self.current_angle = 0  # Dernier angle relatif commandé (utilisé pour l'odométrie)
 
     def rotate(self, angle):
         """
@@ -28,13 +94,11 @@ class ControllerServo:
         :param angle: Angle relatif désiré (entre -50 et 50).
         """
         # Contraindre l'angle dans [-50, 50]
-        angle = max(-50, min(50, angle))
-        if angle >= 0:
-            pulse = self.center_val + ((angle / 50.0) * (self.max_val - self.center_val))
-        else:
-            pulse = self.center_val + ((angle / 50.0) * (self.center_val - self.min_val))
-        self.pwm.write(0, 0, int(pulse))
-        print(f"rotate({angle}) -> PWM: {int(pulse)}")
+        angle = max(-RELATIVE_RANGE, min(RELATIVE_RANGE, angle))
+        pulse = self.lut.pulse(angle)
+        self.pwm.write(0, 0, pulse)
+        self.current_angle = angle
+        print(f"rotate({angle}) -> PWM: {pulse}")
 
     # def settodegree (pas juste rotate, mais mettre à une position précise)
     def setToDegree(self, angle): 
@@ -46,9 +110,10 @@ class ControllerServo:
         """
         # Contraindre l'angle dans [0, 180]
         angle = max(0, min(180, angle))
-        pulse = self.center_val + ((angle / 180.0) * (self.max_val - self.min_val))
-        self.pwm.write(0, 0, int(pulse))
-        print(f"setToDegree({angle}) -> PWM: {int(pulse)}")
+        pulse = self.degree_table[int(round(angle * ANGLE_RESOLUTION))]
+        self.pwm.write(0, 0, pulse)
+        self.current_angle = max(-RELATIVE_RANGE, min(RELATIVE_RANGE, angle - ABSOLUTE_CENTER))
+        print(f"setToDegree({angle}) -> PWM: {pulse}")
 
     def resetRoue(self):
         """
@@ -57,6 +122,7 @@ class ControllerServo:
         garantissant ainsi que les roues sont bien droites.
         """
         self.pwm.write(0, 0, int(self.center_val))
+        self.current_angle = 0
         print(f"resetRoue() -> PWM: {int(self.center_val)}")
 
     def disable_pwm(self):
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Decision.py
+-----------
+Ce module isole la décision d'évitement de la stratégie "seuils" de ControllerCar : une fonction
+pure qui associe un triplet de distances (avant, gauche, droite) à une action, sans lecture de
+capteur, attente ni affichage. ControllerCar.run l'appelle puis exécute la manœuvre choisie.
+
+  - ``decide`` : version scalaire, utilisée par la boucle de contrôle.
+  - ``decide_many`` : version vectorisée (NumPy) qui classe des millions de triplets d'un coup ;
+    les seuils peuvent eux-mêmes être des tableaux (diffusion), pour comparer des réglages.
+  - ``analyse_surface`` : parcourt toute la surface de décision et signale les zones mortes
+    (actions jamais choisies ou sur une bande plus étroite que le bruit des capteurs) et les
+    contradictions (virage latéral vers le côté le moins dégagé).
+  - ``benchmark`` : coût d'une décision, scalaire et vectorisée.
+
+Les seuils reçus sont les seuils effectifs en cm (marge de vitesse déjà ajoutée, voir
+``ControllerCar.speed_threshold``). L'ordre des tests est celui de la boucle historique : urgence,
+obstacle avant, obstacle des deux côtés, obstacle à gauche, obstacle à droite.
+
+Lancé directement, le module analyse la surface des réglages par défaut et mesure le coût d'une
+décision.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit les fonctions decide, decide_many, analyse_surface et benchmark.
+"""
+
+import time
+
+import numpy as np
+
+# Actions (noms des manœuvres de ControllerCar) ; l'indice sert de code dans decide_many
+TOUT_DROIT = "tout_droit"
+URGENCE = "urgence"
+OBSTACLE_AVANT = "obstacle_avant"
+OBSTACLE_DOUBLE = "obstacle_double"
+OBSTACLE_GAUCHE = "obstacle_gauche"
+OBSTACLE_DROIT = "obstacle_droit"
+ACTIONS = (TOUT_DROIT, URGENCE, OBSTACLE_AVANT, OBSTACLE_DOUBLE, OBSTACLE_GAUCHE, OBSTACLE_DROIT)
+
+# Côté vers lequel tourne chaque action latérale (les autres tournent vers le côté le plus dégagé)
+TURN_SIDE = {OBSTACLE_GAUCHE: "left", OBSTACLE_DROIT: "right"}
+
+
+def decide(front, left, right, emergency_threshold, front_threshold, side_threshold):
+    """
+    Action d'évitement pour un triplet de distances.
+
+    :param front: Distance avant (cm).
+    :param left: Distance gauche (cm).
+    :param right: Distance droite (cm).
+    :return: Une des actions de ACTIONS.
+    """
+    if front < emergency_threshold:
+        return URGENCE
+    if front < front_threshold:
+        return OBSTACLE_AVANT
+    if left < side_threshold and right < side_threshold:
+        return OBSTACLE_DOUBLE
+    if left < side_threshold:
+        return OBSTACLE_GAUCHE
+    if right < side_threshold:
+        return OBSTACLE_DROIT
+    return TOUT_DROIT
+
+
+def decide_many(front, left, right, emergency_threshold, front_threshold, side_threshold):
+    """
+    Version vectorisée de ``decide`` : mêmes règles, appliquées élément par élément.
+
+    :param front, left, right: Tableaux (ou scalaires) de distances en cm, de formes compatibles.
+    :param emergency_threshold, front_threshold, side_threshold: Seuils (cm), scalaires ou tableaux.
+    :return: Tableau d'entiers (int8) : indices dans ACTIONS.
+    """
+    front, left, right = np.asarray(front), np.asarray(left), np.asarray(right)
+    left_blocked = left < side_threshold
+    right_blocked = right < side_threshold
+    conditions = [
+        front < emergency_threshold,
+        front < front_threshold,
+        left_blocked & right_blocked,
+        left_blocked,
+        right_blocked,
+    ]
+    choices = [ACTIONS.index(action) for action in (URGENCE, OBSTACLE_AVANT, OBSTACLE_DOUBLE,
+                                                    OBSTACLE_GAUCHE, OBSTACLE_DROIT)]
+    return np.select(conditions, choices, default=ACTIONS.index(TOUT_DROIT)).astype(np.int8)
+
+
+def analyse_surface(emergency_threshold, front_threshold, side_threshold, min_distance=2.0,
+                    max_distance=400.0, resolution=2.0, min_band=5.0):
+    """
+    Parcourt toute la surface de décision sur une grille régulière (avant x gauche x droite).
+
+    :param min_distance: Plus petite distance mesurable par les capteurs (cm).
+    :param max_distance: Plus grande distance mesurable par les capteurs (cm).
+    :param resolution: Pas de la grille (cm).
+    :param min_band: Largeur (cm) en dessous de laquelle une bande de décision est plus étroite
+                     que le bruit des capteurs et donc signalée comme zone morte.
+    :return: Dictionnaire :
+             - "points" : nombre de triplets évalués ;
+             - "shares" : {action: part de la surface} ;
+             - "contradictions" : {action latérale: part de sa zone où elle tourne vers le côté
+               le moins dégagé} ;
+             - "dead_zones" : liste de messages.
+    """
+    distances = np.arange(min_distance, max_distance + resolution * 1e-6, resolution)
+    left, right = np.meshgrid(distances, distances, indexing="ij")
+    counts = np.zeros(len(ACTIONS), dtype=np.int64)
+    contradictions = {action: 0 for action in TURN_SIDE}
+    # Une tranche de distance avant à la fois : mémoire bornée quelle que soit la résolution
+    for front in distances:
+        codes = decide_many(front, left, right, emergency_threshold, front_threshold, side_threshold)
+        counts += np.bincount(codes.ravel(), minlength=len(ACTIONS))
+        for action, side in TURN_SIDE.items():
+            chosen, other = (left, right) if side == "left" else (right, left)
+            contradictions[action] += int(np.count_nonzero((codes == ACTIONS.index(action)) & (chosen < other)))
+
+    points = int(counts.sum())
+    shares = {action: counts[code] / points for code, action in enumerate(ACTIONS)}
+    dead_zones = [f"'{action}' n'est jamais choisie." for action in ACTIONS if counts[ACTIONS.index(action)] == 0]
+    bands = {
+        URGENCE: emergency_threshold - min_distance,
+        OBSTACLE_AVANT: front_threshold - max(emergency_threshold, min_distance),
+    }
+    for action, width in bands.items():
+        if 0 < width < min_band:
+            dead_zones.append(f"'{action}' n'est choisie que sur une bande de {width:g} cm de distance avant "
+                              f"(moins de {min_band:g} cm, sous le bruit des capteurs).")
+    return {
+        "points": points,
+        "shares": shares,
+        "contradictions": {action: (count / counts[ACTIONS.index(action)] if counts[ACTIONS.index(action)] else 0.0)
+                           for action, count in contradictions.items()},
+        "dead_zones": dead_zones,
+    }
+
+
+def benchmark(count=1000000, scalar_count=100000, thresholds=(40, 41, 12), seed=0):
+    """
+    Coût d'une décision sur des triplets aléatoires (2 à 400 cm).
+
+    :param count: Nombre de triplets classés par decide_many.
+    :param scalar_count: Nombre de triplets classés un par un par decide.
+    :return: Dictionnaire (ns par décision, scalaire et vectorisée, et accélération).
+    """
+    rng = np.random.default_rng(seed)
+    front, left, right = rng.uniform(2, 400, size=(3, count))
+    start = time.perf_counter()
+    decide_many(front, left, right, *thresholds)
+    vector_ns = (time.perf_counter() - start) / count * 1e9
+
+    rows = list(zip(front[:scalar_count].tolist(), left[:scalar_count].tolist(), right[:scalar_count].tolist()))
+    start = time.perf_counter()
+    for f, l, r in rows:
+        decide(f, l, r, *thresholds)
+    scalar_ns = (time.perf_counter() - start) / len(rows) * 1e9
+    return {"scalar_ns": scalar_ns, "vector_ns": vector_ns, "speedup": scalar_ns / vector_ns}
+
+
+if __name__ == "__main__":
+    from Tuning import DEFAULTS
+
+    thresholds = (DEFAULTS["emergency_threshold"], DEFAULTS["front_threshold"], DEFAULTS["side_threshold"])
+    report = analyse_surface(*thresholds)
+    print(f"Surface de décision (urgence < {thresholds[0]} cm, avant < {thresholds[1]} cm, "
+          f"côtés < {thresholds[2]} cm) : {report['points']} triplets\n")
+    for action, share in report["shares"].items():
+        print(f"  {action:<16} {share:>7.2%}")
+    print()
+    for action, share in report["contradictions"].items():
+        if share:
+            print(f"⚠️ '{action}' tourne vers le côté le moins dégagé dans {share:.0%} de sa zone.")
+    for message in report["dead_zones"]:
+        print(f"⚠️ Zone morte : {message}")
+
+    result = benchmark()
+    print(f"\nCoût d'une décision : {result['scalar_ns']:.0f} ns (decide), {result['vector_ns']:.1f} ns "
+          f"(decide_many), soit x{result['speedup']:.0f}")
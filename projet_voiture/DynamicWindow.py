@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+DynamicWindow.py
+----------------
+Ce module fournit un planificateur de type "fenêtre dynamique" (Dynamic Window Approach) :
+à chaque pas, une grille de couples candidats (vitesse, braquage) est simulée sur un horizon court
+(arcs de cercle, modèle bicyclette) et évaluée contre les dernières distances mesurées.
+
+Tout le calcul est vectorisé avec NumPy sur des tableaux de taille fixe (candidats x instants x
+points d'obstacle) : le coût par pas est borné et ne dépend pas du parcours. Le meilleur arc donne
+des consignes continues de servo et de moteur ; s'il n'existe aucun arc sûr, le planificateur
+renvoie None et la voiture se rabat sur la manœuvre de dégagement. Un arc est sûr si la voiture
+peut s'arrêter avant son premier point en collision.
+
+Repère : x vers l'avant, y vers la droite, angles positifs vers la droite, distances en mètres.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la classe DynamicWindowPlanner.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from OccupancyGrid import SENSOR_ANGLES
+
+
+class DynamicWindowPlanner:
+    """
+    Planificateur à fenêtre dynamique sur les trois capteurs à ultrasons.
+    """
+
+    def __init__(self, speed_gain=0.02, min_speed=25, max_speed=60, speed_steps=8, max_steer=30,
+                 steer_steps=13, speed_window=25, horizon=1.0, time_steps=10, wheelbase=0.15,
+                 car_radius=0.12, deceleration=1.5, beam_width=15.0, beam_points=7, max_range=3.0,
+                 wall_length=1.5, wall_spacing=0.05,
+                 weights=(1.0, 1.0, 0.5, 0.5, 0.2)):
+        """
+        :param speed_gain: Vitesse (m/s) par point de commande moteur (voir SpeedEstimator).
+        :param min_speed: Commande moteur minimale des candidats (%).
+        :param max_speed: Commande moteur maximale des candidats (%).
+        :param speed_steps: Nombre de vitesses candidates.
+        :param max_steer: Braquage maximal des candidats (degrés relatifs).
+        :param steer_steps: Nombre d'angles candidats.
+        :param speed_window: Écart maximal (%) avec la commande actuelle (fenêtre dynamique).
+        :param horizon: Durée simulée de chaque arc (secondes).
+        :param time_steps: Nombre de points simulés par arc.
+        :param wheelbase: Empattement (mètres).
+        :param car_radius: Rayon de sécurité autour de la voiture (mètres).
+        :param deceleration: Décélération de freinage disponible (m/s²).
+        :param beam_width: Demi-angle du cône des capteurs (degrés).
+        :param beam_points: Nombre de points d'obstacle par capteur (sur l'arc mesuré).
+        :param max_range: Au-delà, une distance ne produit pas d'obstacle (mètres).
+        :param wall_length: Longueur des murs latéraux supposés parallèles à la voiture (mètres).
+        :param wall_spacing: Espacement des points d'un mur latéral (mètres).
+        :param weights: Poids (progression vers l'avant, distance libre le long de l'arc, dégagement,
+                        vitesse, régularité du braquage).
+        """
+        if not 0 < min_speed <= max_speed <= 100:
+            raise ValueError("Les vitesses candidates doivent vérifier 0 < min_speed <= max_speed <= 100.")
+        if speed_steps < 1 or steer_steps < 1 or time_steps < 1:
+            raise ValueError("Il faut au moins un candidat et un point simulé.")
+        self.speed_gain = speed_gain
+        self.max_steer = max_steer
+        self.speed_window = speed_window
+        self.horizon = horizon
+        self.car_radius = car_radius
+        self.deceleration = deceleration
+        self.max_range = max_range
+        self.weights = weights
+        self.last_plan_ms = 0.0
+
+        # Grille de candidats (aplatie) et trajectoires précalculées pour une vitesse unitaire
+        speeds, steers = np.meshgrid(np.linspace(min_speed, max_speed, speed_steps),
+                                     np.linspace(-max_steer, max_steer, steer_steps), indexing="ij")
+        self.candidate_speeds = speeds.ravel()
+        self.candidate_steers = steers.ravel()
+        curvature = np.tan(np.radians(self.candidate_steers)) / wheelbase
+        arc = (self.candidate_speeds * speed_gain)[:, None] * np.linspace(horizon / time_steps, horizon, time_steps)
+        straight = np.abs(curvature) < 1e-9
+        safe = np.where(straight, 1.0, curvature)[:, None]
+        self._path_x = np.where(straight[:, None], arc, np.sin(arc * safe) / safe)
+        self._path_y = np.where(straight[:, None], 0.0, (1 - np.cos(arc * safe)) / safe)
+        self._progress = self._path_x[:, -1]
+
+        half = math.radians(beam_width)
+        self._beam_offsets = np.linspace(-half, half, beam_points)
+        self._wall_x = np.arange(-car_radius, wall_length, wall_spacing)
+
+    def obstacle_points(self, distances):
+        """
+        Convertit les distances mesurées en points d'obstacle : l'arc du cône pour le capteur avant,
+        un mur parallèle à la voiture pour les capteurs latéraux (bord de piste).
+
+        :param distances: Dictionnaire {"front"/"left"/"right": distance en mètres ou None}.
+        :return: Tableau (N, 2) des points (x, y).
+        """
+        points = []
+        for sensor, distance in distances.items():
+            if distance is None or distance >= self.max_range:
+                continue
+            if sensor == "front":
+                angles = math.radians(SENSOR_ANGLES[sensor]) + self._beam_offsets
+                points.append(np.stack([distance * np.cos(angles), distance * np.sin(angles)], axis=1))
+            else:
+                side = math.copysign(distance, math.sin(math.radians(SENSOR_ANGLES[sensor])))
+                points.append(np.stack([self._wall_x, np.full(self._wall_x.shape, side)], axis=1))
+        return np.concatenate(points) if points else np.empty((0, 2))
+
+    def plan(self, distances, current_speed=0.0, current_steer=0.0, obstacles=None):
+        """
+        Choisit le meilleur arc.
+
+        :param distances: Dictionnaire {"front"/"left"/"right": distance en mètres ou None}.
+        :param current_speed: Commande moteur actuelle (%), centre de la fenêtre dynamique.
+        :param current_steer: Braquage actuel (degrés relatifs).
+        :param obstacles: Points d'obstacle supplémentaires (N, 2), par exemple issus de la grille.
+        :return: Tuple (braquage relatif en degrés, commande moteur en %) ou None si aucun arc n'est sûr.
+        """
+        start = time.perf_counter()
+        points = self.obstacle_points(distances)
+        if obstacles is not None and len(obstacles):
+            points = np.concatenate([points, np.asarray(obstacles, dtype=float).reshape(-1, 2)])
+
+        # Fenêtre dynamique : vitesses atteignables depuis la commande actuelle
+        admissible = np.abs(self.candidate_speeds - max(current_speed, self.candidate_speeds.min())) <= self.speed_window
+
+        velocity = self.candidate_speeds * self.speed_gain
+        if len(points):
+            dx = self._path_x[:, :, None] - points[None, None, :, 0]
+            dy = self._path_y[:, :, None] - points[None, None, :, 1]
+            margin = np.sqrt(dx * dx + dy * dy).min(axis=2) - self.car_radius
+            clearance = margin.min(axis=1)
+            # Longueur libre de l'arc : jusqu'au premier point en collision (arc entier sinon)
+            hits = margin <= 0
+            first_hit = np.where(hits.any(axis=1), hits.argmax(axis=1), margin.shape[1])
+            free_length = velocity * self.horizon * first_hit / margin.shape[1]
+            # Progression : avance réalisée avant le premier point en collision
+            reached = self._path_x[np.arange(len(first_hit)), np.maximum(first_hit - 1, 0)]
+            progress = np.where(first_hit > 0, reached, 0.0)
+        else:
+            clearance = np.full(velocity.shape, self.max_range)
+            free_length = velocity * self.horizon
+            progress = self._progress
+        # Arc sûr : la voiture peut s'arrêter avant le premier point en collision
+        admissible &= velocity ** 2 <= 2 * self.deceleration * free_length
+        if not admissible.any():
+            self.last_plan_ms = (time.perf_counter() - start) * 1000
+            return None
+
+        w_progress, w_free, w_clearance, w_speed, w_smooth = self.weights
+        longest = velocity.max() * self.horizon
+        score = (w_progress * progress / longest
+                 + w_free * free_length / longest
+                 + w_clearance * np.clip(clearance, 0.0, 1.0)
+                 + w_speed * self.candidate_speeds / self.candidate_speeds.max()
+                 - w_smooth * np.abs(self.candidate_steers - current_steer) / (2 * self.max_steer or 1.0))
+        best = int(np.argmax(np.where(admissible, score, -np.inf)))
+        self.last_plan_ms = (time.perf_counter() - start) * 1000
+        return float(self.candidate_steers[best]), float(self.candidate_speeds[best])
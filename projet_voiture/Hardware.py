@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Hardware.py
+-----------
+Ce module choisit, au démarrage, le backend matériel de la voiture et charge les bibliothèques
+matérielles (RPi.GPIO, smbus, gpiozero, board, busio, adafruit_tcs34725) à la demande.
+
+Les modules du projet ne les importent plus directement : ils déclarent des mandataires
+paresseux (``GPIO = lazy("RPi.GPIO")``, ``DistanceSensor = lazy_attr("gpiozero", "DistanceSensor")``)
+qui ne chargent la bibliothèque qu'au premier usage, depuis le backend sélectionné :
+  - "reel"       : les vraies bibliothèques (Raspberry Pi) ;
+  - "mock"       : des équivalents en mémoire (voir MockHardware) aux lectures fixées par les tests ;
+  - "simulation" : les mêmes équivalents, dont les capteurs interrogent un monde simulé.
+
+Un monde simulé fournit ``distance(echo)`` (mètres ou None sans écho), ``line(pin)`` (True sur la
+ligne noire) et ``color()`` (valeurs brutes r, g, b, clear).
+
+Le backend se choisit avec ``select`` ou la variable d'environnement VOITURE_MATERIEL ; importer
+les contrôleurs ne charge donc aucune bibliothèque matérielle, sur n'importe quelle machine Linux.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la sélection du backend matériel et les mandataires paresseux lazy / lazy_attr.
+"""
+
+import importlib
+import os
+
+BACKENDS = ("reel", "mock", "simulation")
+
+_backend = os.environ.get("VOITURE_MATERIEL", "reel")
+_generation = 0  # Incrémentée à chaque changement de backend : les mandataires se rechargent
+
+
+def select(backend, world=None):
+    """
+    Choisit le backend matériel (avant la création des contrôleurs). Le choix est aussi écrit
+    dans VOITURE_MATERIEL pour que les processus enfants (ControlProcess) en héritent ; un monde
+    simulé, lui, n'est pas transmis.
+
+    :param backend: "reel", "mock" ou "simulation".
+    :param world: Monde simulé (obligatoire pour "simulation").
+    :raises ValueError: Si le backend est inconnu ou si le monde simulé manque.
+    """
+    global _backend, _generation
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend matériel inconnu : '{backend}' (choix : {', '.join(BACKENDS)}).")
+    if backend == "simulation" and world is None:
+        raise ValueError("Le backend 'simulation' nécessite un monde simulé.")
+    if backend != "reel":
+        import MockHardware
+        MockHardware.state.world = world if backend == "simulation" else None
+    _backend = backend
+    _generation += 1
+    os.environ["VOITURE_MATERIEL"] = backend
+
+
+def backend():
+    """Retourne le nom du backend matériel sélectionné."""
+    return _backend
+
+
+def load(name):
+    """
+    Charge une bibliothèque matérielle depuis le backend sélectionné.
+
+    :param name: Nom du module (par exemple "RPi.GPIO").
+    :raises ValueError: Si le backend de l'environnement (VOITURE_MATERIEL) est inconnu.
+    """
+    if _backend == "reel":
+        return importlib.import_module(name)
+    if _backend not in BACKENDS:
+        raise ValueError(f"Backend matériel inconnu : '{_backend}' (choix : {', '.join(BACKENDS)}).")
+    import MockHardware
+    return MockHardware.module(name)
+
+
+class LazyModule:
+    """
+    Mandataire d'un module matériel chargé au premier accès à l'un de ses attributs.
+    Les affectations sont transmises au module (``unittest.mock.patch`` reste utilisable).
+    """
+
+    def __init__(self, name):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_generation", -1)
+
+    def _load(self):
+        if self._generation != _generation:
+            object.__setattr__(self, "_module", load(self._name))
+            object.__setattr__(self, "_generation", _generation)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __delattr__(self, attribute):
+        delattr(self._load(), attribute)
+
+    def __repr__(self):
+        return f"<module matériel paresseux '{self._name}' ({_backend})>"
+
+
+class LazyAttribute:
+    """
+    Mandataire d'un attribut (classe ou fonction) d'un module matériel, résolu à chaque appel.
+    Remplace ``from module import Nom``.
+    """
+
+    def __init__(self, module, attribute):
+        self._module = module if isinstance(module, LazyModule) else LazyModule(module)
+        self._attribute = attribute
+
+    def __call__(self, *args, **kwargs):
+        return getattr(self._module, self._attribute)(*args, **kwargs)
+
+    def __getattr__(self, attribute):
+        return getattr(getattr(self._module, self._attribute), attribute)
+
+    def __repr__(self):
+        return f"<attribut matériel paresseux '{self._module._name}.{self._attribute}'>"
+
+
+def lazy(name):
+    """Retourne le mandataire paresseux du module matériel ``name``."""
+    return LazyModule(name)
+
+
+def lazy_attr(module, attribute):
+    """Retourne le mandataire paresseux de ``module.attribute``."""
+    return LazyAttribute(module, attribute)
@@ -10,9 +10,11 @@ Date   : 09-04-2025
 Quoi   : Fournit une classe LineFollower pour surveiller la ligne et stopper la voiture en cas de détection de ligne noire.
 """
 
-from gpiozero import DigitalInputDevice
 from time import sleep
 import threading
+from Hardware import lazy_attr
+
+DigitalInputDevice = lazy_attr("gpiozero", "DigitalInputDevice")
 
 class LineFollower:
     """
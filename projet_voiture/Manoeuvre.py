@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Manoeuvre.py
+------------
+Ce module décrit les manœuvres de la voiture (évitement, balayage du servo, rotation...) sous forme
+de données au lieu de séquences de commandes et de ``time.sleep`` écrites à la main.
+
+Une manœuvre est une liste d'étapes. Chaque étape peut fixer :
+  - ``steer``    : l'angle absolu du servo (45° = roues droites), ``LIBRE`` pour relâcher le servo,
+                   ou une fonction sans argument qui choisit l'angle au moment de l'étape ;
+  - ``turn``     : un braquage relatif au centre (-50° à +50°, ou une fonction), envoyé au servo par
+                   ``rotate`` comme les virages historiques (exclusif avec ``steer``) ;
+  - ``speed``    : la vitesse moteur (-100 à 100, 0 = arrêt) ;
+  - ``spin``     : True pour une rotation sur place (moteurs en sens opposés) ;
+  - ``immediate``: True pour un arrêt (vitesse 0) sans rampe de décélération (arrêts d'urgence) ;
+  - ``duration`` : la durée de l'étape (secondes) ;
+  - ``abort``    : le nom d'une condition qui interrompt la manœuvre si elle devient vraie.
+
+Un seul ordonnanceur (ManoeuvreRunner) exécute les manœuvres : il n'écrit que les sorties qui
+changent, appelle la fonction de mesure à chaque pas pendant les attentes, vérifie les conditions
+d'arrêt et peut être interrompu depuis un autre thread (``cancel``). L'annulation persiste (les
+manœuvres suivantes sont aussi interrompues) jusqu'au début explicite d'une nouvelle session
+(``resume``) : un arrêt demandé entre deux manœuvres n'est pas perdu. Chaque exécution renvoie un
+rapport (durées prévues / réelles par étape) qui permet de comparer les manœuvres.
+
+Les manœuvres peuvent aussi être chargées depuis un fichier JSON (``Manoeuvre.from_dict``).
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit les classes Step, Manoeuvre et ManoeuvreRunner.
+"""
+
+import json
+import threading
+from collections import Counter
+import time
+
+LIBRE = "libre"  # Valeur de ``steer`` qui relâche le servo (PWM désactivé)
+
+
+class Step:
+    """
+    Étape d'une manœuvre. Une sortie laissée à None n'est pas modifiée.
+    """
+
+    def __init__(self, steer=None, speed=None, duration=0.0, spin=False, abort=None, name="", immediate=False,
+                 turn=None):
+        if steer is not None and turn is not None:
+            raise ValueError("Une étape fixe soit un angle absolu (steer), soit un braquage relatif (turn).")
+        if duration < 0:
+            raise ValueError("La durée d'une étape doit être positive.")
+        if speed is not None and not callable(speed) and not -100 <= speed <= 100:
+            raise ValueError("La vitesse d'une étape doit être comprise entre -100 et 100.")
+        if immediate and speed != 0:
+            raise ValueError("Seul un arrêt (vitesse 0) peut être immédiat.")
+        self.steer = steer
+        self.speed = speed
+        self.duration = duration
+        self.spin = spin
+        self.abort = abort
+        self.name = name
+        self.immediate = immediate
+        self.turn = turn
+
+    def to_dict(self):
+        """Retourne l'étape sous forme de dictionnaire (les valeurs calculées ne sont pas sérialisables)."""
+        if callable(self.steer) or callable(self.turn) or callable(self.speed):
+            raise ValueError(f"L'étape '{self.name}' utilise une valeur calculée : elle ne peut pas être exportée.")
+        data = {"steer": self.steer, "turn": self.turn, "speed": self.speed, "duration": self.duration,
+                "spin": self.spin, "abort": self.abort, "name": self.name, "immediate": self.immediate}
+        return {key: value for key, value in data.items() if value not in (None, False, "")}
+
+
+class Manoeuvre:
+    """
+    Suite nommée d'étapes.
+
+    Exemple :
+        Manoeuvre("virage_gauche", [
+            Step(turn=-30, speed=35, duration=0.4, abort="obstacle_avant"),
+            Step(steer=45, speed=35),
+        ])
+    """
+
+    def __init__(self, name, steps):
+        if not steps:
+            raise ValueError(f"La manœuvre '{name}' ne contient aucune étape.")
+        self.name = name
+        self.steps = list(steps)
+
+    @property
+    def planned_duration(self):
+        """Durée prévue de la manœuvre (secondes)."""
+        return sum(step.duration for step in self.steps)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Construit une manœuvre à partir d'un dictionnaire
+        ``{"name": ..., "steps": [{"steer": 15, "speed": 35, "duration": 0.4}, ...]}``.
+        """
+        steps = []
+        for i, step in enumerate(data["steps"]):
+            unknown = set(step) - {"steer", "turn", "speed", "duration", "spin", "abort", "name", "immediate"}
+            if unknown:
+                raise ValueError(f"Étape {i} de '{data['name']}' : champs inconnus {sorted(unknown)}")
+            steps.append(Step(**step))
+        return cls(data["name"], steps)
+
+    @classmethod
+    def load(cls, path):
+        """Charge une ou plusieurs manœuvres depuis un fichier JSON (objet ou liste d'objets)."""
+        with open(path, "r") as f:
+            content = json.load(f)
+        if isinstance(content, dict):
+            content = [content]
+        return {manoeuvre.name: manoeuvre for manoeuvre in map(cls.from_dict, content)}
+
+    def to_dict(self):
+        return {"name": self.name, "steps": [step.to_dict() for step in self.steps]}
+
+
+class ManoeuvreRunner:
+    """
+    Ordonnanceur unique des manœuvres.
+    """
+
+    def __init__(self, apply_steer, apply_speed, release_steer=None, sense=None, conditions=None,
+                 tick=0.02, clock=time.monotonic, sleep=None, apply_turn=None):
+        """
+        :param apply_steer: Fonction appelée avec l'angle absolu du servo.
+        :param apply_speed: Fonction appelée avec (vitesse, spin, immediate).
+        :param release_steer: Fonction qui relâche le servo (étapes ``steer=LIBRE``).
+        :param sense: Fonction appelée à chaque pas pendant les attentes (mise à jour des mesures).
+        :param conditions: Dictionnaire {nom: fonction sans argument} des conditions d'arrêt.
+        :param tick: Pas de l'ordonnanceur pendant les attentes (secondes).
+        :param clock: Horloge monotone (remplaçable pour les tests).
+        :param sleep: Fonction d'attente (remplaçable pour une simulation en temps virtuel) ; par
+                      défaut, attente interrompue immédiatement par ``cancel``.
+        :param apply_turn: Fonction appelée avec le braquage relatif des étapes ``turn``.
+        """
+        if tick <= 0:
+            raise ValueError("Le pas de l'ordonnanceur doit être supérieur à zéro.")
+        self.apply_steer = apply_steer
+        self.apply_speed = apply_speed
+        self.release_steer = release_steer
+        self.apply_turn = apply_turn
+        self.sense = sense
+        self.conditions = dict(conditions or {})
+        self.tick = tick
+        self.clock = clock
+        self.sleep = sleep
+        self.counts = Counter()  # Nombre d'exécutions par manœuvre
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._steer = None
+        self._speed = None
+        self.last_report = None
+
+    def cancel(self):
+        """
+        Interrompt la manœuvre en cours et les suivantes jusqu'à ``resume`` (appelable depuis un
+        autre thread).
+        """
+        self._cancel.set()
+
+    def resume(self):
+        """
+        Commence une nouvelle session : lève l'annulation, après la fin de la manœuvre en cours
+        (qui a donc bien été interrompue).
+        """
+        with self._lock:
+            self._cancel.clear()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def forget_outputs(self):
+        """Oublie les dernières sorties écrites (à appeler si le servo ou les moteurs ont été commandés ailleurs)."""
+        self._steer = self._speed = None
+
+    def run(self, manoeuvre):
+        """
+        Exécute une manœuvre. Un seul appel à la fois : un second appel attend la fin du premier.
+        Après ``cancel`` (et jusqu'à ``resume``), la manœuvre est interrompue avant sa première étape.
+
+        :return: Rapport {"name", "completed", "aborted_by", "planned_s", "actual_s", "steps"}.
+        """
+        with self._lock:
+            self.forget_outputs()
+            self.counts[manoeuvre.name] += 1
+            start = self.clock()
+            steps_report = []
+            aborted_by = None
+            deadline = start
+            for step in manoeuvre.steps:
+                if self._cancel.is_set():
+                    aborted_by = "annulation"
+                    break
+                step_start = self.clock()
+                self._apply(step)
+                deadline += step.duration
+                aborted_by = self._wait(deadline, step.abort)
+                steps_report.append({"name": step.name, "planned_s": step.duration,
+                                     "actual_s": self.clock() - step_start})
+                if aborted_by is not None:
+                    break
+            self.last_report = {
+                "name": manoeuvre.name,
+                "completed": aborted_by is None,
+                "aborted_by": aborted_by,
+                "planned_s": manoeuvre.planned_duration,
+                "actual_s": self.clock() - start,
+                "steps": steps_report,
+            }
+            return self.last_report
+
+    def _apply(self, step):
+        """Écrit les sorties de l'étape qui changent par rapport à l'état courant."""
+        steer = step.steer() if callable(step.steer) else step.steer
+        turn = step.turn() if callable(step.turn) else step.turn
+        if turn is not None and ("turn", turn) != self._steer:
+            if self.apply_turn is None:
+                raise ValueError(f"L'étape '{step.name}' fixe un braquage relatif, mais aucun apply_turn n'est défini.")
+            self.apply_turn(turn)
+            self._steer = ("turn", turn)
+        elif steer is not None and steer != self._steer:
+            if steer == LIBRE:
+                if self.release_steer is not None:
+                    self.release_steer()
+            else:
+                self.apply_steer(steer)
+            self._steer = steer
+        speed = step.speed() if callable(step.speed) else step.speed
+        if speed is not None and (speed, step.spin, step.immediate) != self._speed:
+            self.apply_speed(speed, step.spin, step.immediate)
+            self._speed = (speed, step.spin, step.immediate)
+
+    def _wait(self, deadline, abort):
+        """
+        Attend l'instant absolu ``deadline`` par pas de ``tick`` en mesurant et en vérifiant
+        la condition d'arrêt.
+
+        :return: None si l'attente est allée à son terme, sinon la raison de l'interruption.
+        """
+        if abort is not None and abort not in self.conditions:
+            raise ValueError(f"Condition d'arrêt inconnue : '{abort}'")
+        while True:
+            if self._cancel.is_set():
+                return "annulation"
+            if abort is not None and self.conditions[abort]():
+                return abort
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                return None
+            if self.sense is not None:
+                self.sense()
+                remaining = deadline - self.clock()
+            if remaining > 0:
+                if self.sleep is None:
+                    self._cancel.wait(min(self.tick, remaining))
+                else:
+                    self.sleep(min(self.tick, remaining))
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+MockHardware.py
+---------------
+Ce module fournit les équivalents en mémoire des bibliothèques matérielles, utilisés par les
+backends "mock" et "simulation" (voir Hardware) :
+  - RPi.GPIO          : état des broches conservé dans ``state.pins`` ;
+  - smbus             : SMBus sur des bus I²C émulés portant chacun un PCA9685 en 0x40
+                        (voir PCA9685Emulator), conservés dans ``state.buses`` ;
+  - gpiozero          : DistanceSensor et DigitalInputDevice ;
+  - board / busio     : broches et bus I²C factices ;
+  - adafruit_tcs34725 : capteur de couleur TCS34725.
+
+Les lectures viennent du monde simulé (``state.world``) s'il y en a un, sinon des valeurs fixées
+dans ``state`` (``distances`` par broche echo, ``lines`` par broche, ``color_raw``).
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit l'état matériel simulé (state) et les modules factices (module).
+"""
+
+import threading
+import time
+import types
+
+import PCA9685Emulator
+
+
+class MockState:
+    """
+    État partagé du matériel factice.
+    """
+
+    def __init__(self):
+        self.world = None
+        self.reset()
+
+    def reset(self):
+        """Remet le matériel factice dans son état initial (le monde simulé est conservé)."""
+        self.pins = {}            # Broche GPIO -> niveau de sortie
+        self.distances = {}       # Broche echo -> distance (mètres)
+        self.lines = {}           # Broche -> entrée active (True / False)
+        self.color_raw = (0, 0, 0, 0)
+        self.buses = {}           # Numéro de bus -> I2CBus émulé
+
+    def distance(self, echo, default):
+        if self.world is not None:
+            return self.world.distance(echo)
+        return self.distances.get(echo, default)
+
+    def line(self, pin):
+        if self.world is not None:
+            return self.world.line(pin)
+        return self.lines.get(pin, False)
+
+    def color(self):
+        if self.world is not None:
+            return self.world.color()
+        return self.color_raw
+
+    def bus(self, number=1):
+        """Bus I²C émulé ``number`` (créé avec un PCA9685 en 0x40 au premier accès)."""
+        if number not in self.buses:
+            self.buses[number] = PCA9685Emulator.I2CBus()
+        return self.buses[number]
+
+    def pca9685(self, bus=1, address=0x40):
+        """PCA9685 émulé à l'adresse ``address`` du bus ``bus``."""
+        return self.bus(bus).devices[address]
+
+
+state = MockState()
+
+
+# --- RPi.GPIO --------------------------------------------------------------------------------
+
+def _gpio_module():
+    gpio = types.ModuleType("RPi.GPIO")
+    gpio.BCM, gpio.BOARD = 11, 10
+    gpio.OUT, gpio.IN = 0, 1
+    gpio.LOW, gpio.HIGH = 0, 1
+    gpio.PUD_OFF, gpio.PUD_DOWN, gpio.PUD_UP = 20, 21, 22
+    gpio.RISING, gpio.FALLING, gpio.BOTH = 31, 32, 33
+    gpio.setwarnings = lambda flag: None
+    gpio.setmode = lambda mode: None
+
+    def setup(pin, mode, pull_up_down=None, initial=None):
+        if mode == gpio.OUT:
+            state.pins[pin] = gpio.LOW if initial is None else initial
+
+    def output(pin, value):
+        state.pins[pin] = int(bool(value))
+
+    def input(pin):
+        return state.pins.get(pin, int(state.line(pin)))
+
+    gpio.setup = setup
+    gpio.output = output
+    gpio.input = input
+    gpio.cleanup = lambda *pins: state.pins.clear()
+    return gpio
+
+
+# --- smbus -----------------------------------------------------------------------------------
+
+class SMBus(PCA9685Emulator.SMBus):
+    """Poignée SMBus sur le bus émulé ``bus`` de l'état partagé."""
+
+    def __init__(self, bus=1):
+        super().__init__(state.bus(bus))
+
+
+# --- gpiozero --------------------------------------------------------------------------------
+
+class DistanceSensor:
+    """Capteur à ultrasons factice (interface de gpiozero.DistanceSensor)."""
+
+    def __init__(self, echo=None, trigger=None, max_distance=1.0, **kwargs):
+        self.echo = echo
+        self.trigger = trigger
+        self.max_distance = max_distance
+
+    @property
+    def distance(self):
+        distance = state.distance(self.echo, min(1.0, self.max_distance))
+        if distance is None:  # Aucun écho : gpiozero renvoie la distance maximale
+            return self.max_distance
+        return max(0.0, min(self.max_distance, distance))
+
+    def close(self):
+        pass
+
+
+class DigitalInputDevice:
+    """Entrée numérique factice (interface de gpiozero.DigitalInputDevice)."""
+
+    def __init__(self, pin=None, pull_up=False, **kwargs):
+        self.pin = pin
+        self.pull_up = pull_up
+        self.when_activated = None
+        self.when_deactivated = None
+
+    @property
+    def value(self):
+        return int(bool(state.line(self.pin)))
+
+    @property
+    def is_active(self):
+        return bool(self.value)
+
+    def _wait_for(self, active, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.is_active != active:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def wait_for_active(self, timeout=None):
+        return self._wait_for(True, timeout)
+
+    def wait_for_inactive(self, timeout=None):
+        return self._wait_for(False, timeout)
+
+    def close(self):
+        pass
+
+
+def _gpiozero_module():
+    gpiozero = types.ModuleType("gpiozero")
+    gpiozero.DistanceSensor = DistanceSensor
+    gpiozero.DigitalInputDevice = DigitalInputDevice
+    return gpiozero
+
+
+# --- board / busio / adafruit_tcs34725 -------------------------------------------------------
+
+class I2C:
+    """Bus I²C factice de busio."""
+
+    def __init__(self, scl=None, sda=None, frequency=100000):
+        self.scl = scl
+        self.sda = sda
+        self._lock = threading.Lock()
+
+    def try_lock(self):
+        return self._lock.acquire(blocking=False)
+
+    def unlock(self):
+        self._lock.release()
+
+    def deinit(self):
+        pass
+
+
+class TCS34725:
+    """Capteur de couleur factice (interface de adafruit_tcs34725.TCS34725)."""
+
+    def __init__(self, i2c, address=0x29):
+        self.i2c = i2c
+        self.address = address
+        self.enable = False
+        self.integration_time = 2.4
+        self.gain = 1
+        self.cycles = -1
+        self.min_value = 0
+        self.max_value = 0xFFFF
+        self.interrupt = False
+
+    @property
+    def color_raw(self):
+        return tuple(state.color())
+
+    @property
+    def color_rgb_bytes(self):
+        r, g, b, clear = self.color_raw
+        if clear == 0:
+            return 0, 0, 0
+        return tuple(min(255, int(255 * channel / clear)) for channel in (r, g, b))
+
+    @property
+    def lux(self):
+        r, g, b, _ = self.color_raw
+        return -0.32466 * r + 1.57837 * g - 0.73191 * b
+
+    @property
+    def color_temperature(self):
+        r, g, b, _ = self.color_raw
+        x = -0.14282 * r + 1.54924 * g - 0.95641 * b
+        y = -0.32466 * r + 1.57837 * g - 0.73191 * b
+        z = -0.68202 * r + 0.77073 * g + 0.56332 * b
+        total = x + y + z
+        if total == 0 or y / total == 0.1858:
+            return None
+        n = (x / total - 0.3320) / (0.1858 - y / total)
+        return 449.0 * n ** 3 + 3525.0 * n ** 2 + 6823.3 * n + 5520.33
+
+
+def _simple_module(name, **attributes):
+    module = types.ModuleType(name)
+    for key, value in attributes.items():
+        setattr(module, key, value)
+    return module
+
+
+_BUILDERS = {
+    "RPi.GPIO": _gpio_module,
+    "smbus": lambda: _simple_module("smbus", SMBus=SMBus),
+    "gpiozero": _gpiozero_module,
+    "board": lambda: _simple_module("board", SCL=3, SDA=2),
+    "busio": lambda: _simple_module("busio", I2C=I2C),
+    "adafruit_tcs34725": lambda: _simple_module("adafruit_tcs34725", TCS34725=TCS34725),
+}
+_modules = {}
+
+
+def module(name):
+    """
+    Retourne le module factice ``name`` (construit une seule fois).
+
+    :raises ImportError: Si aucun équivalent factice n'existe pour ce module.
+    """
+    if name not in _BUILDERS:
+        raise ImportError(f"Aucun équivalent simulé pour le module matériel '{name}'.")
+    if name not in _modules:
+        _modules[name] = _BUILDERS[name]()
+    return _modules[name]
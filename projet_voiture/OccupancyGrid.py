@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+OccupancyGrid.py
+----------------
+Ce module maintient une grille d'occupation locale autour de la voiture à partir des trois
+capteurs à ultrasons et du déplacement estimé (SpeedEstimator).
+
+  - La grille est un tableau NumPy de taille fixe (log-odds en float32) : la mémoire est bornée
+    quelle que soit la distance parcourue. Lorsque la voiture approche d'un bord, la grille est
+    décalée pour la garder au centre ; ce qui sort de la grille est oublié.
+  - Chaque mesure met à jour le cône du capteur : cellules libres jusqu'à l'obstacle, cellules
+    occupées sur l'arc mesuré.
+  - Les informations s'estompent avec le temps (décroissance exponentielle), ce qui absorbe la
+    dérive de l'odométrie et les obstacles qui bougent.
+  - Le choix du virage interroge deux secteurs (gauche / droite) dont les cellules sont
+    précalculées pour chaque cap : le coût d'une requête ne dépend pas de la taille de la grille.
+
+Repère : x vers l'avant au départ, y vers la droite, cap en degrés (positif vers la droite),
+distances en mètres.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la classe OccupancyGrid (grille d'occupation et choix du côté le plus dégagé).
+"""
+
+import math
+import time
+
+import numpy as np
+
+# Orientation des capteurs par rapport à l'axe de la voiture (degrés, positif vers la droite)
+SENSOR_ANGLES = {"front": 0.0, "left": -90.0, "right": 90.0}
+
+HEADING_BINS = 72  # Secteurs précalculés tous les 5°
+
+
+class OccupancyGrid:
+    """
+    Grille d'occupation locale bornée en mémoire.
+    """
+
+    def __init__(self, size=10.0, resolution=0.05, half_life=5.0, beam_width=15.0, max_range=3.0,
+                 hit=0.85, miss=-0.4, limit=4.0, lookahead=1.0, clock=time.monotonic):
+        """
+        :param size: Côté de la grille (mètres).
+        :param resolution: Côté d'une cellule (mètres).
+        :param half_life: Temps (secondes) au bout duquel une information perd la moitié de son poids.
+        :param beam_width: Demi-angle du cône des capteurs à ultrasons (degrés).
+        :param max_range: Portée utile des capteurs (mètres).
+        :param hit: Incrément de log-odds d'une cellule où un obstacle est mesuré.
+        :param miss: Incrément de log-odds d'une cellule traversée par l'onde.
+        :param limit: Valeur absolue maximale des log-odds (la grille reste réactive).
+        :param lookahead: Rayon des secteurs interrogés pour le choix du virage (mètres).
+        :param clock: Horloge monotone (remplaçable pour les tests).
+        """
+        if resolution <= 0 or size < 2 * (max_range + lookahead) + 1:
+            raise ValueError("La grille doit dépasser d'au moins 1 m deux fois la portée des capteurs et des secteurs.")
+        if half_life <= 0:
+            raise ValueError("La demi-vie doit être supérieure à zéro.")
+        self.resolution = resolution
+        self.cells = int(round(size / resolution))
+        self.grid = np.zeros((self.cells, self.cells), dtype=np.float32)
+        self.half_life = half_life
+        self.beam_width = beam_width
+        self.max_range = max_range
+        self.hit = hit
+        self.miss = miss
+        self.limit = limit
+        self.lookahead = lookahead
+        self.clock = clock
+        self._last_decay = clock()
+
+        # Pose de la voiture et coin de la grille dans le repère odométrique
+        self.x = self.y = self.heading = 0.0
+        self.origin = np.array([-size / 2, -size / 2])
+
+        self._sectors = self._build_sectors()
+
+    # --- Géométrie -------------------------------------------------------------------------
+
+    def _build_sectors(self):
+        """
+        Précalcule, pour chaque cap discrétisé, les décalages (lignes, colonnes) des cellules des
+        secteurs gauche et droit (de 20° à 100° de part et d'autre de l'axe, jusqu'à ``lookahead``).
+        """
+        n = int(math.ceil(self.lookahead / self.resolution))
+        di, dj = np.mgrid[-n:n + 1, -n:n + 1]
+        dx, dy = di.ravel() * self.resolution, dj.ravel() * self.resolution
+        distance = np.hypot(dx, dy)
+        bearing = np.degrees(np.arctan2(dy, dx))
+        in_range = (distance > self.resolution) & (distance <= self.lookahead)
+        sectors = {"left": [], "right": []}
+        for b in range(HEADING_BINS):
+            heading = b * 360.0 / HEADING_BINS
+            relative = (bearing - heading + 180) % 360 - 180
+            for side, sign in (("left", -1), ("right", 1)):
+                mask = in_range & (sign * relative >= 20) & (sign * relative <= 100)
+                sectors[side].append((di.ravel()[mask], dj.ravel()[mask]))
+        return sectors
+
+    def _cell(self, x, y):
+        return (np.floor((np.asarray(x) - self.origin[0]) / self.resolution).astype(int),
+                np.floor((np.asarray(y) - self.origin[1]) / self.resolution).astype(int))
+
+    def _recenter(self):
+        """Décale la grille si la voiture s'approche d'un bord (le contenu hors grille est perdu)."""
+        margin = int(math.ceil((self.max_range + self.lookahead) / self.resolution))
+        i, j = self._cell(self.x, self.y)
+        shift_i = shift_j = 0
+        if not margin <= i < self.cells - margin:
+            shift_i = int(i - self.cells // 2)
+        if not margin <= j < self.cells - margin:
+            shift_j = int(j - self.cells // 2)
+        if shift_i == 0 and shift_j == 0:
+            return
+        shifted = np.zeros_like(self.grid)
+        src_i = slice(max(0, shift_i), self.cells + min(0, shift_i))
+        dst_i = slice(max(0, -shift_i), self.cells + min(0, -shift_i))
+        src_j = slice(max(0, shift_j), self.cells + min(0, shift_j))
+        dst_j = slice(max(0, -shift_j), self.cells + min(0, -shift_j))
+        shifted[dst_i, dst_j] = self.grid[src_i, src_j]
+        self.grid = shifted
+        self.origin += np.array([shift_i, shift_j]) * self.resolution
+
+    def _decay(self):
+        """Applique la décroissance exponentielle accumulée depuis la dernière fois."""
+        now = self.clock()
+        elapsed = now - self._last_decay
+        if elapsed >= 0.1:
+            self.grid *= np.float32(0.5 ** (elapsed / self.half_life))
+            self._last_decay = now
+
+    # --- Mises à jour ----------------------------------------------------------------------
+
+    def update_pose(self, x, y, heading):
+        """
+        Met à jour la pose de la voiture (issue de l'odométrie).
+
+        :param x: Position vers l'avant (mètres).
+        :param y: Position vers la droite (mètres).
+        :param heading: Cap (degrés, positif vers la droite).
+        """
+        self.x, self.y, self.heading = x, y, heading
+        self._recenter()
+
+    def add_measurement(self, sensor, distance):
+        """
+        Intègre une mesure de distance.
+
+        :param sensor: "front", "left" ou "right".
+        :param distance: Distance mesurée (mètres), ou None si aucun écho n'est revenu (cône libre).
+        """
+        if sensor not in SENSOR_ANGLES:
+            raise ValueError(f"Capteur inconnu : '{sensor}'")
+        self._decay()
+        obstacle = distance is not None and distance < self.max_range
+        reach = distance if obstacle else self.max_range
+
+        direction = math.radians(self.heading + SENSOR_ANGLES[sensor])
+        half = math.radians(self.beam_width)
+        rays = max(3, int(math.ceil(2 * half * reach / self.resolution)) + 1)
+        angles = direction + np.linspace(-half, half, rays)
+        radii = np.arange(0.0, max(0.0, reach - self.resolution), self.resolution / 2)
+        free = self._flat_cells(radii[None, :], angles[:, None])
+        if obstacle:
+            occupied = self._flat_cells(np.array([[reach]]), angles[:, None])
+            free = np.setdiff1d(free, occupied, assume_unique=True)
+            self.grid.flat[occupied] += self.hit
+        self.grid.flat[free] += self.miss
+        np.clip(self.grid, -self.limit, self.limit, out=self.grid)
+
+    def add_distances(self, distances):
+        """Intègre un dictionnaire {capteur: distance en mètres ou None}."""
+        for sensor, distance in distances.items():
+            self.add_measurement(sensor, distance)
+
+    def _flat_cells(self, radii, angles):
+        """Indices à plat (uniques, dans la grille) des points (rayon, angle) autour de la voiture."""
+        i, j = self._cell(self.x + radii * np.cos(angles), self.y + radii * np.sin(angles))
+        i, j = i.ravel(), j.ravel()
+        inside = (i >= 0) & (i < self.cells) & (j >= 0) & (j < self.cells)
+        return np.unique(i[inside] * self.cells + j[inside])
+
+    # --- Requêtes --------------------------------------------------------------------------
+
+    def occupancy(self, x, y):
+        """Probabilité d'occupation (0 à 1) au point (x, y) ; 0.5 si inconnu ou hors grille."""
+        i, j = self._cell(x, y)
+        if not (0 <= i < self.cells and 0 <= j < self.cells):
+            return 0.5
+        return float(1.0 / (1.0 + math.exp(-self.grid[i, j])))
+
+    def side_cost(self, side):
+        """
+        Encombrement d'un secteur ("left" ou "right") : somme des log-odds positifs
+        (les zones inconnues et libres ne coûtent rien).
+        """
+        self._decay()
+        di, dj = self._sectors[side][int(round(self.heading / (360.0 / HEADING_BINS))) % HEADING_BINS]
+        i, j = self._cell(self.x, self.y)
+        values = self.grid[np.clip(i + di, 0, self.cells - 1), np.clip(j + dj, 0, self.cells - 1)]
+        return float(np.maximum(values, 0).sum())
+
+    def best_turn(self):
+        """
+        Retourne le côté le plus dégagé ("left" ou "right") selon la grille,
+        ou None si les deux secteurs sont équivalents.
+        """
+        left, right = self.side_cost("left"), self.side_cost("right")
+        if abs(left - right) < self.hit:
+            return None
+        return "left" if left < right else "right"
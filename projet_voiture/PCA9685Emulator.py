@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+PCA9685Emulator.py
+------------------
+Ce module émule, en mémoire, un bus I²C portant un PCA9685 : il remplace ``smbus.SMBus`` dans le
+backend matériel "mock" (voir MockHardware) et dans les tests.
+
+  - PCA9685 : carte des registres (MODE1/MODE2, PRESCALE, LEDn_ON/OFF, ALL_LED), valeurs à la mise
+    sous tension, auto-incrément, PRESCALE modifiable seulement en veille, bits « toujours allumé /
+    toujours éteint » ; ``channel(n)`` décode l'état d'une sortie.
+  - I2CBus : le bus partagé. Il compte chaque transaction (et ses octets) et modélise sa durée
+    (octets de 9 bits, START/STOP) à la fréquence du bus, avec option d'attente réelle.
+  - SMBus : poignée compatible ``smbus.SMBus`` sur un I2CBus ; plusieurs poignées (un PWM par
+    contrôleur, l'arrêt d'urgence) partagent le même bus et donc les mêmes compteurs.
+
+Lancé directement, le module mesure le coût I²C des opérations de la voiture (transactions, octets
+et durée de bus par opération), sans matériel.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit les classes PCA9685, I2CBus et SMBus.
+"""
+
+import errno
+import threading
+import time
+from collections import deque
+
+# Registres
+MODE1, MODE2 = 0x00, 0x01
+SUBADR1, SUBADR2, SUBADR3, ALLCALLADR = 0x02, 0x03, 0x04, 0x05
+LED0_ON_L = 0x06
+LAST_LED_REGISTER = 0x45
+ALL_LED_ON_L = 0xFA
+ALL_LED_OFF_H = 0xFD
+PRESCALE = 0xFE
+
+# Bits de MODE1
+RESTART, AUTO_INCREMENT, SLEEP, ALLCALL = 0x80, 0x20, 0x10, 0x01
+FULL = 0x10  # Bit 4 de LEDn_ON_H / LEDn_OFF_H : toujours allumé / toujours éteint
+
+OSCILLATOR_HZ = 25000000
+CHANNELS = 16
+
+
+class PCA9685:
+    """
+    Registres d'un PCA9685.
+    """
+
+    def __init__(self):
+        self.registers = bytearray(256)
+        self.reset()
+
+    def reset(self):
+        """Valeurs à la mise sous tension (datasheet NXP, section 7.3)."""
+        self.registers[:] = bytes(256)
+        self.registers[MODE1] = SLEEP | ALLCALL
+        self.registers[MODE2] = 0x04
+        self.registers[SUBADR1], self.registers[SUBADR2], self.registers[SUBADR3] = 0xE2, 0xE4, 0xE8
+        self.registers[ALLCALLADR] = 0xE0
+        for channel in range(CHANNELS):
+            self.registers[LED0_ON_L + 4 * channel + 3] = FULL  # Sorties éteintes
+        self.registers[PRESCALE] = 0x1E
+
+    @property
+    def auto_increment(self):
+        return bool(self.registers[MODE1] & AUTO_INCREMENT)
+
+    def write(self, register, value):
+        """Écrit un registre en respectant ses règles d'accès."""
+        value &= 0xFF
+        if register == MODE1:
+            # RESTART s'efface en écrivant 1 (redémarrage des sorties) ; il se lit à 0 ensuite
+            self.registers[MODE1] = value & ~RESTART
+        elif register == PRESCALE:
+            if self.registers[MODE1] & SLEEP:  # Ignoré hors veille
+                self.registers[PRESCALE] = max(3, value)
+        elif ALL_LED_ON_L <= register <= ALL_LED_OFF_H:
+            offset = register - ALL_LED_ON_L
+            for channel in range(CHANNELS):
+                self.registers[LED0_ON_L + 4 * channel + offset] = value
+        elif register <= LAST_LED_REGISTER:
+            self.registers[register] = value
+        # Registres réservés : écriture ignorée
+
+    def read(self, register):
+        """Lit un registre (les registres ALL_LED se lisent à zéro)."""
+        if ALL_LED_ON_L <= register <= ALL_LED_OFF_H:
+            return 0
+        return self.registers[register]
+
+    def next_register(self, register):
+        """Registre suivant en auto-incrément (les registres LED bouclent, la suite ALL_LED aussi)."""
+        if register == LAST_LED_REGISTER:
+            return MODE1
+        if register == ALL_LED_OFF_H:
+            return ALL_LED_ON_L
+        return (register + 1) & 0xFF
+
+    def channel(self, channel):
+        """
+        État décodé d'une sortie.
+
+        :return: Dictionnaire {"on", "off", "full_on", "full_off", "duty"} (duty de 0 à 4096).
+        """
+        base = LED0_ON_L + 4 * channel
+        on_l, on_h, off_l, off_h = self.registers[base:base + 4]
+        full_on, full_off = bool(on_h & FULL), bool(off_h & FULL)
+        on, off = on_l | (on_h & 0x0F) << 8, off_l | (off_h & 0x0F) << 8
+        if full_off:
+            duty = 0
+        elif full_on:
+            duty = 4096
+        else:
+            duty = (off - on) % 4096
+        return {"on": on, "off": off, "full_on": full_on, "full_off": full_off, "duty": duty}
+
+    @property
+    def frequency(self):
+        """Fréquence PWM (Hz) donnée par PRESCALE et l'oscillateur interne."""
+        return OSCILLATOR_HZ / (4096 * (self.registers[PRESCALE] + 1))
+
+    @property
+    def sleeping(self):
+        return bool(self.registers[MODE1] & SLEEP)
+
+
+class I2CBus:
+    """
+    Bus I²C émulé : esclaves, comptage des transactions et modèle de durée.
+    """
+
+    def __init__(self, devices=None, clock_hz=100000, real_time=False, log_size=0):
+        """
+        :param devices: Dictionnaire {adresse: esclave} (par défaut un PCA9685 en 0x40).
+        :param clock_hz: Fréquence du bus (Hz) ; 100 kHz par défaut sur le Raspberry Pi.
+        :param real_time: Attend réellement la durée modélisée de chaque transaction.
+        :param log_size: Nombre de transactions conservées dans ``log`` (0 = aucune).
+        """
+        self.devices = dict(devices) if devices is not None else {0x40: PCA9685()}
+        self.clock_hz = clock_hz
+        self.real_time = real_time
+        self.log = deque(maxlen=log_size) if log_size else None
+        self.lock = threading.Lock()  # Une transaction à la fois, comme sur le vrai bus
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.bus_time = 0.0
+
+    def stats(self):
+        """:return: Dictionnaire (transactions, octets, durée de bus en ms)."""
+        return {"transactions": self.transactions, "bytes": self.bytes, "bus_time_ms": self.bus_time * 1000}
+
+    def device(self, address):
+        try:
+            return self.devices[address]
+        except KeyError:
+            raise OSError(errno.EREMOTEIO, f"Remote I/O error (aucun esclave en 0x{address:02X})") from None
+
+    def account(self, operation, address, register, data, repeated_start=False):
+        """
+        Compte une transaction : adresse + registre + données, octets de 9 bits (ACK compris),
+        START et STOP (et un START répété + adresse pour une lecture).
+        """
+        count = 2 + len(data) + (1 if repeated_start else 0)
+        bits = 9 * count + 2 + (1 if repeated_start else 0)
+        duration = bits / self.clock_hz
+        self.transactions += 1
+        self.bytes += count
+        self.bus_time += duration
+        if self.log is not None:
+            self.log.append((operation, address, register, tuple(data)))
+        if self.real_time:
+            time.sleep(duration)
+
+
+class SMBus:
+    """
+    Poignée compatible ``smbus.SMBus`` sur un bus émulé.
+    """
+
+    def __init__(self, bus=None):
+        """
+        :param bus: I2CBus partagé (un nouveau bus portant un PCA9685 par défaut).
+        """
+        self.i2c = bus if isinstance(bus, I2CBus) else I2CBus()
+
+    def write_byte_data(self, address, register, value):
+        with self.i2c.lock:
+            device = self.i2c.device(address)
+            self.i2c.account("write", address, register, [value])
+            device.write(register, value)
+
+    def read_byte_data(self, address, register):
+        with self.i2c.lock:
+            device = self.i2c.device(address)
+            value = device.read(register)
+            self.i2c.account("read", address, register, [value], repeated_start=True)
+            return value
+
+    def write_i2c_block_data(self, address, register, data):
+        with self.i2c.lock:
+            device = self.i2c.device(address)
+            self.i2c.account("write_block", address, register, data)
+            current = register
+            for value in data:
+                device.write(current, value)
+                if device.auto_increment:
+                    current = device.next_register(current)
+
+    def read_i2c_block_data(self, address, register, length=32):
+        with self.i2c.lock:
+            device = self.i2c.device(address)
+            values, current = [], register
+            for _ in range(length):
+                values.append(device.read(current))
+                if device.auto_increment:
+                    current = device.next_register(current)
+            self.i2c.account("read_block", address, register, values, repeated_start=True)
+            return values
+
+    def close(self):
+        pass
+
+
+def benchmark():
+    """
+    Coût I²C des opérations courantes de la voiture sur le backend "mock".
+
+    :return: Liste de tuples (opération, transactions, octets, durée de bus en ms).
+    """
+    import Hardware
+    import MockHardware
+    Hardware.select("mock")
+    MockHardware.state.reset()
+    from ControllerMotor import ControllerMotor
+    from ControllerServo import ControllerServo
+    from Watchdog import EmergencyStop
+
+    bus = MockHardware.state.bus(1)
+    results = []
+
+    def measure(name, action):
+        bus.reset_counters()
+        value = action()
+        stats = bus.stats()
+        results.append((name, stats["transactions"], stats["bytes"], stats["bus_time_ms"]))
+        return value
+
+    motor = measure("ControllerMotor()", ControllerMotor)
+    servo = measure("ControllerServo()", ControllerServo)
+    measure("forward(50)", lambda: motor.forward(50))
+    measure("forward(50) répété (cache)", lambda: motor.forward(50))
+    measure("stop()", motor.stop)
+    measure("rotate(20)", lambda: servo.rotate(20))
+    measure("setToDegree(45)", lambda: servo.setToDegree(45))
+    stop = EmergencyStop(bus=MockHardware.SMBus(1))
+    measure("EmergencyStop.trigger()", stop.trigger)
+    Hardware.select("reel")
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    print(f"\n{'Opération':<38} {'trans.':>6} {'octets':>7} {'bus (ms)':>9}")
+    for name, transactions, count, duration in results:
+        print(f"{name:<38} {transactions:>6} {count:>7} {duration:>9.3f}")
@@ -11,9 +11,106 @@
 **********************************************************************
 '''
 
-import smbus
+import glob
+import os
+import subprocess
+import threading
 import time
 import math
+from Hardware import lazy, backend
+
+smbus = lazy("smbus")
+
+# Détection du bus I²C du PCA9685 : faite une seule fois par processus (plusieurs PWM sont créés
+# au démarrage), à partir du modèle de la carte (device tree) et des bus présents dans /dev.
+# Le bus peut être imposé avec PWM(bus_number=...) ou la variable d'environnement VOITURE_I2C_BUS.
+BUS_ENV = "VOITURE_I2C_BUS"
+MODEL_PATHS = ("/proc/device-tree/model", "/sys/firmware/devicetree/base/model")
+DEV_DIR = "/dev"
+# Premières cartes (Pi 1 modèle B révision 1) : le connecteur GPIO est câblé sur le bus 0
+LEGACY_MODELS = ("Raspberry Pi Model B Rev 1",)
+
+_bus_number = None
+_bus_lock = threading.Lock()
+
+
+def board_model(paths=None):
+    """
+    :return: Modèle de la carte lu dans le device tree (par exemple "Raspberry Pi 4 Model B Rev 1.4"),
+             ou None s'il est introuvable.
+    """
+    for path in (MODEL_PATHS if paths is None else paths):
+        try:
+            with open(path, "rb") as f:
+                return f.read().decode("utf-8", "replace").strip("\x00\n ")
+        except OSError:
+            continue
+    return None
+
+
+def i2c_buses(directory=None):
+    """:return: Numéros des bus I²C présents (/dev/i2c-*), triés."""
+    buses = []
+    for path in glob.glob(os.path.join(DEV_DIR if directory is None else directory, "i2c-*")):
+        suffix = path.rsplit("-", 1)[1]
+        if suffix.isdigit():
+            buses.append(int(suffix))
+    return sorted(buses)
+
+
+def detect_bus_number(refresh=False):
+    """
+    Numéro du bus I²C du PCA9685, détecté au premier appel puis mis en cache.
+
+    :param refresh: Refait la détection (après activation de l'I²C par exemple).
+    :raises ValueError: Si VOITURE_I2C_BUS n'est pas un entier.
+    :raises RuntimeError: Si aucun bus I²C utilisable n'est trouvé.
+    """
+    global _bus_number
+    override = os.environ.get(BUS_ENV)
+    if override is not None:
+        try:
+            return int(override)
+        except ValueError:
+            raise ValueError(f"{BUS_ENV} doit être un numéro de bus I²C, pas '{override}'.") from None
+    with _bus_lock:
+        if _bus_number is not None and not refresh:
+            return _bus_number
+        model = board_model()
+        buses = i2c_buses()
+        legacy = model is not None and model.startswith(LEGACY_MODELS)
+        for candidate in ((0, 1) if legacy else (1, 0)):
+            if candidate in buses:
+                _bus_number = candidate
+                return candidate
+        raise RuntimeError(
+            f"Aucun bus I²C pour le PCA9685 (carte : {model or 'inconnue'}, "
+            f"bus présents : {', '.join(f'/dev/i2c-{n}' for n in buses) or 'aucun'}). "
+            f"Activez l'I²C (sudo raspi-config, ou dtparam=i2c_arm=on dans config.txt) "
+            f"ou indiquez le bus avec PWM(bus_number=...) / {BUS_ENV}.")
+
+
+def scan_addresses(bus_number):
+    """
+    Adresses qui répondent sur un bus I²C (commande i2cdetect).
+
+    :return: Liste d'adresses, ou None si i2cdetect est indisponible ou échoue.
+    """
+    try:
+        result = subprocess.run(["i2cdetect", "-y", str(bus_number)], capture_output=True, text=True,
+                                timeout=5, check=True)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    addresses = []
+    for line in result.stdout.splitlines()[1:]:
+        for cell in line.partition(":")[2].split():
+            if cell not in ("--", "UU"):
+                try:
+                    addresses.append(int(cell, 16))
+                except ValueError:
+                    continue
+    return addresses
+
 
 class PWM(object):
     _MODE1              = 0x00
@@ -37,79 +134,17 @@ class PWM(object):
     _INVRT              = 0x10
     _OUTDRV             = 0x04
 
-    RPI_REVISION_0 = ["900092"]
-    RPI_REVISION_1_MODULE_B = ["Beta", "0002", "0003", "0004", "0005", "0006", "000d", "000e", "000f"]
-    RPI_REVISION_1_MODULE_A = ["0007", "0008", "0009",]
-    RPI_REVISION_1_MODULE_BP = ["0010", "0013"]
-    RPI_REVISION_1_MODULE_AP = ["0012"]
-    RPI_REVISION_2_MODULE_B  = ["a01041", "a21041"]
-    RPI_REVISION_3_MODULE_B  = ["a02082", "a22082"]
-    RPI_REVISION_3_MODULE_BP = ["a020d3"]
-
     _DEBUG = False
     _DEBUG_INFO = 'DEBUG "PCA9685.py":'
 
-    def _get_bus_number(self):
-        pi_revision = self._get_pi_revision()
-        if   pi_revision == '0':
-            return 0
-        elif pi_revision == '1 Module B':
-            return 0
-        elif pi_revision == '1 Module A':
-            return 0
-        elif pi_revision == '1 Module B+':
-            return 1
-        elif pi_revision == '1 Module A+':
-            return 0
-        elif pi_revision == '2 Module B':
-            return 1
-        elif pi_revision == '3 Module B':
-            return 1
-        elif pi_revision == '3 Module B+':
-            return 1
-
-    def _get_pi_revision(self):
-        # Courtesy quick2wire-python-api
-        # https://github.com/quick2wire/quick2wire-python-api
-        # Updated revision info from: http://elinux.org/RPi_HardwareHistory#Board_Revision_History
-        try:
-            f = open('/proc/cpuinfo','r')
-            for line in f:
-                if line.startswith('Revision'):
-                    if line[11:-1] in self.RPI_REVISION_0:
-                        return '0'
-                    elif line[11:-1] in self.RPI_REVISION_1_MODULE_B:
-                        return '1 Module B'
-                    elif line[11:-1] in self.RPI_REVISION_1_MODULE_A:
-                        return '1 Module A'
-                    elif line[11:-1] in self.RPI_REVISION_1_MODULE_BP:
-                        return '1 Module B+'
-                    elif line[11:-1] in self.RPI_REVISION_1_MODULE_AP:
-                        return '1 Module A+'
-                    elif line[11:-1] in self.RPI_REVISION_2_MODULE_B:
-                        return '2 Module B'
-                    elif line[11:-1] in self.RPI_REVISION_3_MODULE_B:
-                        return '3 Module B'
-                    elif line[11:-1] in self.RPI_REVISION_3_MODULE_BP:
-                        return '3 Module B+'
-                    else:
-                        print ("Error. Pi revision didn't recognize, module number: %s" % line[11:-1])
-                        print ('Exiting...')
-                        quit()
-        except (Exception, e):
-            f.close()
-            print (e)
-            print ('Exiting...')
-            quit()
-        finally:
-            f.close()
-
     def __init__(self, bus_number=None, address=0x40):
         if self._DEBUG:
             print (self._DEBUG_INFO, "Debug on")
         self.address = address
-        if bus_number == None:
-            self.bus_number = self._get_bus_number()
+        if bus_number == None and backend() != "reel":
+            self.bus_number = 1  # Backends simulés : pas de carte à détecter
+        elif bus_number == None:
+            self.bus_number = detect_bus_number()
         else:
             self.bus_number = bus_number
         self.bus = smbus.SMBus(self.bus_number)
@@ -131,9 +166,8 @@ class PWM(object):
             print (self._DEBUG_INFO, 'Writing value %2X to %2X' % (value, reg))
         try:
             self.bus.write_byte_data(self.address, reg, value)
-        except (Exception, i):
-            print (i)
-            self._check_i2c()
+        except OSError as e:
+            self._check_i2c(e)
 
     def _read_byte_data(self, reg):
         if self._DEBUG:
@@ -141,50 +175,29 @@ class PWM(object):
         try:
             results = self.bus.read_byte_data(self.address, reg)
             return results
-        except (Exception, i):
-            print (i)
-            self._check_i2c()
-
-    def _check_i2c(self):
-        import commands
-        bus_number = self._get_bus_number()
-        print ("\nYour Pi Rivision is: %s" % self._get_pi_revision())
-        print ("I2C bus number is: %s" % bus_number)
-        print ("Checking I2C device:")
-        cmd = "ls /dev/i2c-%d" % bus_number
-        output = commands.getoutput(cmd)
-        print ('Commands "%s" output:' % cmd)
-        print (output)
-        if '/dev/i2c-%d' % bus_number in output.split(' '):
-            print ("I2C device setup OK")
-        else:
-            print ("Seems like I2C has not been set. Use 'sudo raspi-config' to set I2C")
-        cmd = "i2cdetect -y %s" % self.bus_number
-        output = commands.getoutput(cmd)
-        outputs = output.split('\n')[1:]
-        addresses = []
-        for tmp_addresses in outputs:
-            tmp_addresses = tmp_addresses.split(':')[1]
-            tmp_addresses = tmp_addresses.strip().split(' ')
-            for address in tmp_addresses:
-                if address != '--':
-                    addresses.append(address)
-        if addresses == []:
-            print ("None")
-        else:
-            for address in addresses:
-                print ("  0x%s" % address)
-        if "%02X" % self.address in addresses:
-            print ("Wired, I2C device is connected. Try to run the program again. If the problem's still, email the error message to service@sunfounder.com")
+        except OSError as e:
+            self._check_i2c(e)
+
+    def _check_i2c(self, error):
+        """
+        Diagnostic d'un échec I²C : lève une erreur explicite au lieu de quitter le programme.
+
+        :raises RuntimeError: Toujours, avec l'erreur d'origine comme cause.
+        """
+        addresses = scan_addresses(self.bus_number)
+        if addresses is None:
+            detail = "i2cdetect indisponible, vérifiez le câblage et l'activation de l'I²C"
+        elif self.address in addresses:
+            detail = "le PCA9685 répond à i2cdetect : erreur passagère (câblage, alimentation ?)"
         else:
-            print ("Device is missing.")
-            print ("Check the address or wiring of PCA9685 servo driver, or email the error message to service@sunfounder.com")
-            print ('Exiting...')
-        quit()
+            found = ", ".join("0x%02X" % a for a in addresses) or "aucune"
+            detail = "PCA9685 absent (adresses présentes : %s), vérifiez l'adresse et le câblage" % found
+        raise RuntimeError("Échec I²C sur /dev/i2c-%d en 0x%02X : %s ; %s."
+                           % (self.bus_number, self.address, error, detail)) from error
 
     @property
     def frequency(self):
-        return _frequency
+        return self._frequency
 
     @frequency.setter
     def frequency(self, freq):
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+ParameterSweep.py
+-----------------
+Ce module cherche de bons réglages de conduite (voir Tuning) en simulation : chaque jeu de
+réglages d'une grille ou d'une recherche aléatoire fait une course dans le monde simulé
+(voir Simulation), sur tous les cœurs (pool multiprocessing), puis les jeux sont classés.
+
+Score (plus petit = meilleur, en secondes) :
+    temps au tour estimé (durée simulée / tours parcourus, fractions comprises)
+    + pénalité par collision + pénalité par manœuvre
+    + pénalité si la voiture s'est arrêtée sur une erreur (capteur hors plage...)
+
+Exemples :
+
+    python3 ParameterSweep.py --grille side_threshold=10,15,20 front_threshold=41,60,80 --duree 60
+    python3 ParameterSweep.py --aleatoire 500 --graine 1 --sortie resultats.csv
+    python3 ParameterSweep.py --aleatoire 200 --plage motor_speed_forwards=30:60 --piste piste.json
+
+Les réglages non balayés gardent leur valeur par défaut ; les jeux incohérents (refusés par la
+validation de Tuning) sont écartés avant simulation.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la génération des jeux de réglages, l'évaluation parallèle et l'export CSV.
+"""
+
+import argparse
+import csv
+import itertools
+import math
+import multiprocessing
+import os
+import random
+import time
+
+from Simulation import Track, simulate
+from Tuning import DEFAULTS, PARAMETERS, validate
+
+# Plages de la recherche aléatoire (plus étroites que les bornes de validation de Tuning)
+SEARCH_RANGES = {
+    "side_threshold": (5, 30),
+    "front_threshold": (25, 90),
+    "emergency_threshold": (10, 60),
+    "angle_virage_gauche": (-45, -10),
+    "angle_virage_droite": (10, 45),
+    "duree_virage": (0.1, 1.0),
+    "duree_marche_arriere": (0.1, 0.8),
+    "reverse_pause": (0.0, 0.6),
+    "motor_speed_forwards": (25, 70),
+    "motor_speed_backwards": (25, 70),
+}
+
+COLLISION_PENALTY = 5.0   # Secondes ajoutées par collision
+MANOEUVRE_PENALTY = 0.2   # Secondes ajoutées par manœuvre
+ERROR_PENALTY = 60.0      # Secondes ajoutées si la voiture s'est arrêtée sur une erreur
+
+METRICS = ("score", "laps", "progress", "first_lap_s", "mean_lap_s", "collisions", "manoeuvres",
+           "sensor_faults", "distance_m", "sim_time_s", "error", "wall_time_s")
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text else value
+
+
+def parse_assignments(specs, separator):
+    """
+    Lit des arguments "réglage=valeurs" de la ligne de commande.
+
+    :param separator: "," pour une liste de valeurs, ":" pour une plage min:max.
+    :return: Dictionnaire {réglage: liste de nombres}.
+    :raises ValueError: Si un réglage est inconnu ou une valeur illisible.
+    """
+    result = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in PARAMETERS:
+            raise ValueError(f"Réglage inconnu : '{name}' (choix : {', '.join(PARAMETERS)}).")
+        try:
+            result[name] = [_number(value) for value in values.split(separator) if value]
+        except ValueError:
+            raise ValueError(f"Valeurs illisibles pour '{name}' : '{values}'.") from None
+        if not result[name]:
+            raise ValueError(f"Aucune valeur pour '{name}'.")
+    return result
+
+
+def grid_configs(grid):
+    """
+    Produit cartésien d'une grille.
+
+    :param grid: Dictionnaire {réglage: liste de valeurs}.
+    :return: Liste de dictionnaires {réglage: valeur}.
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def random_configs(count, ranges=None, seed=None):
+    """
+    Tirages uniformes dans les plages (entiers pour les réglages entiers par défaut).
+
+    :param ranges: Dictionnaire {réglage: (min, max)} ; SEARCH_RANGES par défaut.
+    :return: Liste de ``count`` dictionnaires {réglage: valeur}, valides pour Tuning.
+    """
+    ranges = SEARCH_RANGES if ranges is None else ranges
+    rng = random.Random(seed)
+    configs = []
+    attempts = 0
+    while len(configs) < count:
+        attempts += 1
+        if attempts > 100 * count:
+            raise ValueError("Plages incompatibles : trop peu de tirages valides.")
+        config = {}
+        for name, (low, high) in ranges.items():
+            if isinstance(DEFAULTS[name], int):
+                config[name] = rng.randint(math.ceil(low), math.floor(high))
+            else:
+                config[name] = round(rng.uniform(low, high), 3)
+        if not validate(dict(DEFAULTS, **config)):
+            configs.append(config)
+    return configs
+
+
+def score(metrics, duration):
+    """
+    Score d'une course (secondes, plus petit = meilleur) ; infini sans progression.
+    Une voiture arrêtée sur une erreur est comptée immobile jusqu'à la fin de la course.
+    """
+    if metrics["progress"] <= 0:
+        return math.inf
+    lap_time = max(metrics["sim_time_s"], duration) / metrics["progress"]
+    return (lap_time + COLLISION_PENALTY * metrics["collisions"] + MANOEUVRE_PENALTY * metrics["manoeuvres"]
+            + (ERROR_PENALTY if metrics["error"] else 0.0))
+
+
+def _evaluate(job):
+    """Course d'un jeu de réglages (exécutée dans un processus du pool)."""
+    config, options = job
+    metrics = simulate(config, **options)
+    metrics["score"] = score(metrics, options["duration"])
+    return config, metrics
+
+
+def run_sweep(configs, processes=None, track=None, duration=60.0, strategy="seuils", seed=0):
+    """
+    Évalue des jeux de réglages en parallèle.
+
+    :param configs: Liste de dictionnaires {réglage: valeur}.
+    :param processes: Nombre de processus (tous les cœurs par défaut).
+    :return: (résultats triés par score [(réglages, mesures)], nombre de jeux écartés car invalides).
+    """
+    valid = [config for config in configs if not validate(dict(DEFAULTS, **config))]
+    options = {"track": track, "duration": duration, "strategy": strategy, "seed": seed}
+    jobs = [(config, options) for config in valid]
+    with multiprocessing.Pool(processes) as pool:
+        results = list(pool.imap_unordered(_evaluate, jobs))
+    results.sort(key=lambda result: result[1]["score"])
+    return results, len(configs) - len(valid)
+
+
+def write_csv(results, path):
+    """Écrit les résultats (un jeu de réglages complet par ligne, mesures comprises)."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(PARAMETERS) + list(METRICS))
+        for config, metrics in results:
+            values = dict(DEFAULTS, **config)
+            writer.writerow([values[name] for name in PARAMETERS] + [metrics[name] for name in METRICS])
+
+
+def print_table(results, limit=10):
+    """Affiche les meilleurs jeux de réglages (réglages balayés et mesures principales)."""
+    names = sorted({name for config, _ in results for name in config}, key=list(PARAMETERS).index)
+    header = [f"{name:>{max(8, len(name))}}" for name in names]
+    print(" ".join(header + [f"{'score':>8}", f"{'tours':>6}", f"{'chocs':>6}", f"{'manœuv.':>8}", "erreur"]))
+    for config, metrics in results[:limit]:
+        row = [f"{config.get(name, DEFAULTS[name]):>{max(8, len(name))}}" for name in names]
+        print(" ".join(row + [f"{metrics['score']:>8.1f}", f"{metrics['progress']:>6.2f}", f"{metrics['collisions']:>6}",
+                              f"{metrics['manoeuvres']:>8}", metrics["error"] or ""]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Balayage parallèle des réglages de conduite en simulation.")
+    search = parser.add_mutually_exclusive_group(required=True)
+    search.add_argument("--grille", nargs="+", metavar="REGLAGE=V1,V2", help="Grille de valeurs par réglage.")
+    search.add_argument("--aleatoire", type=int, metavar="N", help="Nombre de tirages aléatoires.")
+    parser.add_argument("--plage", nargs="+", default=[], metavar="REGLAGE=MIN:MAX",
+                        help="Plages de la recherche aléatoire (seuls ces réglages sont alors tirés).")
+    parser.add_argument("--graine", type=int, default=0, help="Graine des tirages et du bruit des capteurs.")
+    parser.add_argument("--duree", type=float, default=60.0, help="Durée de chaque course (secondes simulées).")
+    parser.add_argument("--strategie", choices=("seuils", "fenetre_dynamique"), default="seuils")
+    parser.add_argument("--piste", default=None, help="Piste JSON (voir Simulation.Track.load) ; ovale par défaut.")
+    parser.add_argument("--processus", type=int, default=None, help="Nombre de processus (tous les cœurs par défaut).")
+    parser.add_argument("--sortie", default="balayage.csv", help="Fichier CSV des résultats.")
+    parser.add_argument("--afficher", type=int, default=10, help="Nombre de meilleurs jeux affichés.")
+    args = parser.parse_args()
+
+    try:
+        if args.grille:
+            configs = grid_configs(parse_assignments(args.grille, ","))
+        else:
+            ranges = {name: tuple(values) for name, values in parse_assignments(args.plage, ":").items()}
+            if any(len(values) != 2 for values in ranges.values()):
+                raise ValueError("Une plage s'écrit REGLAGE=MIN:MAX.")
+            configs = random_configs(args.aleatoire, ranges or None, seed=args.graine)
+    except ValueError as e:
+        parser.error(str(e))
+
+    track = Track.load(args.piste) if args.piste else Track.oval()
+    start = time.perf_counter()
+    results, rejected = run_sweep(configs, args.processus, track=track, duration=args.duree,
+                                  strategy=args.strategie, seed=args.graine)
+    elapsed = time.perf_counter() - start
+    write_csv(results, args.sortie)
+    print(f"{len(results)} courses de {args.duree:.0f} s simulées en {elapsed:.1f} s "
+          f"({args.processus or os.cpu_count()} processus, {rejected} jeux invalides écartés) -> {args.sortie}\n")
+    print_table(results, args.afficher)
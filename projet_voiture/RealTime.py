@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+RealTime.py
+-----------
+Ce module regroupe les réglages temps réel (optionnels) du thread de contrôle de la voiture :
+  - affinité CPU : le thread de contrôle est épinglé sur un cœur dédié (``os.sched_setaffinity``) ;
+  - ordonnancement temps réel : politique SCHED_FIFO ou SCHED_RR avec une priorité fixe
+    (``os.sched_setscheduler``), le thread passe alors devant les processus ordinaires ;
+  - verrouillage mémoire : ``mlockall`` évite qu'une page de la boucle soit évincée puis rechargée
+    au pire moment.
+
+Sous Linux, ces appels avec le pid 0 ne concernent que le thread appelant : ils doivent donc être
+faits depuis le thread de contrôle (voir ``ControllerCar.run``). Ils demandent en général les droits
+root (ou CAP_SYS_NICE / CAP_IPC_LOCK) : un réglage refusé est signalé puis ignoré, la voiture roule
+quand même.
+
+Le GIL reste partagé avec les autres threads Python du même processus (serveur web, surveillance
+RGB) : le gain est maximal combiné au mode multiprocessus (voir ControlProcess).
+
+LoopTimer cadence une boucle sur une horloge absolue et mesure la gigue (retard de réveil de chaque
+période) ; IterationTimer mesure celle d'une boucle non cadencée (écart des durées d'itération à
+leur médiane). Lancé directement, ce module compare la gigue avec et sans les réglages :
+
+    sudo python3 RealTime.py --cpu 3 --policy fifo --priority 50 --lock-memory --charge 4
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit les classes RealTimeConfig, LoopTimer et IterationTimer et la mesure comparative de la gigue.
+"""
+
+import argparse
+import ctypes
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+
+POLICIES = {"fifo": "SCHED_FIFO", "rr": "SCHED_RR"}
+
+# Drapeaux de mlockall (Linux)
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+
+class RealTimeConfig:
+    """
+    Réglages temps réel du thread de contrôle. Tous sont désactivés par défaut.
+    """
+
+    def __init__(self, cpu=None, policy=None, priority=50, lock_memory=False):
+        """
+        :param cpu: Cœur sur lequel épingler le thread de contrôle (None = pas d'affinité).
+        :param policy: "fifo" (SCHED_FIFO), "rr" (SCHED_RR) ou None (ordonnancement normal).
+        :param priority: Priorité temps réel (1 à 99 sous Linux).
+        :param lock_memory: Verrouille la mémoire du processus en RAM (mlockall).
+        :raises ValueError: Si un réglage est invalide.
+        """
+        if cpu is not None and not 0 <= cpu < (os.cpu_count() or 1):
+            raise ValueError(f"Cœur inexistant : {cpu} (cœurs disponibles : 0 à {(os.cpu_count() or 1) - 1}).")
+        if policy is not None and policy not in POLICIES:
+            raise ValueError(f"Politique inconnue : '{policy}' (choix : {', '.join(POLICIES)}).")
+        if policy is not None and not 1 <= priority <= 99:
+            raise ValueError("La priorité temps réel doit être comprise entre 1 et 99.")
+        self.cpu = cpu
+        self.policy = policy
+        self.priority = priority
+        self.lock_memory = lock_memory
+
+    @property
+    def enabled(self):
+        """True si au moins un réglage est demandé."""
+        return self.cpu is not None or self.policy is not None or self.lock_memory
+
+    def apply(self):
+        """
+        Applique les réglages au thread appelant.
+
+        :return: Dictionnaire {réglage: "ok" ou message d'erreur} des réglages demandés.
+        """
+        report = {}
+        if self.cpu is not None:
+            report["affinite"] = self._call("sched_setaffinity", 0, {self.cpu})
+        if self.policy is not None:
+            policy = getattr(os, POLICIES[self.policy], None)
+            if policy is None:
+                report["ordonnancement"] = "indisponible sur ce système"
+            else:
+                report["ordonnancement"] = self._call("sched_setscheduler", 0, policy, os.sched_param(self.priority))
+        if self.lock_memory:
+            report["memoire"] = self._lock_memory()
+        for setting, result in report.items():
+            if result == "ok":
+                print(f"⏱️ Temps réel : {setting} appliqué(e).")
+            else:
+                print(f"⚠️ Temps réel : {setting} ignoré(e) ({result}).")
+        return report
+
+    @staticmethod
+    def _call(name, *args):
+        function = getattr(os, name, None)
+        if function is None:
+            return "indisponible sur ce système"
+        try:
+            function(*args)
+        except OSError as e:
+            return str(e)
+        return "ok"
+
+    @staticmethod
+    def _lock_memory():
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+                return os.strerror(ctypes.get_errno())
+        except (OSError, AttributeError) as e:
+            return f"mlockall indisponible : {e}"
+        return "ok"
+
+    def __repr__(self):
+        return (f"RealTimeConfig(cpu={self.cpu!r}, policy={self.policy!r}, "
+                f"priority={self.priority!r}, lock_memory={self.lock_memory!r})")
+
+
+class LoopTimer:
+    """
+    Cadence une boucle sur une horloge absolue et mesure la gigue : le retard de réveil
+    par rapport à l'instant prévu de chaque période.
+    """
+
+    def __init__(self, period, history=1000, clock=time.monotonic, sleep=time.sleep):
+        """
+        :param period: Période de la boucle (secondes).
+        :param history: Nombre de retards conservés pour les statistiques.
+        :param clock: Horloge monotone (remplaçable pour les tests).
+        :param sleep: Fonction d'attente (remplaçable pour les tests).
+        """
+        if period <= 0:
+            raise ValueError("La période doit être supérieure à zéro.")
+        self.period = period
+        self.clock = clock
+        self.sleep = sleep
+        self.lateness = deque(maxlen=history)
+        self.overruns = 0
+        self._next = None
+
+    def restart(self):
+        """Repart de l'instant présent (après une manœuvre qui a interrompu la boucle)."""
+        self._next = self.clock()
+
+    def wait(self):
+        """Attend le début de la période suivante et enregistre le retard de réveil."""
+        if self._next is None:
+            self.restart()
+        self._next += self.period
+        remaining = self._next - self.clock()
+        if remaining > 0:
+            self.sleep(remaining)
+        else:
+            self.overruns += 1  # Le travail de la période a dépassé la période
+        self.lateness.append(max(0.0, self.clock() - self._next))
+
+    def report(self):
+        """
+        :return: Dictionnaire (nombre de périodes, retards moyen / p95 / p99 / maximal en ms, dépassements).
+        """
+        ordered = sorted(self.lateness)
+        count = len(ordered)
+        return {
+            "ticks": count,
+            "mean_late_ms": sum(ordered) / count * 1000 if count else 0.0,
+            "p95_late_ms": ordered[min(count - 1, int(0.95 * count))] * 1000 if count else 0.0,
+            "p99_late_ms": ordered[min(count - 1, int(0.99 * count))] * 1000 if count else 0.0,
+            "max_late_ms": ordered[-1] * 1000 if count else 0.0,
+            "overruns": self.overruns,
+        }
+
+
+class IterationTimer:
+    """
+    Mesure la gigue d'une boucle non cadencée (enchaînement d'itérations sans attente) : la durée
+    nominale d'une itération est la médiane des durées observées, et le retard d'une itération
+    est ce qu'elle dure au-delà de cette médiane. La durée propre du travail (lecture des
+    capteurs...) n'entre donc pas dans le retard, seule sa dispersion y entre.
+    """
+
+    def __init__(self, tolerance=0.02, history=1000, clock=time.monotonic):
+        """
+        :param tolerance: Retard (secondes) au-delà duquel une itération compte comme dépassement.
+        :param history: Nombre de durées conservées pour les statistiques.
+        :param clock: Horloge monotone (remplaçable pour les tests).
+        """
+        self.tolerance = tolerance
+        self.clock = clock
+        self.durations = deque(maxlen=history)
+        self._start = None
+
+    def restart(self):
+        """Repart de l'instant présent (après une manœuvre qui a interrompu la boucle)."""
+        self._start = self.clock()
+
+    def record(self):
+        """Termine l'itération en cours (durée enregistrée, sans attendre) et commence la suivante."""
+        now = self.clock()
+        if self._start is not None:
+            self.durations.append(now - self._start)
+        self._start = now
+
+    def report(self):
+        """
+        :return: Dictionnaire au format de LoopTimer.report (retards par rapport à la durée
+                 médiane), avec la durée médiane d'une itération en ms.
+        """
+        ordered = sorted(self.durations)
+        count = len(ordered)
+        median = (ordered[(count - 1) // 2] + ordered[count // 2]) / 2 if count else 0.0
+        late = [duration - median for duration in ordered if duration > median]
+        return {
+            "ticks": count,
+            "median_ms": median * 1000,
+            "mean_late_ms": sum(late) / count * 1000 if count else 0.0,
+            "p95_late_ms": max(0.0, ordered[min(count - 1, int(0.95 * count))] - median) * 1000 if count else 0.0,
+            "p99_late_ms": max(0.0, ordered[min(count - 1, int(0.99 * count))] - median) * 1000 if count else 0.0,
+            "max_late_ms": (ordered[-1] - median) * 1000 if count else 0.0,
+            "overruns": sum(1 for delay in late if delay > self.tolerance),
+        }
+
+
+def measure_jitter(config=None, period=0.01, duration=5.0):
+    """
+    Mesure la gigue d'une boucle périodique exécutée dans un nouveau thread,
+    avec les réglages ``config`` appliqués à ce thread (aucun si None).
+
+    :return: Rapport de LoopTimer, avec le résultat des réglages sous la clé "reglages".
+    """
+    result = {}
+
+    def loop():
+        result["reglages"] = config.apply() if config is not None else {}
+        timer = LoopTimer(period, history=int(duration / period) + 1)
+        end = time.monotonic() + duration
+        while time.monotonic() < end:
+            timer.wait()
+        result.update(timer.report())
+
+    thread = threading.Thread(target=loop, name="mesure_gigue")
+    thread.start()
+    thread.join()
+    return result
+
+
+def _busy(stop):
+    while not stop.is_set():
+        pass
+
+
+def compare_jitter(config, period=0.01, duration=5.0, load=0):
+    """
+    Mesure la gigue sans puis avec les réglages, éventuellement sous charge.
+
+    Les réglages d'ordonnancement ne concernent que le thread de mesure ; le verrouillage
+    mémoire, lui, reste actif pour le processus après la seconde mesure.
+
+    :param load: Nombre de processus qui occupent le CPU pendant les mesures.
+    :return: Dictionnaire {"sans": rapport, "avec": rapport}.
+    """
+    stop = multiprocessing.Event()
+    workers = [multiprocessing.Process(target=_busy, args=(stop,), daemon=True) for _ in range(load)]
+    for worker in workers:
+        worker.start()
+    try:
+        return {"sans": measure_jitter(None, period, duration), "avec": measure_jitter(config, period, duration)}
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare la gigue de la boucle de contrôle avec et sans réglages temps réel.")
+    parser.add_argument("--cpu", type=int, default=None, help="Cœur dédié au thread de contrôle.")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default=None, help="Politique temps réel.")
+    parser.add_argument("--priority", type=int, default=50, help="Priorité temps réel (1 à 99).")
+    parser.add_argument("--lock-memory", action="store_true", help="Verrouille la mémoire (mlockall).")
+    parser.add_argument("--period", type=float, default=0.01, help="Période de la boucle (secondes).")
+    parser.add_argument("--duration", type=float, default=5.0, help="Durée de chaque mesure (secondes).")
+    parser.add_argument("--charge", type=int, default=0, help="Nombre de processus de charge CPU.")
+    args = parser.parse_args()
+
+    config = RealTimeConfig(cpu=args.cpu, policy=args.policy, priority=args.priority, lock_memory=args.lock_memory)
+    reports = compare_jitter(config, period=args.period, duration=args.duration, load=args.charge)
+    print(f"\nGigue d'une boucle de {args.period * 1000:.1f} ms ({args.charge} processus de charge) :")
+    print(f"{'':>6} {'moyenne':>9} {'p95':>9} {'p99':>9} {'max':>9} {'dépass.':>8}")
+    for label, report in reports.items():
+        print(f"{label:>6} {report['mean_late_ms']:>7.3f}ms {report['p95_late_ms']:>7.3f}ms "
+              f"{report['p99_late_ms']:>7.3f}ms {report['max_late_ms']:>7.3f}ms {report['overruns']:>8}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+SensorSnapshot.py
+-----------------
+Ce module définit l'instantané des trois capteurs de distance transmis le long du chemin de décision.
+
+Une mesure filtrée coûte environ 50 ms par capteur : la boucle de contrôle mesure une seule fois,
+puis passe l'instantané (immuable et horodaté) aux gestionnaires d'obstacles. Une nouvelle lecture
+n'est faite que si l'instantané est plus vieux que l'âge maximal toléré par l'appelant
+(voir ``ControllerCar.refresh_snapshot``), par exemple après une marche arrière.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la classe SensorSnapshot.
+"""
+
+import time
+from collections import namedtuple
+
+SENSORS = ("front", "left", "right")
+
+
+class SensorSnapshot(namedtuple("SensorSnapshot", ("front", "left", "right", "timestamps"))):
+    """
+    Distances (en cm) des capteurs avant, gauche et droit, avec l'instant (time.monotonic())
+    de chaque mesure. Immuable : une mise à jour produit un nouvel instantané.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def measure(cls, read, sensors=SENSORS, base=None, clock=time.monotonic):
+        """
+        Construit un instantané en mesurant les capteurs demandés ; les autres valeurs sont
+        reprises de ``base``.
+
+        :param read: Fonction nom du capteur -> distance en cm.
+        :param sensors: Capteurs à mesurer.
+        :param base: Instantané précédent (obligatoire si tous les capteurs ne sont pas mesurés).
+        :param clock: Horloge monotone.
+        """
+        if base is None and set(sensors) != set(SENSORS):
+            raise ValueError("Un instantané partiel nécessite un instantané de base.")
+        values = base.distances() if base is not None else {}
+        timestamps = dict(zip(SENSORS, base.timestamps)) if base is not None else {}
+        for sensor in sensors:
+            if sensor not in SENSORS:
+                raise ValueError(f"Capteur inconnu : '{sensor}'")
+            values[sensor] = read(sensor)
+            timestamps[sensor] = clock()
+        return cls(values["front"], values["left"], values["right"], tuple(timestamps[s] for s in SENSORS))
+
+    def distances(self):
+        """Retourne les distances sous forme de dictionnaire {"front", "left", "right"}."""
+        return {"front": self.front, "left": self.left, "right": self.right}
+
+    def age(self, sensors=SENSORS, now=None):
+        """Âge (secondes) de la plus ancienne des mesures demandées."""
+        now = time.monotonic() if now is None else now
+        return now - min(self.timestamps[SENSORS.index(sensor)] for sensor in sensors)
+
+    def is_fresh(self, max_age, sensors=SENSORS, now=None):
+        """True si les mesures demandées ont au plus ``max_age`` secondes."""
+        return self.age(sensors, now) <= max_age
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Simulation.py
+-------------
+Ce module fait rouler la logique de conduite de ControllerCar (boucle ``run``, gestion des
+obstacles, manœuvres, estimation, grille d'occupation) dans un monde simulé, en temps virtuel :
+une minute de conduite se simule en une fraction de seconde.
+
+  - Track : la piste, des murs en segments (mètres). ``Track.oval`` construit un circuit
+    rectangulaire avec des obstacles ; ``Track.load`` lit une piste relevée sur le vrai circuit
+    (fichier JSON).
+  - SimulatedWorld : modèle cinématique de la voiture (réponse du premier ordre de la vitesse,
+    modèle bicyclette, rotation sur place), collisions, comptage des tours et capteurs à ultrasons
+    (cône de lancers de rayons, bruit gaussien). Il sert aussi de monde simulé au backend
+    matériel "simulation" (``distance(echo)``, ``line(pin)``, ``color()``).
+  - SimulatedCar : ControllerCar dont les moteurs, le servo et le chien de garde sont simulés ;
+    les capteurs sont de vrais CapteurDistance sur le backend "simulation". L'horloge et les
+    attentes de la boucle de contrôle sont celles du monde simulé.
+  - ``simulate`` : une course complète et ses mesures (tours, collisions, manœuvres...).
+
+Repère du monde : x vers la droite, y vers le haut, cap en degrés (positif vers la gauche) ;
+un tour est compté à chaque révolution complète autour du centre de la piste, dans le sens
+trigonométrique.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit les classes Track, SimulatedWorld et SimulatedCar et la fonction simulate.
+"""
+
+import json
+import math
+import os
+import random
+import time
+from contextlib import redirect_stdout
+
+import Hardware
+from CapteurDistance import CapteurDistance, OK
+from ControllerCar import ControllerCar
+from ControllerServo import ABSOLUTE_CENTER, RELATIVE_RANGE
+from Tuning import TuningConfig
+
+# Capteurs : (trigger, echo) de ControllerCar, orientation (degrés, positif vers la gauche)
+# et distance du capteur au centre de la voiture (mètres)
+SENSORS = {
+    "front": ((6, 5), 0.0, 0.10),
+    "left": ((26, 19), 90.0, 0.07),
+    "right": ((11, 9), -90.0, 0.07),
+}
+ECHO_PINS = {pins[1]: sensor for sensor, (pins, _, _) in SENSORS.items()}
+
+CONTACT_HYSTERESIS = 0.02  # Dégagement (m) qui termine un contact avec un mur
+
+
+class Track:
+    """
+    Piste : murs (segments) et position de départ.
+    """
+
+    def __init__(self, walls, start, center, name="piste"):
+        """
+        :param walls: Liste de segments (x1, y1, x2, y2) en mètres.
+        :param start: Position de départ (x, y, cap en degrés).
+        :param center: Centre (x, y) autour duquel les tours sont comptés.
+        :param name: Nom de la piste.
+        """
+        if not walls:
+            raise ValueError("Une piste doit contenir au moins un mur.")
+        self.walls = [tuple(float(v) for v in wall) for wall in walls]
+        self.start = tuple(float(v) for v in start)
+        self.center = tuple(float(v) for v in center)
+        self.name = name
+
+    @staticmethod
+    def _rectangle(x0, y0, x1, y1):
+        return [(x0, y0, x1, y0), (x1, y0, x1, y1), (x1, y1, x0, y1), (x0, y1, x0, y0)]
+
+    @classmethod
+    def oval(cls, width=6.0, height=4.0, lane=1.2, obstacles=((3.0, 3.55, 0.3), (5.6, 2.0, 0.3))):
+        """
+        Circuit rectangulaire : un couloir de largeur ``lane`` autour d'un îlot central.
+
+        :param obstacles: Obstacles carrés (x, y, côté) posés dans le couloir.
+        """
+        if not 0 < 2 * lane < min(width, height):
+            raise ValueError("Le couloir doit être plus étroit que la moitié de la piste.")
+        walls = cls._rectangle(0, 0, width, height) + cls._rectangle(lane, lane, width - lane, height - lane)
+        for x, y, size in obstacles:
+            walls += cls._rectangle(x - size / 2, y - size / 2, x + size / 2, y + size / 2)
+        return cls(walls, start=(lane, lane / 2, 0.0), center=(width / 2, height / 2), name="ovale")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Lit une piste JSON : {"walls": [[x1, y1, x2, y2], ...], "start": [x, y, cap], "center": [x, y]}.
+        """
+        with open(path, "r") as f:
+            content = json.load(f)
+        return cls(content["walls"], content["start"], content["center"],
+                   name=content.get("name", os.path.splitext(os.path.basename(path))[0]))
+
+    def raycast(self, x, y, angle, max_range):
+        """
+        Distance (mètres) du premier mur dans la direction ``angle`` (radians), ou None au-delà de ``max_range``.
+        """
+        dx, dy = math.cos(angle), math.sin(angle)
+        nearest = max_range
+        for x1, y1, x2, y2 in self.walls:
+            ex, ey = x2 - x1, y2 - y1
+            denominator = dx * ey - dy * ex
+            if abs(denominator) < 1e-12:
+                continue  # Rayon parallèle au mur
+            wx, wy = x1 - x, y1 - y
+            t = (wx * ey - wy * ex) / denominator
+            u = (wx * dy - wy * dx) / denominator
+            if 0 <= t < nearest and 0 <= u <= 1:
+                nearest = t
+        return None if nearest >= max_range else nearest
+
+    def clearance(self, x, y):
+        """Distance (mètres) du point (x, y) au mur le plus proche."""
+        nearest = math.inf
+        for x1, y1, x2, y2 in self.walls:
+            ex, ey = x2 - x1, y2 - y1
+            length = ex * ex + ey * ey
+            u = 0.0 if length == 0 else max(0.0, min(1.0, ((x - x1) * ex + (y - y1) * ey) / length))
+            nearest = min(nearest, math.hypot(x - x1 - u * ex, y - y1 - u * ey))
+        return nearest
+
+
+class SimulatedWorld:
+    """
+    Voiture simulée sur une piste, en temps virtuel.
+    """
+
+    def __init__(self, track, max_speed=2.0, time_constant=0.3, wheelbase=0.15, spin_rate=180.0, radius=0.1,
+                 max_range=4.0, beam_width=15.0, sensor_noise=0.5, step=0.01, seed=0):
+        """
+        :param track: Piste (Track).
+        :param max_speed: Vitesse à pleine commande (m/s).
+        :param time_constant: Constante de temps de la réponse des moteurs (s).
+        :param wheelbase: Empattement (m) du modèle bicyclette.
+        :param spin_rate: Vitesse de rotation sur place à pleine commande (degrés/s).
+        :param radius: Rayon de l'encombrement de la voiture (m) pour les collisions.
+        :param max_range: Portée des capteurs à ultrasons (m).
+        :param beam_width: Demi-angle du cône des capteurs (degrés).
+        :param sensor_noise: Écart type du bruit des capteurs (cm).
+        :param step: Pas d'intégration (s).
+        :param seed: Graine du bruit des capteurs (simulation reproductible).
+        """
+        if time_constant <= 0 or wheelbase <= 0 or step <= 0:
+            raise ValueError("La constante de temps, l'empattement et le pas doivent être supérieurs à zéro.")
+        self.track = track
+        self.max_speed = max_speed
+        self.time_constant = time_constant
+        self.wheelbase = wheelbase
+        self.spin_rate = spin_rate
+        self.radius = radius
+        self.max_range = max_range
+        self.beam_width = math.radians(beam_width)
+        self.sensor_noise = sensor_noise
+        self.step = step
+        self.rng = random.Random(seed)
+
+        self.time = 0.0
+        self.x, self.y, heading = track.start
+        self.heading = math.radians(heading)
+        self.speed = 0.0      # Vitesse réelle (m/s)
+        self.command = 0.0    # Commande moteur (-100 à 100)
+        self.spin = False
+        self.steering = 0.0   # Angle relatif des roues (degrés, positif vers la droite)
+        self.collisions = 0
+        self.odometer = 0.0
+        self.progress = 0.0   # Tours parcourus autour du centre (fraction comprise)
+        self.lap_times = []
+        self._contact = False
+        self._angle = self._center_angle()
+
+    def clock(self):
+        """Horloge virtuelle (secondes)."""
+        return self.time
+
+    def _center_angle(self):
+        return math.atan2(self.y - self.track.center[1], self.x - self.track.center[0])
+
+    def advance(self, duration):
+        """Fait avancer la simulation de ``duration`` secondes (fonction d'attente de la voiture)."""
+        end = self.time + max(0.0, duration)
+        while end - self.time > 1e-9:
+            self._integrate(min(self.step, end - self.time))
+        # Instant exact : l'ordonnanceur des manœuvres compare l'horloge à des échéances absolues
+        self.time = max(self.time, end)
+
+    def _integrate(self, dt):
+        target = 0.0 if self.spin else self.command * self.max_speed / 100
+        self.speed += (1.0 - math.exp(-dt / self.time_constant)) * (target - self.speed)
+        if self.spin:
+            # Rotation sur place : vitesse positive vers la droite (sens horaire)
+            self.heading -= math.radians(self.spin_rate * self.command / 100) * dt
+        else:
+            self.heading -= self.speed * math.tan(math.radians(self.steering)) / self.wheelbase * dt
+            x = self.x + self.speed * math.cos(self.heading) * dt
+            y = self.y + self.speed * math.sin(self.heading) * dt
+            clearance = self.track.clearance(x, y)
+            if clearance < self.radius:
+                # Choc : la voiture reste bloquée contre le mur
+                if not self._contact:
+                    self.collisions += 1
+                self._contact = True
+                self.speed = 0.0
+            else:
+                if clearance > self.radius + CONTACT_HYSTERESIS:
+                    self._contact = False  # Un frottement le long du mur ne compte qu'une fois
+                self.odometer += math.hypot(x - self.x, y - self.y)
+                self.x, self.y = x, y
+        self.time += dt
+
+        angle = self._center_angle()
+        self.progress += ((angle - self._angle + math.pi) % (2 * math.pi) - math.pi) / (2 * math.pi)
+        self._angle = angle
+        if self.progress >= len(self.lap_times) + 1:
+            self.lap_times.append(self.time)
+
+    def measure(self, sensor):
+        """
+        Mesure d'un capteur à ultrasons : écho le plus proche dans son cône.
+
+        :return: Distance (mètres) ou None sans écho.
+        """
+        _, direction, offset = SENSORS[sensor]
+        angle = self.heading + math.radians(direction)
+        x, y = self.x + offset * math.cos(angle), self.y + offset * math.sin(angle)
+        echoes = [self.track.raycast(x, y, angle + delta, self.max_range)
+                  for delta in (-self.beam_width, 0.0, self.beam_width)]
+        echoes = [echo for echo in echoes if echo is not None]
+        if not echoes:
+            return None
+        return max(0.0, min(echoes) + self.rng.gauss(0.0, self.sensor_noise / 100))
+
+    # Interface du monde simulé du backend matériel "simulation" (voir Hardware)
+
+    def distance(self, echo):
+        return self.measure(ECHO_PINS[echo])
+
+    def line(self, pin):
+        return False
+
+    def color(self):
+        return (0, 0, 0, 0)
+
+
+class SimulatedMotor:
+    """Moteurs simulés (interface de ControllerMotor utilisée par ControllerCar)."""
+
+    def __init__(self, world):
+        self.world = world
+
+    @property
+    def commanded_speed(self):
+        return 0.0 if self.world.spin else self.world.command
+
+    def _command(self, speed, spin=False):
+        self.world.command = max(-100.0, min(100.0, speed))
+        self.world.spin = spin
+
+    def forward(self, speed=100):
+        self._command(speed)
+
+    def backward(self, speed=-100):
+        if speed >= 0:
+            raise ValueError("La vitesse doit être négative pour le mouvement arrière")
+        self._command(speed)
+
+    def spin(self, speed=100):
+        self._command(speed, spin=True)
+
+    def stop(self, immediate=False):
+        self._command(0)
+
+    def reset_after_emergency_stop(self):
+        self._command(0)
+
+
+class SimulatedServo:
+    """Servo de direction simulé (interface de ControllerServo utilisée par ControllerCar)."""
+
+    def __init__(self, world):
+        self.world = world
+        self.current_angle = 0
+
+    def setToDegree(self, angle):
+        angle = max(0, min(180, angle))
+        self.current_angle = max(-RELATIVE_RANGE, min(RELATIVE_RANGE, angle - ABSOLUTE_CENTER))
+        self.world.steering = self.current_angle
+
+    def rotate(self, angle):
+        self.current_angle = max(-RELATIVE_RANGE, min(RELATIVE_RANGE, angle))
+        self.world.steering = self.current_angle
+
+    def disable_pwm(self):
+        pass  # Servo relâché : les roues gardent leur position
+
+
+class SimulatedWatchdog:
+    """Chien de garde simulé : met fin à la boucle de contrôle à la fin de la course."""
+
+    def __init__(self, world, duration):
+        self.world = world
+        self.duration = duration
+
+    @property
+    def tripped(self):
+        return self.world.time >= self.duration
+
+    def arm(self):
+        pass
+
+    def disarm(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def feed(self):
+        pass
+
+
+class SimulatedSensor:
+    """
+    Capteur à ultrasons réel (CapteurDistance, filtrage et erreurs compris) sur le backend
+    "simulation" ; chaque lecture fait avancer le temps virtuel de sa durée sur la voiture.
+    """
+
+    def __init__(self, world, trigger, echo, read_time=0.05):
+        self.world = world
+        self.read_time = read_time
+        # Délai minimal entre échantillons : l'attente réelle est négligeable, le temps virtuel
+        # avance de ``read_time`` par lecture
+        self.capteur = CapteurDistance(trigger=trigger, echo=echo, sensor_sample_delay=1e-6)
+
+    @property
+    def range(self):
+        return self.capteur.range
+
+    @property
+    def counts(self):
+        return self.capteur.counts
+
+    def read(self, sample_count=None):
+        count = self.capteur.sensor_sample_count if sample_count is None else sample_count
+        self.world.advance(self.read_time * count / self.capteur.sensor_sample_count)
+        return self.capteur.read(count)
+
+    def get_distance(self):
+        self.world.advance(self.read_time)
+        return self.capteur.get_distance()
+
+
+class SimulatedCar(ControllerCar):
+    """
+    ControllerCar dans un monde simulé, avec des réglages de conduite donnés.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)  # Une voiture par simulation (pas de singleton)
+
+    def __init__(self, world, values=None, duration=60.0, strategy="seuils", read_time=0.05):
+        """
+        :param world: Monde simulé (SimulatedWorld), déjà sélectionné sur le backend "simulation".
+        :param values: Réglages de conduite à appliquer (voir Tuning), validés.
+        :param duration: Durée de la course (secondes virtuelles).
+        :param strategy: Stratégie de conduite ("seuils" ou "fenetre_dynamique").
+        :param read_time: Durée d'une mesure filtrée d'un capteur (secondes virtuelles).
+        :raises ValueError: Si les réglages sont invalides.
+        """
+        self.world = world
+        self.tuning = TuningConfig(path=None)
+        if values:
+            self.tuning.update(values)
+            self.tuning.poll()
+        self.capteur_left, self.capteur_right, self.capteur_front = (
+            SimulatedSensor(world, *SENSORS[sensor][0], read_time=read_time) for sensor in ("left", "right", "front"))
+        self.motor_ctrl = SimulatedMotor(world)
+        self.servo_ctrl = SimulatedServo(world)
+        self._init_control(clock=world.clock, sleep=world.advance)
+        self.watchdog = SimulatedWatchdog(world, duration)
+        self.set_strategy(strategy)
+        self._initialized = True
+
+
+def simulate(values=None, track=None, duration=60.0, strategy="seuils", seed=0, read_time=0.05, **world_options):
+    """
+    Simule une course et retourne ses mesures.
+
+    Le backend matériel du processus passe sur "simulation" (à appeler dans un processus dédié
+    ou à remettre sur "reel" ensuite). Les messages de la voiture sont masqués.
+
+    :param values: Réglages de conduite (voir Tuning) ; les valeurs par défaut sinon.
+    :param track: Piste (Track.oval() par défaut).
+    :param duration: Durée de la course (secondes virtuelles).
+    :param world_options: Paramètres du modèle (voir SimulatedWorld).
+    :return: Dictionnaire (tours, temps du premier tour et temps moyen, progression, collisions,
+             manœuvres, mesures hors plage ou sans écho, distance parcourue, durée simulée, erreur
+             ayant arrêté la voiture, durée de calcul).
+    """
+    world = SimulatedWorld(track if track is not None else Track.oval(), seed=seed, **world_options)
+    Hardware.select("simulation", world=world)
+    start = time.perf_counter()
+    car = SimulatedCar(world, values, duration=duration, strategy=strategy, read_time=read_time)
+    error = None
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        try:
+            car.run()
+        except (ValueError, RuntimeError) as e:
+            error = str(e)  # Même comportement que la vraie voiture : la boucle s'arrête
+    laps = world.lap_times
+    return {
+        "laps": len(laps),
+        "first_lap_s": laps[0] if laps else None,
+        "mean_lap_s": laps[-1] / len(laps) if laps else None,
+        "progress": world.progress,
+        "collisions": world.collisions,
+        "manoeuvres": sum(car.manoeuvres.counts.values()),
+        "sensor_faults": sum(count for counts in car.get_sensor_counts().values()
+                             for status, count in counts.items() if status != OK),
+        "distance_m": world.odometer,
+        "sim_time_s": world.time,
+        "error": error,
+        "wall_time_s": time.perf_counter() - start,
+    }
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+SpeedEstimator.py
+-----------------
+Ce module estime la vitesse réelle, le cap et la distance parcourue par la voiture.
+
+L'estimation fusionne deux sources :
+  - la commande réellement appliquée aux moteurs (rampes comprises), convertie en vitesse par un
+    modèle calibré (gain et zone morte) avec un retard du premier ordre (inertie de la voiture) ;
+  - la variation de la distance mesurée par le capteur avant, lorsqu'un obstacle fixe est visible.
+
+La fusion est un filtre de Kalman à une dimension : la variance de l'estimation donne un indice
+de confiance publié avec la vitesse. L'écart durable entre le modèle et les mesures (batterie
+faible, sol glissant...) est appris sous forme d'un facteur de rendement appliqué au modèle.
+Le cap est intégré avec un modèle bicyclette à partir de l'angle des roues.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la classe SpeedEstimator (vitesse estimée, confiance et odométrie).
+"""
+
+import math
+import threading
+import time
+
+import numpy as np
+
+
+class SpeedEstimator:
+    """
+    Estimateur de vitesse et d'odométrie (vitesse en m/s, distances en mètres, cap en radians).
+    """
+
+    def __init__(self, gain=0.02, dead_band=0.0, time_constant=0.3, wheelbase=0.15,
+                 process_noise=0.5, distance_noise=0.01, max_measure_distance=3.5, max_measure_dt=0.3,
+                 adaptation_rate=0.05):
+        """
+        :param gain: Vitesse (m/s) par point de commande au-delà de la zone morte.
+        :param dead_band: Commande (%) en dessous de laquelle la voiture ne bouge pas.
+        :param time_constant: Constante de temps de la réponse en vitesse (secondes).
+        :param wheelbase: Empattement de la voiture (mètres), pour le calcul du cap.
+        :param process_noise: Incertitude ajoutée au modèle ((m/s)² par seconde).
+        :param distance_noise: Écart-type d'une mesure de distance avant (mètres).
+        :param max_measure_distance: Au-delà de cette distance, le capteur avant n'est pas utilisé.
+        :param max_measure_dt: Deux mesures plus espacées que ce délai ne donnent pas de vitesse.
+        :param adaptation_rate: Vitesse d'apprentissage du facteur de rendement (0 : désactivé).
+        """
+        if gain <= 0 or time_constant <= 0 or wheelbase <= 0:
+            raise ValueError("Le gain, la constante de temps et l'empattement doivent être supérieurs à zéro.")
+        if not 0 <= dead_band < 100:
+            raise ValueError("La zone morte doit être comprise entre 0 et 100.")
+        self.gain = gain
+        self.dead_band = dead_band
+        self.time_constant = time_constant
+        self.wheelbase = wheelbase
+        self.process_noise = process_noise
+        self.distance_noise = distance_noise
+        self.max_measure_distance = max_measure_distance
+        self.max_measure_dt = max_measure_dt
+        self.adaptation_rate = adaptation_rate
+        self.efficiency = 1.0  # Conservé par reset() : c'est une calibration, pas un état
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Remet la vitesse et l'odométrie à zéro (voiture à l'arrêt)."""
+        with self._lock:
+            self.speed = 0.0
+            self.variance = 0.0
+            self.heading = 0.0
+            self.odometer = 0.0
+            self.x = 0.0
+            self.y = 0.0
+            self.rejected = 0
+            self._last_time = None
+            self._last_front = None
+
+    def model_speed(self, command):
+        """
+        Vitesse en régime établi pour une commande moteur donnée (modèle gain + zone morte).
+
+        :param command: Commande moteur signée (-100 à 100).
+        """
+        magnitude = abs(command) - self.dead_band
+        if magnitude <= 0:
+            return 0.0
+        return math.copysign(self.gain * magnitude, command)
+
+    def fit_model(self, commands, speeds):
+        """
+        Calibre le modèle à partir de couples (commande, vitesse mesurée) en régime établi,
+        par régression linéaire sur les points où la voiture roule.
+
+        :param commands: Commandes moteur (%).
+        :param speeds: Vitesses mesurées correspondantes (m/s).
+        :return: Tuple (gain, zone morte).
+        """
+        commands = np.abs(np.asarray(commands, dtype=float))
+        speeds = np.abs(np.asarray(speeds, dtype=float))
+        moving = speeds > 0
+        if np.count_nonzero(moving) < 2:
+            raise ValueError("Il faut au moins deux mesures avec la voiture en mouvement.")
+        slope, intercept = np.polyfit(commands[moving], speeds[moving], 1)
+        if slope <= 0:
+            raise ValueError("Mesures incohérentes : la vitesse doit croître avec la commande.")
+        self.gain = float(slope)
+        self.dead_band = float(min(99.0, max(0.0, -intercept / slope)))
+        return self.gain, self.dead_band
+
+    def update(self, command, steering_angle=0.0, front_distance=None, timestamp=None):
+        """
+        Intègre un nouveau pas de temps.
+
+        :param command: Commande moteur réellement appliquée (-100 à 100).
+        :param steering_angle: Angle relatif des roues (degrés, positif vers la droite).
+        :param front_distance: Distance mesurée à l'avant (mètres) ou None si indisponible.
+        :param timestamp: Instant de la mesure (time.monotonic() par défaut).
+        :return: État estimé (voir ``state()``).
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        with self._lock:
+            if self._last_time is None:
+                self._last_time = now
+                self._remember_front(front_distance, now)
+                return self._state()
+            dt = now - self._last_time
+            if dt <= 0:
+                return self._state()
+            self._last_time = now
+
+            # Prédiction : réponse du premier ordre vers la vitesse du modèle
+            alpha = 1.0 - math.exp(-dt / self.time_constant)
+            predicted = self.efficiency * self.model_speed(command)
+            self.speed += alpha * (predicted - self.speed)
+            self.variance += self.process_noise * dt
+
+            # Correction : vitesse déduite de la variation de distance avant
+            measured = self._front_speed(front_distance, now)
+            if measured is not None:
+                speed_measure, measure_dt = measured
+                noise = 2 * self.distance_noise ** 2 / measure_dt ** 2
+                innovation = speed_measure - self.speed
+                if innovation ** 2 <= 9 * (self.variance + noise):
+                    k = self.variance / (self.variance + noise)
+                    self.speed += k * innovation
+                    self.variance *= 1 - k
+                    # Apprentissage du rendement en régime établi (vitesse proche du modèle)
+                    if abs(predicted) > 0 and abs(self.speed - predicted) < 0.5 * abs(predicted):
+                        ratio = speed_measure / predicted * self.efficiency
+                        self.efficiency += self.adaptation_rate * (ratio - self.efficiency)
+                        self.efficiency = min(2.0, max(0.2, self.efficiency))
+                else:
+                    # Obstacle mobile ou nouvel obstacle : la mesure est ignorée
+                    self.rejected += 1
+            self._remember_front(front_distance, now)
+
+            # Odométrie (modèle bicyclette)
+            self.heading += self.speed * math.tan(math.radians(steering_angle)) / self.wheelbase * dt
+            self.odometer += abs(self.speed) * dt
+            self.x += self.speed * math.cos(self.heading) * dt
+            self.y += self.speed * math.sin(self.heading) * dt
+            return self._state()
+
+    def _front_speed(self, front_distance, now):
+        """Vitesse d'approche de l'obstacle avant (m/s), ou None si la mesure n'est pas exploitable."""
+        if front_distance is None or self._last_front is None:
+            return None
+        last_distance, last_time = self._last_front
+        measure_dt = now - last_time
+        if not 0 < measure_dt <= self.max_measure_dt:
+            return None
+        if max(front_distance, last_distance) > self.max_measure_distance:
+            return None
+        return (last_distance - front_distance) / measure_dt, measure_dt
+
+    def _remember_front(self, front_distance, now):
+        if front_distance is not None:
+            self._last_front = (front_distance, now)
+
+    def confidence(self):
+        """Indice de confiance de la vitesse estimée, entre 0 (inconnue) et 1 (certaine)."""
+        with self._lock:
+            return self._confidence()
+
+    def _confidence(self):
+        return 1.0 / (1.0 + math.sqrt(self.variance) / (self.gain * 10))
+
+    def state(self):
+        """
+        Retourne l'état estimé sous forme de dictionnaire :
+        vitesse (m/s), confiance (0 à 1), rendement du modèle, cap (degrés), distance parcourue
+        et position (mètres).
+        """
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        return {
+            "speed": self.speed,
+            "confidence": self._confidence(),
+            "efficiency": self.efficiency,
+            "heading": math.degrees(self.heading),
+            "odometer": self.odometer,
+            "x": self.x,
+            "y": self.y,
+        }
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Trajectory.py
+-------------
+Ce module précompile une manœuvre (ex : le tour en 8) en une table de consignes horodatées
+servo/moteur, puis la rejoue sur une horloge absolue.
+
+  - La compilation évalue les fonctions de consigne une seule fois, arrondit les valeurs à l'entier
+    et ne conserve que les instants où une sortie change : aucune écriture inutile sur le bus I²C.
+  - La lecture vise des instants absolus (départ + t) : un retard ponctuel n'est pas reporté sur
+    les consignes suivantes, la manœuvre garde sa durée et sa forme.
+  - Le retard de chaque consigne par rapport au planning est mesuré et résumé dans un rapport.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la classe Trajectory (compilation et lecture de consignes horodatées).
+"""
+
+import threading
+import time
+
+
+class Trajectory:
+    """
+    Table de consignes horodatées : liste de tuples (t, angle servo, vitesse moteur),
+    où None signifie "sortie inchangée".
+    """
+
+    def __init__(self, setpoints, duration):
+        """
+        :param setpoints: Liste de tuples (t en secondes, angle ou None, vitesse ou None), triée par t.
+        :param duration: Durée totale de la manœuvre (secondes).
+        """
+        if any(b[0] < a[0] for a, b in zip(setpoints, setpoints[1:])):
+            raise ValueError("Les consignes doivent être triées par instant croissant.")
+        self.setpoints = list(setpoints)
+        self.duration = duration
+        self.last_report = None
+
+    @classmethod
+    def compile(cls, duration, dt, servo=None, motor=None):
+        """
+        Précalcule une manœuvre.
+
+        :param duration: Durée de la manœuvre (secondes).
+        :param dt: Pas d'échantillonnage des fonctions de consigne (secondes).
+        :param servo: Fonction t -> angle absolu du servo (degrés), ou None.
+        :param motor: Fonction t -> vitesse moteur (-100 à 100), ou None.
+        :return: Instance de Trajectory ne contenant que les changements de sortie.
+        """
+        if duration <= 0 or dt <= 0:
+            raise ValueError("La durée et le pas doivent être supérieurs à zéro.")
+        setpoints = []
+        last_angle = last_speed = None
+        for i in range(int(round(duration / dt))):
+            t = i * dt
+            angle = None if servo is None else int(round(servo(t)))
+            speed = None if motor is None else int(round(motor(t)))
+            new_angle = angle if angle != last_angle else None
+            new_speed = speed if speed != last_speed else None
+            if new_angle is not None or new_speed is not None:
+                setpoints.append((t, new_angle, new_speed))
+                last_angle, last_speed = angle, speed
+        return cls(setpoints, duration)
+
+    def __len__(self):
+        return len(self.setpoints)
+
+    def play(self, apply_servo=None, apply_motor=None, stop_event=None, spin=0.001,
+             clock=time.perf_counter, sleep=time.sleep):
+        """
+        Rejoue la table sur une horloge absolue.
+
+        :param apply_servo: Fonction appelée avec chaque nouvel angle.
+        :param apply_motor: Fonction appelée avec chaque nouvelle vitesse.
+        :param stop_event: threading.Event permettant d'interrompre la lecture (optionnel).
+        :param spin: Dernière portion d'attente faite en boucle active (secondes) pour la précision.
+        :param clock: Horloge utilisée (remplaçable pour les tests).
+        :param sleep: Fonction d'attente utilisée (remplaçable pour les tests).
+        :return: Rapport de précision (voir ``timing_report``).
+        """
+        stop_event = stop_event or threading.Event()
+        lateness = []
+        start = clock()
+        for t, angle, speed in self.setpoints:
+            if stop_event.is_set():
+                break
+            self._wait_until(start + t, spin, clock, sleep)
+            lateness.append(clock() - (start + t))
+            if angle is not None and apply_servo is not None:
+                apply_servo(angle)
+            if speed is not None and apply_motor is not None:
+                apply_motor(speed)
+        if not stop_event.is_set():
+            self._wait_until(start + self.duration, spin, clock, sleep)
+        self.last_report = self.timing_report(lateness, clock() - start - self.duration)
+        return self.last_report
+
+    @staticmethod
+    def _wait_until(deadline, spin, clock, sleep):
+        """Attend l'instant absolu ``deadline`` : sommeil, puis boucle active sur la fin."""
+        remaining = deadline - clock()
+        if remaining > spin:
+            sleep(remaining - spin)
+        while clock() < deadline:
+            pass
+
+    @staticmethod
+    def timing_report(lateness, duration_error):
+        """
+        Résume la précision de la lecture.
+
+        :param lateness: Retards de chaque consigne par rapport au planning (secondes).
+        :param duration_error: Écart entre la durée réelle et la durée prévue (secondes).
+        :return: Dictionnaire (nombre d'écritures, retards moyen / p95 / maximal en ms, écart de durée en ms).
+        """
+        ordered = sorted(lateness)
+        count = len(ordered)
+        return {
+            "writes": count,
+            "mean_late_ms": sum(ordered) / count * 1000 if count else 0.0,
+            "p95_late_ms": ordered[min(count - 1, int(0.95 * count))] * 1000 if count else 0.0,
+            "max_late_ms": ordered[-1] * 1000 if count else 0.0,
+            "duration_error_ms": duration_error * 1000,
+        }
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Tuning.py
+---------
+Ce module gère les réglages de conduite de ControllerCar (seuils, angles de virage, durées des
+manœuvres, vitesses) dans un fichier JSON modifiable pendant que la voiture roule.
+
+  - Le fichier ne contient que les valeurs à changer : les autres gardent leur valeur par défaut.
+  - Toute modification (fichier édité à la main ou ``update`` depuis le serveur web) est validée
+    en entier (types, bornes, cohérence entre réglages) ; un jeu invalide est refusé et les
+    réglages en cours sont conservés.
+  - La boucle de contrôle appelle ``poll`` entre deux itérations : le nouveau jeu est alors
+    appliqué en une fois, jamais au milieu d'une décision ou d'une manœuvre.
+
+Le serveur web et la voiture peuvent vivre dans deux processus (mode multiprocessus) : le
+fichier sert alors de canal, la voiture surveillant sa date de modification. L'instance du
+serveur web (``polled=False``) n'est jamais interrogée par ``poll`` : ses modifications sont
+donc appliquées dès l'écriture du fichier. Chaque ``update`` et ``describe`` relit d'abord le
+fichier s'il a changé, pour ne jamais écraser une modification faite à la main.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit la classe TuningConfig et la description des réglages (PARAMETERS).
+"""
+
+import json
+import os
+import threading
+import time
+
+DEFAULT_TUNING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tuning.json")
+
+# Réglage -> (valeur par défaut, minimum, maximum, description)
+PARAMETERS = {
+    "side_threshold": (12, 1, 200, "Seuil pour obstacles latéraux (cm)"),
+    "front_threshold": (41, 1, 400, "Seuil pour alerte obstacle frontal (cm)"),
+    "emergency_threshold": (40, 1, 400, "Seuil pour urgence obstacle frontal (cm)"),
+    "angle_virage_gauche": (-30, -90, 0, "Braquage du virage à gauche (degrés, relatif au centre)"),
+    "angle_virage_droite": (30, 0, 90, "Braquage du virage à droite (degrés, relatif au centre)"),
+    "angle_central": (45, 0, 90, "Position centrale du servo (degrés)"),
+    "duree_virage": (0.4, 0, 5, "Durée d'un virage (s)"),
+    "duree_marche_arriere": (0.35, 0, 5, "Durée d'une marche arrière (s)"),
+    "reverse_pause": (0.5, 0, 5, "Arrêt avant la marche arrière (s)"),
+    "motor_speed_forwards": (35, 0, 100, "Vitesse en marche avant (0 à 100)"),
+    "motor_speed_backwards": (40, 0, 100, "Vitesse en marche arrière (0 à 100)"),
+}
+
+DEFAULTS = {name: spec[0] for name, spec in PARAMETERS.items()}
+
+
+def validate(values):
+    """
+    Vérifie un jeu complet de réglages.
+
+    :param values: Dictionnaire {réglage: valeur}.
+    :return: Liste des erreurs (vide si le jeu est valide).
+    """
+    errors = []
+    for name, value in values.items():
+        if name not in PARAMETERS:
+            errors.append(f"Réglage inconnu : '{name}'.")
+            continue
+        _, minimum, maximum, _ = PARAMETERS[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            errors.append(f"'{name}' doit être un nombre, pas {value!r}.")
+        elif not minimum <= value <= maximum:
+            errors.append(f"'{name}' doit être compris entre {minimum} et {maximum} (reçu : {value}).")
+    if errors:
+        return errors
+    if values["emergency_threshold"] > values["front_threshold"]:
+        errors.append("'emergency_threshold' ne peut pas dépasser 'front_threshold'.")
+    if not 0 <= values["angle_central"] + values["angle_virage_gauche"]:
+        errors.append("Le virage à gauche dépasse la butée du servo (angle_central + angle_virage_gauche < 0).")
+    if not values["angle_central"] + values["angle_virage_droite"] <= 90:
+        errors.append("Le virage à droite dépasse la butée du servo (angle_central + angle_virage_droite > 90).")
+    return errors
+
+
+class TuningConfig:
+    """
+    Réglages de conduite validés, rechargeables à chaud.
+    """
+
+    def __init__(self, path=DEFAULT_TUNING_PATH, check_interval=0.5, clock=time.monotonic, polled=True):
+        """
+        :param path: Chemin du fichier JSON des réglages (absent = valeurs par défaut), ou None
+                     pour des réglages en mémoire seulement (simulation).
+        :param check_interval: Intervalle minimal (s) entre deux vérifications du fichier par ``poll``.
+        :param clock: Horloge monotone (remplaçable pour les tests).
+        :param polled: False si aucune boucle de contrôle n'appelle ``poll`` sur cette instance
+                       (serveur web d'un autre processus) : les modifications ne restent pas en attente.
+        """
+        self.path = path
+        self.polled = polled
+        self.check_interval = check_interval
+        self.clock = clock
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._pending = None
+        self._next_check = 0.0
+        self._mtime = self._file_mtime()
+        self.values = dict(DEFAULTS)
+        loaded = self._read_file()
+        if loaded is not None:
+            self.values = loaded
+
+    def _file_mtime(self):
+        if self.path is None:
+            return None
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_file(self):
+        """
+        Lit et valide le fichier.
+
+        :return: Jeu complet de réglages, ou None si le fichier est absent ou refusé (``last_error``).
+        """
+        if self.path is None:
+            return None
+        try:
+            with open(self.path, "r") as f:
+                content = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self._refuse([f"Fichier de réglages illisible : {e}"])
+            return None
+        if not isinstance(content, dict):
+            self._refuse(["Le fichier de réglages doit contenir un objet JSON."])
+            return None
+        values = dict(DEFAULTS)
+        values.update(content)
+        errors = validate(values)
+        if errors:
+            self._refuse(errors)
+            return None
+        self.last_error = None
+        return values
+
+    def _reload_if_changed(self):
+        """
+        Relit le fichier s'il a été modifié depuis la dernière lecture ou écriture (verrou détenu).
+        Le jeu relu est mis en attente pour ``poll``, ou appliqué si l'instance n'est pas interrogée.
+        """
+        mtime = self._file_mtime()
+        if mtime is None or mtime == self._mtime:
+            return
+        self._mtime = mtime
+        loaded = self._read_file()
+        if loaded is None:
+            return
+        if self.polled:
+            self._pending = loaded
+        else:
+            self.values = loaded
+
+    def _refuse(self, errors):
+        self.last_error = errors
+        print(f"⚠️ Réglages refusés, les valeurs en cours sont conservées : {' '.join(errors)}")
+
+    def update(self, changes, save=True):
+        """
+        Valide des modifications et les prépare pour la prochaine itération de la boucle de contrôle.
+
+        :param changes: Dictionnaire {réglage: nouvelle valeur}.
+        :param save: Écrit aussi le fichier (réglages conservés au prochain démarrage).
+        :return: Jeu complet de réglages qui sera appliqué.
+        :raises ValueError: Si les modifications sont invalides (message listant les erreurs).
+        """
+        if not isinstance(changes, dict):
+            raise ValueError("Les réglages doivent être un dictionnaire {réglage: valeur}.")
+        with self._lock:
+            self._reload_if_changed()
+            values = dict(self._pending if self._pending is not None else self.values)
+            values.update(changes)
+            errors = validate(values)
+            if errors:
+                raise ValueError(" ".join(errors))
+            if save and self.path is not None:
+                self._save(values)
+            if self.polled:
+                self._pending = values
+            else:
+                self.values = values
+            self.last_error = None
+            return dict(values)
+
+    def _save(self, values):
+        """Écrit le fichier de façon atomique (fichier temporaire puis renommage)."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(values, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._mtime = self._file_mtime()  # Notre propre écriture n'est pas un changement à recharger
+
+    def poll(self):
+        """
+        À appeler entre deux itérations de la boucle de contrôle : applique le dernier jeu
+        validé (``update`` ou fichier modifié depuis la dernière vérification).
+
+        :return: Dictionnaire des réglages qui ont changé, ou None.
+        """
+        now = self.clock()
+        if self._pending is None and now >= self._next_check:
+            self._next_check = now + self.check_interval
+            with self._lock:
+                self._reload_if_changed()
+        if self._pending is None:
+            return None
+        with self._lock:
+            values, self._pending = self._pending, None
+        changes = {name: value for name, value in values.items() if self.values[name] != value}
+        self.values = values
+        return changes or None
+
+    def describe(self):
+        """
+        :return: Dictionnaire (valeurs, y compris celles en attente d'application, bornes et
+                 description de chaque réglage, dernière erreur).
+        """
+        with self._lock:
+            self._reload_if_changed()
+            pending = self._pending
+        return {
+            "values": dict(pending if pending is not None else self.values),
+            "pending": pending is not None,
+            "parameters": {name: {"default": default, "min": minimum, "max": maximum, "description": description}
+                           for name, (default, minimum, maximum, description) in PARAMETERS.items()},
+            "error": self.last_error,
+        }
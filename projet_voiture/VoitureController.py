@@ -1,7 +1,9 @@
 from ControllerMotor import ControllerMotor
-import RPi.GPIO as GPIO
+from Hardware import lazy
 import time
 
+GPIO = lazy("RPi.GPIO")
+
 class VoitureController:
     def __init__(self, duration=10, speed=100):
         self.duration = duration
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Watchdog.py
+-----------
+Ce module surveille la boucle de contrôle de la voiture et coupe les moteurs si elle se bloque
+(bus I²C figé dans ``PWM._write_byte_data``, attente trop longue...). Sans lui, les moteurs gardent
+indéfiniment leur dernière commande.
+
+  - La boucle de contrôle signale qu'elle est vivante avec ``Watchdog.feed()`` (simple affectation,
+    sans verrou : elle ne peut jamais bloquer la boucle).
+  - Un thread de surveillance compare l'âge du dernier signal à l'échéance. En cas de dépassement,
+    il déclenche le chemin d'arrêt d'urgence puis enregistre l'événement (retard constaté et durée
+    de l'arrêt).
+  - Le chemin d'arrêt (EmergencyStop) est préparé à l'avance avec son propre accès au bus I²C :
+    il n'utilise ni les verrous de ControllerMotor ni ceux du moteur de rampes, qui peuvent être
+    détenus par le thread bloqué. Il écrit en un seul bloc les registres ALL_LED du PCA9685 avec le
+    bit « toujours éteint » : toutes les sorties (moteurs et servo) sont coupées. Juste avant, il
+    fige le moteur de rampes (simple drapeau, sans verrou) pour qu'aucune écriture ne suive l'arrêt.
+
+Auteur : Vergeylen Anthony
+Date   : 19-10-2026
+Quoi   : Fournit les classes EmergencyStop et Watchdog.
+"""
+
+import threading
+import time
+from collections import deque
+
+from Hardware import lazy
+
+smbus = lazy("smbus")
+
+# Registres et bits du PCA9685 (voir PWM.py)
+MODE1 = 0x00
+ALL_LED_ON_L = 0xFA
+AUTO_INCREMENT = 0x20
+RESTART = 0x80
+FULL_OFF = 0x10  # Bit 4 de LEDn_OFF_H : sortie toujours éteinte
+
+# ALL_LED_ON_L, ALL_LED_ON_H, ALL_LED_OFF_L, ALL_LED_OFF_H
+ALL_OFF_BLOCK = [0x00, 0x00, 0x00, FULL_OFF]
+
+
+class EmergencyStop:
+    """
+    Chemin d'arrêt d'urgence préconstruit : un accès SMBus dédié et un bloc d'octets prêt à écrire.
+    """
+
+    def __init__(self, bus_number=1, address=0x40, bus=None, halt=None):
+        """
+        À créer après l'initialisation des PWM (PWM.__init__ réécrit MODE1).
+
+        :param bus_number: Numéro du bus I²C du PCA9685.
+        :param address: Adresse I²C du PCA9685.
+        :param bus: Accès SMBus déjà ouvert (remplaçable pour les tests).
+        :param halt: Appelé sans verrou juste avant l'arrêt pour figer les écritures des
+                     contrôleurs (ControllerMotor.halt) : sans lui, le moteur de rampes
+                     réécrirait son ancienne consigne par-dessus le FULL_OFF.
+        """
+        self.address = address
+        self.halt = halt
+        self.bus = bus if bus is not None else smbus.SMBus(bus_number)
+        # L'écriture en bloc nécessite l'auto-incrément des registres (MODE1.AI) ; la valeur
+        # est calculée maintenant pour ne faire aucune lecture au moment de l'arrêt.
+        self._mode1 = (self.bus.read_byte_data(address, MODE1) | AUTO_INCREMENT) & ~RESTART
+        self.bus.write_byte_data(address, MODE1, self._mode1)
+
+    def trigger(self):
+        """
+        Coupe toutes les sorties du PCA9685.
+
+        :return: Durée de l'arrêt (secondes).
+        """
+        start = time.perf_counter()
+        if self.halt is not None:
+            self.halt()
+        # MODE1 est réaffirmé : une autre instance de PWM a pu effacer l'auto-incrément
+        self.bus.write_byte_data(self.address, MODE1, self._mode1)
+        self.bus.write_i2c_block_data(self.address, ALL_LED_ON_L, ALL_OFF_BLOCK)
+        return time.perf_counter() - start
+
+
+class Watchdog:
+    """
+    Surveillance de l'échéance de la boucle de contrôle.
+    """
+
+    def __init__(self, stop_path, deadline=0.5, period=0.02, on_trip=None, history=100, clock=time.monotonic):
+        """
+        :param stop_path: Fonction d'arrêt d'urgence (par exemple EmergencyStop.trigger).
+        :param deadline: Âge maximal du dernier signal de vie (secondes).
+        :param period: Période de vérification (secondes).
+        :param on_trip: Fonction appelée après l'arrêt (remise en cohérence des contrôleurs).
+        :param history: Nombre d'événements conservés.
+        :param clock: Horloge monotone (remplaçable pour les tests).
+        """
+        if deadline <= 0 or period <= 0:
+            raise ValueError("L'échéance et la période doivent être supérieures à zéro.")
+        self.stop_path = stop_path
+        self.deadline = deadline
+        self.period = period
+        self.on_trip = on_trip
+        self.clock = clock
+        self.events = deque(maxlen=history)
+        self.missed = 0
+        self.tripped = False
+        self._armed = False
+        self._last = clock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="watchdog", daemon=True)
+        self._thread.start()
+
+    def arm(self):
+        """Active la surveillance (début de la boucle de contrôle) et efface un déclenchement précédent."""
+        self._last = self.clock()
+        self.tripped = False
+        self._armed = True
+
+    def clear(self):
+        """Efface un déclenchement : les commandes moteur sont de nouveau acceptées."""
+        self.tripped = False
+
+    def disarm(self):
+        """Suspend la surveillance (fin de la boucle de contrôle)."""
+        self._armed = False
+
+    def feed(self):
+        """Signal de vie de la boucle de contrôle."""
+        self._last = self.clock()
+
+    def check(self):
+        """
+        Vérifie l'échéance et déclenche l'arrêt si elle est dépassée.
+
+        :return: True si l'arrêt vient d'être déclenché.
+        """
+        if not self._armed or self.tripped:
+            return False
+        late = self.clock() - self._last
+        if late <= self.deadline:
+            return False
+        self.tripped = True
+        self.missed += 1
+        event = {"timestamp": time.time(), "late_s": late, "stop_latency_ms": None, "error": None}
+        try:
+            event["stop_latency_ms"] = self.stop_path() * 1000
+        except Exception as e:
+            event["error"] = str(e)
+        self.events.append(event)
+        if event["error"] is None:
+            print(f"🚨 Watchdog : boucle de contrôle muette depuis {late * 1000:.0f} ms, "
+                  f"moteurs coupés en {event['stop_latency_ms']:.2f} ms.")
+        else:
+            print(f"🚨 Watchdog : boucle de contrôle muette depuis {late * 1000:.0f} ms, "
+                  f"échec de l'arrêt d'urgence : {event['error']}")
+        if self.on_trip is not None:
+            self.on_trip()
+        return True
+
+    def _loop(self):
+        while not self._stop.wait(self.period):
+            self.check()
+
+    def report(self):
+        """
+        :return: Dictionnaire (échéances manquées, durées d'arrêt moyenne / maximale en ms, derniers événements).
+        """
+        latencies = [e["stop_latency_ms"] for e in self.events if e["stop_latency_ms"] is not None]
+        return {
+            "missed": self.missed,
+            "mean_stop_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+            "max_stop_ms": max(latencies) if latencies else 0.0,
+            "events": list(self.events),
+        }
+
+    def close(self):
+        """Arrête le thread de surveillance."""
+        self._stop.set()
+        self._thread.join()
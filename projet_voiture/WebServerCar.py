@@ -8,7 +8,8 @@ Les actions possibles incluent :
   - 'avancer' : Faire avancer la voiture en mode simple via VoitureController.
   - 'reset'   : (Non implémenté pour l'instant)
 
-De plus, une API est fournie pour obtenir dynamiquement les mesures des capteurs de distance et la vitesse.
+De plus, une API est fournie pour obtenir dynamiquement les mesures des capteurs de distance et la vitesse,
+et pour lire ou modifier à chaud les réglages de conduite (/api/config, voir Tuning).
 
 Auteur : Anthony Vergeylen
 Date   : 08-04-2025
@@ -17,12 +18,12 @@ Quoi   : Permet de contrôler la voiture via une interface web et d'accéder aux
 
 from flask import Flask, render_template, request, redirect, url_for, jsonify
 import threading
-import RPi.GPIO as GPIO
 from ControllerCar import ControllerCar
 from VoitureController import VoitureController
 
 class VoitureServer:
-    def __init__(self, host='0.0.0.0', port=5000, autonomous_controller=None, car_launcher=None):
+    def __init__(self, host='0.0.0.0', port=5000, autonomous_controller=None, car_launcher=None, rgb_sensor=None,
+                 basic_controller=None, tuning=None):
         """
         Initialise le serveur web pour contrôler la voiture.
         Permet de lancer le contrôle autonome via ControllerCar ou d'avancer la voiture en mode simple.
@@ -32,23 +33,32 @@ class VoitureServer:
         :param port: Port du serveur (par défaut 5000).
         :param autonomous_controller: Instance de ControllerCar pour le contrôle autonome.
         :param car_launcher: Instance de CarLauncher qui permet de lancer le contrôle autonome.
+        :param rgb_sensor: Instance de CapteurRGB dont la télémétrie est exposée (optionnel).
+        :param basic_controller: Contrôleur du mode simple (par défaut un VoitureController ;
+                                 en mode multiprocessus, le ControllerProxy).
+        :param tuning: Réglages de conduite (TuningConfig) exposés par /api/config ; par défaut ceux
+                       du contrôleur autonome (en mode multiprocessus, une instance sur le même fichier).
 
         """
         self.host = host
         self.port = port
         self.app = Flask(__name__, template_folder='templates')
         self.car_launcher = car_launcher
+        self.rgb_sensor = rgb_sensor
         if autonomous_controller is None:
             self.autonomous_controller = ControllerCar()
         else:
             self.autonomous_controller = autonomous_controller
-        self.basic_controller = VoitureController()
+        self.basic_controller = basic_controller if basic_controller is not None else VoitureController()
+        self.tuning = tuning if tuning is not None else getattr(self.autonomous_controller, "tuning", None)
         self._setup_routes()
 
     def _setup_routes(self):
         self.app.add_url_rule('/', view_func=self.index)
         self.app.add_url_rule('/action', view_func=self.handle_action, methods=['POST'])
         self.app.add_url_rule('/api/distances', view_func=self.api_distances, methods=['GET'])
+        self.app.add_url_rule('/api/rgb', view_func=self.api_rgb, methods=['GET'])
+        self.app.add_url_rule('/api/config', view_func=self.api_config, methods=['GET', 'POST'])
 
     def index(self):
         return render_template('web.html')
@@ -84,14 +94,40 @@ class VoitureServer:
 
     def api_distances(self):
         distances = self.autonomous_controller.get_distances()
-        speed = self.autonomous_controller.get_speed()
+        estimate = self.autonomous_controller.get_speed_estimate()
         return jsonify({
             "front": distances["front"],
             "left": distances["left"],
             "right": distances["right"],
-            "speed": speed
+            "speed": estimate["speed"],
+            "speed_confidence": estimate["confidence"],
+            "heading": estimate["heading"],
+            "odometer": estimate["odometer"]
         })
 
+    def api_rgb(self):
+        if self.rgb_sensor is None:
+            return jsonify({"error": "Capteur RGB non disponible"}), 404
+        return jsonify(self.rgb_sensor.get_telemetry())
+
+    def api_config(self):
+        """
+        GET : réglages de conduite (valeurs, bornes, dernière erreur).
+        POST : objet JSON {réglage: valeur} ; validé puis appliqué par la boucle de contrôle
+        à sa prochaine itération, sans l'arrêter.
+        """
+        if self.tuning is None:
+            return jsonify({"error": "Réglages non disponibles"}), 404
+        if request.method == 'GET':
+            return jsonify(self.tuning.describe())
+        changes = request.get_json(silent=True)
+        try:
+            values = self.tuning.update(changes)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        print(f"🔧 Réglages modifiés via l'interface web : {changes}")
+        return jsonify({"values": values})
+
     def run(self):
         print(f"🌐 Lancement du serveur web sur {self.host}:{self.port}")
         self.app.run(host=self.host, port=self.port)
\ No newline at end of file
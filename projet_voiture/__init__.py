@@ -0,0 +1,18 @@
+"""
+Paquet projet_voiture.
+
+Les modules du projet s'importent entre eux par leur nom (``from ControllerMotor import ...``) :
+le dossier du paquet est donc ajouté au chemin d'import, ce qui permet aussi de les utiliser
+depuis ``projet_voiture.X`` (tests, CheckSensorBeforeRace).
+"""
+
+import os
+import sys
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+if _PACKAGE_DIR not in sys.path:
+    sys.path.append(_PACKAGE_DIR)
+
+# Un seul état de sélection du backend matériel, quel que soit le nom d'import utilisé
+import Hardware  # noqa: E402
+sys.modules[__name__ + ".Hardware"] = Hardware
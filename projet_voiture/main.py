@@ -20,6 +20,11 @@ from CapteurRGB import CapteurRGB
 # from LineFollower import LineFollower
 from CarLauncher import CarLauncher
 from Logging import Logging
+from CalibrationCache import CalibrationCache
+from BootSequence import BootSequence
+from ControlProcess import ControlProcess
+from Tuning import TuningConfig
+import Hardware
 
 class MainController:
     """
@@ -31,36 +36,115 @@ class MainController:
     QUI: Vergeylen Anthony
     QUOI: Initialise et démarre en parallèle l'ensemble des composants du système.
     """
-    def __init__(self):
-
+    def __init__(self, fast_start=False, rgb_interrupt_pin=None, rgb_auto_range=False, use_calibration_cache=True,
+                 fast_boot=False, strategy="seuils", multiprocess=False, realtime=None,
+                 hardware=None):
+        """
+        :param fast_start: Active la surveillance RGB à faible latence (départ rapide).
+        :param rgb_interrupt_pin: Broche GPIO reliée à la sortie INT du TCS34725 (None = scrutation).
+        :param rgb_auto_range: Active l'auto-calibre (gain et temps d'intégration) du capteur RGB.
+        :param use_calibration_cache: Réutilise les calibrations enregistrées si elles sont encore valides.
+        :param fast_boot: Démarrage rapide : saute le balayage des roues (elles sont toujours centrées).
+        :param strategy: Stratégie de conduite autonome ("seuils" ou "fenetre_dynamique").
+        :param multiprocess: Exécute la boucle de contrôle dans un processus séparé du serveur web et
+                             de la surveillance RGB (télémétrie et commandes en mémoire partagée).
+        :param realtime: Réglages temps réel du thread de contrôle (RealTimeConfig : cœur dédié,
+                         SCHED_FIFO/SCHED_RR, verrouillage mémoire), ou None.
+        :param hardware: Backend matériel ("reel", "mock" ; voir Hardware), ou None pour garder
+                         celui de la variable d'environnement VOITURE_MATERIEL.
+        """
+        self.boot_start = time.perf_counter()
+        if hardware is not None:
+            Hardware.select(hardware)
         self.logger = Logging()
-
-        # Création d'une seule instance de ControllerCar (Singleton)
-        self.car_controller = ControllerCar()
-        self.car_launcher = CarLauncher(self.car_controller)
-
-        self.rgb_sensor = CapteurRGB(threshold=5, integration_time=100, calibration_duration=5)
-
-        self.web_server = VoitureServer(host='0.0.0.0', port=5000, autonomous_controller=self.car_controller, car_launcher=self.car_launcher)
+        self.calibration_cache = CalibrationCache() if use_calibration_cache else None
+        self.fast_start = fast_start
+        self.rgb_interrupt_pin = rgb_interrupt_pin
+        self.strategy = strategy
+        self.realtime = realtime
+        self.fast_boot = fast_boot
+        self.control_process = None
+
+        # Graphe d'initialisation : le capteur RGB (et sa calibration) s'initialise en parallèle
+        # de la voiture ; le serveur web crée son propre accès au PCA9685 et attend donc la voiture,
+        # et les roues ne sont positionnées qu'une fois le serveur web créé.
+        boot = BootSequence("MainController", logger=self.logger)
+        if multiprocess:
+            # La voiture vit dans le processus de contrôle ; ici, un ControllerProxy la représente
+            # (il sert aussi de lanceur et de contrôleur simple pour le serveur web).
+            boot.add("voiture", self._start_control_process)
+            boot.add("lanceur", lambda: boot.result("voiture"), depends_on=["voiture"])
+        else:
+            # Création d'une seule instance de ControllerCar (Singleton)
+            boot.add("voiture", self._init_car)
+            boot.add("lanceur", lambda: CarLauncher(boot.result("voiture")), depends_on=["voiture"])
+        boot.add("capteur_rgb", lambda: CapteurRGB(threshold=5, integration_time=100, calibration_duration=5,
+                                                   auto_range=rgb_auto_range))
+        boot.add("calibration_rgb", lambda: self.calibrate_rgb(boot.result("capteur_rgb")), depends_on=["capteur_rgb"])
+        boot.add("serveur_web", lambda: VoitureServer(host='0.0.0.0', port=5000,
+                                                      autonomous_controller=boot.result("voiture"),
+                                                      car_launcher=boot.result("lanceur"),
+                                                      rgb_sensor=boot.result("capteur_rgb"),
+                                                      basic_controller=boot.result("voiture") if multiprocess else None,
+                                                      tuning=TuningConfig(polled=False) if multiprocess else None),
+                 depends_on=["lanceur", "capteur_rgb"])
+        if not multiprocess:
+            # En mode multiprocessus, le processus de contrôle positionne lui-même les roues
+            # Essentielle : le démarrage rapide centre toujours les roues et ne saute que le balayage.
+            # Après le serveur web : son contrôleur réinitialise le PCA9685 partagé, ce qui ne doit
+            # tomber ni pendant le balayage ni après le centrage.
+            boot.add("roues", lambda: self._init_wheels(boot.result("voiture"), sweep=not fast_boot),
+                     depends_on=["voiture", "serveur_web"])
+        boot.run(fast=fast_boot)
+
+        self.car_controller = boot.result("voiture")
+        self.car_launcher = boot.result("lanceur")
+        self.rgb_sensor = boot.result("capteur_rgb")
+        self.web_server = boot.result("serveur_web")
 
         # self.line_follower = LineFollower()
 
+    def _init_car(self):
+        car_controller = ControllerCar()
+        car_controller.calibration_cache = self.calibration_cache
+        car_controller.set_strategy(self.strategy)
+        car_controller.realtime = self.realtime
+        return car_controller
+
+    def _start_control_process(self):
+        self.control_process = ControlProcess(strategy=self.strategy,
+                                              use_calibration_cache=self.calibration_cache is not None,
+                                              fast_boot=self.fast_boot,
+                                              realtime=self.realtime)
+        proxy = self.control_process.start()
+        self.logger.log(f"Processus de contrôle lancé (pid {self.control_process.process.pid}).", "lancement_voiture", "INFO")
+        return proxy
+
+    def _init_wheels(self, car_controller, sweep=True):
         self.logger.log("Mise en position initiale des roues (45°).", "lancement_voiture", "INFO")
-        self.car_controller.servo_ctrl.setToDegree(self.car_controller.angle_central)
-        time.sleep(0.3)
-        self.car_controller.servo_ctrl.setToDegree(0)
-        time.sleep(0.3)
-        self.car_controller.servo_ctrl.setToDegree(self.car_controller.angle_central)
-        time.sleep(0.3)
-        self.car_controller.servo_ctrl.setToDegree(90)
-        time.sleep(0.3)
-        self.car_controller.servo_ctrl.setToDegree(self.car_controller.angle_central)
-        time.sleep(0.3)
-        self.car_controller.servo_ctrl.disable_pwm()
+        if car_controller.init_servo(sweep=sweep):
+            self.logger.log("Position du servo reprise du cache : balayage évité.", "lancement_voiture", "INFO")
+
+    def calibrate_rgb(self, rgb_sensor):
+        """
+        Calibre le capteur RGB, sauf si le cache contient une calibration valide pour la
+        configuration actuelle et qu'une lecture rapide de contrôle la confirme.
+        """
+        if self.calibration_cache is not None:
+            data = self.calibration_cache.get("rgb", expected={
+                "threshold": rgb_sensor.threshold,
+                "auto_range": rgb_sensor.auto_range is not None,
+            })
+            if data is not None and rgb_sensor.import_calibration(data) and rgb_sensor.check_calibration():
+                self.logger.log("Calibration RGB reprise du cache.", "lancement_voiture", "INFO")
+                return
+        rgb_sensor.calibrate()
+        if self.calibration_cache is not None:
+            self.calibration_cache.put("rgb", rgb_sensor.export_calibration())
 
     def start_services(self):
-        # Calibration du capteur RGB
-        self.rgb_sensor.calibrate()
+        # La calibration RGB a été faite (ou reprise du cache) pendant l'initialisation
+        self.logger.log(f"Voiture prête en {time.perf_counter() - self.boot_start:.2f} s.", "lancement_voiture", "INFO")
 
         # Démarrage du serveur web dans un thread séparé
         server_thread = threading.Thread(target=self.web_server.run)
@@ -69,7 +153,11 @@ class MainController:
         self.logger.log("Serveur web lancé.", "lancement_voiture", "INFO")
 
         # Démarrage de la surveillance RGB dans un thread séparé
-        sensor_thread = threading.Thread(target=self.rgb_sensor.monitor, args=(self.car_launcher,))
+        if self.fast_start:
+            sensor_thread = threading.Thread(target=self.rgb_sensor.monitor_fast_start, args=(self.car_launcher,),
+                                             kwargs={"interrupt_pin": self.rgb_interrupt_pin})
+        else:
+            sensor_thread = threading.Thread(target=self.rgb_sensor.monitor, args=(self.car_launcher,))
         sensor_thread.daemon = True
         sensor_thread.start()
         self.logger.log("Surveillance RGB lancée.", "lancement_voiture", "INFO")
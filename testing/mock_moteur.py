@@ -27,8 +27,9 @@ class TestMotorController(unittest.TestCase):
             sys.path.insert(0, parent_dir)
         
         # Importer après avoir mocké les modules
-        from projet_voiture.ControllerMotor import ControllerMotor
+        from projet_voiture.ControllerMotor import ControllerMotor, MotorLUT
         self.ControllerMotor = ControllerMotor
+        self.MotorLUT = MotorLUT
         
         # Créer une instance du contrôleur
         self.controller = self.ControllerMotor()
@@ -67,6 +68,122 @@ class TestMotorController(unittest.TestCase):
         self.controller._ControllerMotor__pwm_controller.write.assert_any_call(4, 0, 0)
         self.controller._ControllerMotor__pwm_controller.write.assert_any_call(5, 0, 0)
 
+    def test_forward_partial_speed_is_integer(self):
+        """
+        Teste qu'une vitesse partielle donne une valeur PWM entière issue de la table.
+        """
+        self.controller.forward(35)
+        self.controller._ControllerMotor__pwm_controller.write.assert_any_call(4, 0, 1433)
+
+    def test_dead_band_lut(self):
+        """
+        Teste la compensation de zone morte : toute vitesse non nulle démarre au-dessus de la zone morte,
+        la table est monotone et la vitesse 0 reste à 0.
+        """
+        lut = self.MotorLUT(dead_band=800)
+        self.assertEqual(lut.duty(0), 0)
+        self.assertEqual(lut.duty(1), 800 + 33)
+        self.assertEqual(lut.duty(100), 4095)
+        self.assertEqual(lut.duty(-100), -4095)
+        self.assertEqual(lut.duty(150), 4095)
+        self.assertEqual(lut.table, sorted(lut.table))
+
+    def test_spin(self):
+        """
+        Teste la rotation sur place : même valeur PWM sur les deux moteurs, sens opposés.
+        """
+        self.controller.spin(50)
+        self.controller._ControllerMotor__pwm_controller.write.assert_any_call(4, 0, 2048)
+        self.controller._ControllerMotor__pwm_controller.write.assert_any_call(5, 0, 2048)
+
+    def ramp_controller(self, **kwargs):
+        """
+        Contrôleur avec moteur de rampes sur une horloge simulée : la période du thread est
+        assez longue pour qu'il ne s'exécute pas pendant le test, les rampes avancent par
+        ``update_ramps`` quand l'horloge avance.
+        """
+        self.now = 0.0
+        controller = self.ControllerMotor(ramp=True, tick=3600, clock=lambda: self.now, **kwargs)
+        self.addCleanup(controller.close)
+        return controller
+
+    def advance(self, controller, dt):
+        self.now += dt
+        controller.update_ramps()
+
+    def test_ramp_progressive_acceleration(self):
+        """
+        Teste le moteur de rampes : la consigne est atteinte progressivement, par pas
+        limités par l'accélération maximale.
+        """
+        controller = self.ramp_controller(acceleration=100)
+        controller.forward(50)
+        self.assertEqual(controller.commanded_speed, 0)
+        self.advance(controller, 0.1)
+        self.assertAlmostEqual(controller.commanded_speed, 10)
+        for _ in range(10):
+            self.advance(controller, 0.1)
+        self.assertAlmostEqual(controller.commanded_speed, 50)
+        self.assertEqual(controller.commanded_duty, (2048, 2048))
+
+    def test_ramp_reversal_brakes_through_zero(self):
+        """
+        Teste qu'une inversion de sens passe par zéro puis par une phase de freinage
+        avant d'accélérer dans l'autre sens.
+        """
+        controller = self.ramp_controller(acceleration=1000, deceleration=1000, brake_time=10)
+        controller.forward(50)
+        self.advance(controller, 0.1)
+        self.assertAlmostEqual(controller.commanded_speed, 50)
+        controller.backward(-50)
+        self.advance(controller, 0.1)
+        self.assertEqual(controller.commanded_speed, 0)
+        self.advance(controller, 0.1)
+        self.assertEqual(controller.commanded_speed, 0)  # maintien à l'arrêt
+        controller.stop(immediate=True)
+        self.assertEqual(controller.commanded_duty, (0, 0))
+
+    def test_ramp_stop_immediate(self):
+        """
+        Teste qu'un arrêt immédiat coupe les moteurs sans attendre la rampe de décélération,
+        contrairement à un arrêt normal.
+        """
+        controller = self.ramp_controller(acceleration=1000, deceleration=100)
+        controller.forward(50)
+        self.advance(controller, 0.1)
+        controller.stop()
+        self.advance(controller, 0.1)
+        self.assertAlmostEqual(controller.commanded_speed, 40)
+        controller.stop(immediate=True)
+        self.assertEqual(controller.commanded_speed, 0)
+        self.assertEqual(controller.commanded_duty, (0, 0))
+
+    def test_unchanged_command_is_not_rewritten(self):
+        """
+        Teste qu'une consigne identique n'est pas réécrite sur le bus I²C.
+        """
+        self.controller.forward(100)
+        write = self.controller._ControllerMotor__pwm_controller.write
+        count = write.call_count
+        self.controller.forward(100)
+        self.assertEqual(write.call_count, count)
+
+    def test_reset_after_emergency_stop_rewrites_stop(self):
+        """
+        Après un arrêt d'urgence fait hors du contrôleur, l'arrêt est réécrit
+        et la commande suivante n'est pas filtrée par le cache.
+        """
+        pwm = self.controller._ControllerMotor__pwm_controller
+        self.controller.forward(50)
+        self.controller.reset_after_emergency_stop()
+        pwm.write.assert_any_call(4, 0, 0)
+        self.assertEqual(self.controller.commanded_speed, 0)
+        pwm.reset_mock()
+        self.controller.stop()
+        pwm.write.assert_not_called()
+        self.controller.forward(50)
+        pwm.write.assert_any_call(4, 0, self.controller.commanded_duty[0])
+
     def test_backward_invalid_speed(self):
         """
         Teste que backward soulève une exception si la vitesse est positive.
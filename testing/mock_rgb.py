@@ -4,6 +4,7 @@ import sys
 import os
 import time
 import threading
+import numpy as np
 
 # Mock des modules matériels pour éviter les erreurs sur Windows
 sys.modules['board'] = MagicMock()
@@ -13,7 +14,7 @@ sys.modules['adafruit_tcs34725'] = MagicMock()
 # Ajoute le dossier racine du projet au chemin d'import
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from projet_voiture.CapteurRGB import CapteurRGB
+from projet_voiture.CapteurRGB import CapteurRGB, ColorClassifier, AutoRange
 
 class TestCapteurRGB(unittest.TestCase):
 
@@ -29,15 +30,52 @@ class TestCapteurRGB(unittest.TestCase):
         self.capteur.sensor = self.mock_sensor
 
     def test_calibrate(self):
-        # Simule des valeurs RGB pendant la calibration
-        self.mock_sensor.color_rgb_bytes = (100, 150, 200)
+        # Simule des valeurs brutes (R, G, B, clear) pendant la calibration
+        self.mock_sensor.color_raw = (100, 150, 200, 500)
         with patch('time.time', side_effect=[0, 0.1, 0.2, 0.3, 5.1]):  # Simule le temps pour la calibration
             self.capteur.calibrate()
 
         # Vérifie que les valeurs de référence sont correctement calculées
-        self.assertEqual(self.capteur.ref_r, 100)
-        self.assertEqual(self.capteur.ref_g, 150)
-        self.assertEqual(self.capteur.ref_b, 200)
+        ref = self.capteur._raw_to_rgb_bytes(100, 150, 200, 500)
+        self.assertEqual((self.capteur.ref_r, self.capteur.ref_g, self.capteur.ref_b), ref)
+
+        # Vérifie que le modèle du fond est construit sur la chromaticité normalisée par "clear"
+        mean, cov = self.capteur.classifier.model("fond")
+        np.testing.assert_allclose(mean, [0.2, 0.3, 0.4])
+        self.assertEqual(cov.shape, (3, 3))
+
+    def test_classifier_vectorized(self):
+        # Classe plusieurs mesures d'un coup, indépendamment du niveau de lumière
+        classifier = ColorClassifier()
+        rng = np.random.default_rng(0)
+        fond = np.column_stack([rng.normal(100, 2, 50), rng.normal(100, 2, 50), rng.normal(100, 2, 50), np.full(50, 300)])
+        vert = np.column_stack([rng.normal(60, 2, 50), rng.normal(160, 2, 50), rng.normal(90, 2, 50), np.full(50, 300)])
+        classifier.fit("fond", fond)
+        classifier.fit("vert", vert)
+
+        labels = classifier.classify([[100, 100, 100, 300], [20, 53, 30, 100], [300, 0, 0, 300]])
+        self.assertEqual(list(labels), ["fond", "vert", ColorClassifier.UNKNOWN])
+
+    def test_colors_use_dominant_channel_until_calibrated(self):
+        # Fond calibré seul : le classifieur reconnaît le fond, la couleur vient du canal dominant
+        self.mock_sensor.color_raw = (100, 100, 100, 300)
+        with patch('time.time', side_effect=[0, 0.1, 0.2, 0.3, 5.1]):
+            self.capteur.calibrate()
+        self.assertEqual(self.capteur.classify_raw(100, 100, 100, 300), "fond")
+        self.assertEqual(self.capteur.classify_raw(20, 200, 40, 250), "vert")
+        self.assertEqual(self.capteur.classify_raw(200, 20, 40, 250), "rouge")
+
+        # Rouge et vert calibrés devant le vrai feu : le classifieur décide
+        self.mock_sensor.color_raw = (40, 120, 90, 300)
+        with patch('time.time', side_effect=[0, 0.1, 0.2, 0.3, 2.1]):
+            self.capteur.calibrate_class("vert")
+        self.assertFalse(self.capteur.colors_calibrated())
+        self.mock_sensor.color_raw = (180, 60, 50, 300)
+        with patch('time.time', side_effect=[0, 0.1, 0.2, 0.3, 2.1]):
+            self.capteur.calibrate_class("rouge")
+        self.assertTrue(self.capteur.colors_calibrated())
+        self.assertEqual(self.capteur.classify_raw(40, 120, 90, 300), "vert")
+        self.assertEqual(self.capteur.classify_raw(20, 200, 40, 250), ColorClassifier.UNKNOWN)
 
     def test_detect_color(self):
         # Test des différentes couleurs détectées
@@ -46,6 +84,60 @@ class TestCapteurRGB(unittest.TestCase):
         self.assertEqual(self.capteur.detect_color(50, 50, 255), "bleu")
         self.assertEqual(self.capteur.detect_color(100, 100, 100), "indéterminé")
 
+    def test_monitor_fast_start_polling(self):
+        # Feu vert dès la première scrutation : la voiture doit être lancée et le temps de réaction mesuré
+        self.mock_sensor.color_raw = (10, 200, 30, 250)
+        car_launcher = MagicMock()
+        launched = threading.Event()
+        car_launcher.launch.side_effect = launched.set
+        with patch('time.sleep'):
+            self.capteur.monitor_fast_start(car_launcher)
+
+        self.assertTrue(launched.wait(1))
+        self.assertEqual(self.mock_sensor.integration_time, 2.4)
+        self.assertIsNotNone(self.capteur.reaction_time)
+        self.assertGreaterEqual(self.capteur.reaction_time, 0)
+
+    def test_auto_range(self):
+        auto_range = AutoRange(min_counts=200, max_fraction=0.75)
+        # Capteur saturé à 100 ms / gain 60 : la sensibilité doit baisser
+        gain, integration_time = auto_range.choose(65535, 60, 100.8)
+        self.assertLess(gain * integration_time, 60 * 100.8)
+        # Forte lumière non saturée : temps d'intégration le plus court qui garde assez de coups
+        gain, integration_time = auto_range.choose(20000, 1, 100.8)
+        self.assertEqual(integration_time, 2.4)
+        self.assertGreaterEqual(20000 / 100.8 * gain * integration_time, 200)
+        # Obscurité au réglage le plus sensible : on y reste
+        self.assertEqual(auto_range.choose(10, 60, 614.4), (60, 614.4))
+        # Peu de lumière à 2.4 ms : on allonge l'intégration
+        gain, integration_time = auto_range.choose(20, 1, 2.4)
+        self.assertGreater(gain * integration_time, 2.4)
+
+    def test_read_raw_updates_telemetry(self):
+        self.capteur.auto_range = AutoRange()
+        self.mock_sensor.color_raw = (5000, 5000, 5000, 20000)
+        self.capteur.read_raw()
+        telemetry = self.capteur.get_telemetry()
+        self.assertEqual(telemetry["clear"], 20000)
+        self.assertEqual(telemetry["integration_time"], self.mock_sensor.integration_time)
+        self.assertLess(telemetry["integration_time"], 100)
+
+    def test_export_import_calibration(self):
+        self.mock_sensor.color_raw = (100, 150, 200, 500)
+        with patch('time.time', side_effect=[0, 0.1, 0.2, 5.1]):
+            self.capteur.calibrate()
+        data = self.capteur.export_calibration()
+
+        autre = CapteurRGB()
+        autre.sensor = self.mock_sensor
+        self.assertTrue(autre.import_calibration(data))
+        self.assertEqual((autre.ref_r, autre.ref_g, autre.ref_b), (self.capteur.ref_r, self.capteur.ref_g, self.capteur.ref_b))
+        # Même éclairage : la lecture de contrôle valide la calibration en cache
+        with patch('time.sleep'):
+            self.assertTrue(autre.check_calibration())
+            self.mock_sensor.color_raw = (20, 400, 80, 500)
+            self.assertFalse(autre.check_calibration())
+
     def test_threshold_values(self):
 
         # Valeurs différentes
@@ -4,7 +4,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 import sys
 sys.modules['PWM'] = MagicMock()
-from projet_voiture.ControllerServo import ControllerServo
+from projet_voiture.ControllerServo import ControllerServo, ServoLUT
 
 class TestServoController(unittest.TestCase):
     def setUp(self):
@@ -78,6 +78,23 @@ class TestServoController(unittest.TestCase):
             self.servo.setToDegree(angle)
             self.assertEqual(self.mock_pwm_instance.write.call_args[0], (0, 0, expected_pwm))
 
+    def test_setToDegree_table_matches_formula(self):
+        """La table précalculée de setToDegree reproduit la formule historique (45° -> 395)."""
+        for angle in range(0, 181):
+            self.servo.setToDegree(angle)
+            expected = int(320 + (angle / 180.0) * (500 - 200))
+            self.assertEqual(self.mock_pwm_instance.write.call_args[0], (0, 0, expected))
+
+    def test_lut_calibration_points(self):
+        """Un point de calibration mesuré est respecté et la table reste entière et monotone."""
+        lut = ServoLUT(320, 200, 500, calibration_points={25: 430})
+        self.assertEqual(lut.pulse(25), 430)
+        self.assertEqual(lut.pulse(12.5), 375)
+        self.assertTrue(all(isinstance(p, int) for p in lut.table))
+        self.assertEqual(lut.table, sorted(lut.table))
+        with self.assertRaises(ValueError):
+            ServoLUT(320, 200, 500, calibration_points={25: 250})
+
     def test_resetRoue(self):
         """Test de la méthode resetRoue pour réinitialiser la roue à la position centrale."""
 
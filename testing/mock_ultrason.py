@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, PropertyMock
 from gpiozero.pins.mock import MockFactory
 from gpiozero import Device
 import sys
@@ -8,7 +8,7 @@ import os
 # Ajouter le dossier 'src' au chemin d'import
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from projet_voiture.CapteurDistance import CapteurDistance
+from projet_voiture.CapteurDistance import CapteurDistance, OK, TROP_PROCHE, PAS_D_ECHO, SATURE
 
 
 class TestUltrasoundSensor(unittest.TestCase):
@@ -69,6 +69,49 @@ class TestUltrasoundSensor(unittest.TestCase):
         result = self.sensor.get_distance()
         self.assertAlmostEqual(result, 400.0, delta=0.1, msg=f"echec : La distance mesuree est {result} cm, elle devrait être proche de 400 cm.")
 
+    def test_read_status_ok(self):
+        """Teste le statut d'une mesure valide."""
+        self.mock_sensor.distance = 0.1  # 10 cm
+        reading = self.sensor.read()
+        self.assertEqual(reading.status, OK)
+        self.assertTrue(reading.valid)
+        self.assertAlmostEqual(reading.distance, 10.0, delta=0.1)
+
+    def test_read_status_out_of_range(self):
+        """Teste les statuts hors plage : aucune exception, la distance moyenne est conservee."""
+        self.mock_sensor.distance = 0.01  # 1 cm
+        self.assertEqual(self.sensor.read().status, TROP_PROCHE)
+        self.mock_sensor.distance = 4.5  # 450 cm
+        self.assertEqual(self.sensor.read(), (450.0, SATURE))
+        self.mock_sensor.distance = 4.0  # Portee du capteur : aucun echo plus proche
+        self.assertEqual(self.sensor.read().status, SATURE)
+        self.assertAlmostEqual(self.sensor.get_distance(), 400.0, delta=0.1)
+
+    def test_read_status_no_echo(self):
+        """Teste une mesure sans echo : statut sans exception, RuntimeError pour get_distance."""
+        type(self.mock_sensor).distance = PropertyMock(side_effect=RuntimeError("timeout"))
+        self.assertEqual(self.sensor.read(), (None, PAS_D_ECHO))
+        with self.assertRaises(RuntimeError):
+            self.sensor.get_distance()
+
+    @patch('projet_voiture.CapteurDistance.time.sleep')
+    def test_read_single_sample_does_not_wait(self, sleep):
+        """Teste qu'une lecture rapide (un seul echantillon) ne fait aucune attente."""
+        self.mock_sensor.distance = 0.3
+        self.assertEqual(self.sensor.read(sample_count=1).status, OK)
+        sleep.assert_not_called()
+        self.sensor.read()
+        self.assertEqual(sleep.call_count, 4)  # Attente entre deux lectures seulement
+
+    def test_read_counts_per_status(self):
+        """Teste le comptage des mesures par statut."""
+        self.mock_sensor.distance = 0.1
+        self.sensor.read()
+        self.sensor.read()
+        self.mock_sensor.distance = 0.01
+        self.sensor.read()
+        self.assertEqual(dict(self.sensor.counts), {OK: 2, TROP_PROCHE: 1})
+
     def test_with_sample_count_as_zero(self):
         """Teste la creation de la classe avec un nombre d'echantillons egal a zero.
         
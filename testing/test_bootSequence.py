@@ -0,0 +1,117 @@
+import unittest
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.BootSequence import BootSequence
+
+
+class TestBootSequence(unittest.TestCase):
+
+    def test_independent_steps_run_concurrently(self):
+        """Deux étapes indépendantes s'attendent l'une l'autre : seule une exécution simultanée aboutit."""
+        rendez_vous = threading.Barrier(2, timeout=5)
+        boot = BootSequence()
+        boot.add("a", rendez_vous.wait)
+        boot.add("b", rendez_vous.wait)
+        results = boot.run()
+        self.assertEqual(sorted(results[name] for name in ("a", "b")), [0, 1])
+
+    def test_dependencies_are_respected(self):
+        ordre = []
+        lock = threading.Lock()
+
+        def etape(name):
+            def run():
+                with lock:
+                    ordre.append(("début", name))
+                result = name.upper()
+                with lock:
+                    ordre.append(("fin", name))
+                return result
+            return run
+
+        boot = BootSequence()
+        boot.add("servo", etape("servo"), depends_on=["moteurs"])
+        boot.add("moteurs", etape("moteurs"))
+        boot.add("web", etape("web"), depends_on=["servo", "rgb"])
+        boot.add("rgb", etape("rgb"))
+        results = boot.run()
+
+        # Une étape ne commence qu'après la fin de toutes ses dépendances
+        self.assertLess(ordre.index(("fin", "moteurs")), ordre.index(("début", "servo")))
+        self.assertLess(ordre.index(("fin", "servo")), ordre.index(("début", "web")))
+        self.assertLess(ordre.index(("fin", "rgb")), ordre.index(("début", "web")))
+        self.assertEqual(ordre[-1], ("fin", "web"))
+        self.assertEqual(results["servo"], "SERVO")
+        self.assertEqual(boot.critical_path()[-1], "web")
+
+    def test_wheels_are_set_after_the_web_server_resets_the_pca9685(self):
+        ordre = []
+        lock = threading.Lock()
+
+        def etape(name, result=None):
+            def run(*args, **kwargs):
+                with lock:
+                    ordre.append(("début", name))
+                with lock:
+                    ordre.append(("fin", name))
+                return result if result is not None else MagicMock()
+            return run
+
+        car = MagicMock()
+        car.init_servo.side_effect = etape("roues", False)
+        with patch.dict('sys.modules'):
+            import projet_voiture.main as main
+            with patch.object(main, "ControllerCar", etape("voiture", car)), \
+                    patch.object(main, "VoitureServer", etape("serveur_web")), \
+                    patch.object(main, "CapteurRGB", etape("capteur_rgb")), \
+                    patch.object(main, "Logging", MagicMock()):
+                for fast_boot in (False, True):
+                    ordre.clear()
+                    main.MainController(use_calibration_cache=False, fast_boot=fast_boot)
+                    self.assertLess(ordre.index(("fin", "serveur_web")), ordre.index(("début", "roues")))
+                    self.assertLess(ordre.index(("fin", "voiture")), ordre.index(("début", "serveur_web")))
+
+    def test_fast_boot_skips_non_essential_steps(self):
+        executees = []
+        boot = BootSequence()
+        boot.add("voiture", lambda: executees.append("voiture"))
+        boot.add("balayage", lambda: executees.append("balayage"), depends_on=["voiture"], essential=False)
+        boot.run(fast=True)
+        self.assertEqual(executees, ["voiture"])
+        self.assertEqual(boot.skipped, ["balayage"])
+        self.assertIn("sautée", boot.report())
+
+    def test_failure_stops_dependents(self):
+        executees = []
+
+        def echec():
+            raise OSError("I2C absent")
+
+        boot = BootSequence()
+        boot.add("pca", echec)
+        boot.add("servo", lambda: executees.append("servo"), depends_on=["pca"])
+        boot.add("web", lambda: executees.append("web"), depends_on=["servo"])
+        boot.add("rgb", lambda: executees.append("rgb"))
+        with self.assertRaises(RuntimeError):
+            boot.run()
+        self.assertEqual(executees, ["rgb"])
+
+    def test_invalid_graphs(self):
+        boot = BootSequence()
+        boot.add("a", lambda: None, depends_on=["b"])
+        boot.add("b", lambda: None, depends_on=["a"])
+        with self.assertRaises(ValueError):
+            boot.run()
+
+        boot = BootSequence()
+        boot.add("a", lambda: None, depends_on=["inconnue"])
+        with self.assertRaises(ValueError):
+            boot.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
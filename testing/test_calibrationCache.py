@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.CalibrationCache import CalibrationCache, CACHE_VERSION
+
+
+class TestCalibrationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "calibration.json")
+
+    def test_put_then_get_from_new_instance(self):
+        """Une section enregistrée est relue par une nouvelle instance (démarrage suivant)."""
+        CalibrationCache(self.path).put("servo", {"center": 320, "minimum": 200, "maximum": 500})
+        data = CalibrationCache(self.path).get("servo")
+        self.assertEqual(data, {"center": 320, "minimum": 200, "maximum": 500})
+
+    def test_missing_file_gives_empty_cache(self):
+        self.assertIsNone(CalibrationCache(self.path).get("rgb"))
+
+    def test_expired_section_is_ignored(self):
+        cache = CalibrationCache(self.path, max_age=60)
+        with patch('projet_voiture.CalibrationCache.time.time', return_value=1000):
+            cache.put("rgb", {"ref": [1, 2, 3]})
+        with patch('projet_voiture.CalibrationCache.time.time', return_value=1061):
+            self.assertIsNone(cache.get("rgb"))
+        with patch('projet_voiture.CalibrationCache.time.time', return_value=1059):
+            self.assertEqual(cache.get("rgb"), {"ref": [1, 2, 3]})
+
+    def test_changed_configuration_invalidates_section(self):
+        cache = CalibrationCache(self.path)
+        cache.put("rgb", {"threshold": 5, "ref": [1, 2, 3]})
+        self.assertIsNotNone(cache.get("rgb", expected={"threshold": 5}))
+        self.assertIsNone(cache.get("rgb", expected={"threshold": 8}))
+
+    def test_corrupt_or_old_file_is_ignored(self):
+        with open(self.path, "w") as f:
+            f.write("{ pas du json")
+        self.assertIsNone(CalibrationCache(self.path).get("rgb"))
+
+        with open(self.path, "w") as f:
+            json.dump({"version": CACHE_VERSION + 1, "sections": {"rgb": {"timestamp": 0, "data": {}}}}, f)
+        self.assertIsNone(CalibrationCache(self.path).get("rgb"))
+
+    def test_invalidate(self):
+        cache = CalibrationCache(self.path)
+        cache.put("rgb", {"ref": [1, 2, 3]})
+        cache.put("servo", {"center": 320})
+        cache.invalidate("rgb")
+        self.assertIsNone(CalibrationCache(self.path).get("rgb"))
+        self.assertIsNotNone(CalibrationCache(self.path).get("servo"))
+
+    def test_invalid_max_age(self):
+        with self.assertRaises(ValueError):
+            CalibrationCache(self.path, max_age=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
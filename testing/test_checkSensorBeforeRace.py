@@ -0,0 +1,253 @@
+import unittest
+import json
+import os
+import subprocess
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from projet_voiture import CheckSensorBeforeRace as check
+
+
+class FakeGPIO:
+    """
+    RPi.GPIO factice : à la retombée de TRIG, rejoue une séquence de fronts sur la broche ECHO
+    (délai en ns depuis l'instant précédent, niveau) sur une horloge simulée.
+    """
+    BOTH = 33
+
+    def __init__(self, echo, fronts, niveau_initial=0, lectures_hautes=0):
+        self.echo = echo
+        self.fronts = fronts
+        self.niveau = niveau_initial
+        self.lectures_hautes = lectures_hautes  # Lectures encore hautes avant le retour au niveau bas
+        self.now = 0
+        self.callback = None
+        self.declenchements = 0
+
+    def perf_counter_ns(self):
+        return self.now
+
+    def input(self, pin):
+        if self.lectures_hautes:
+            self.lectures_hautes -= 1
+            if not self.lectures_hautes:
+                self.niveau = 0
+            return 1
+        return self.niveau
+
+    def add_event_detect(self, pin, edge, callback):
+        self.callback = callback
+
+    def remove_event_detect(self, pin):
+        self.callback = None
+
+    def output(self, pin, value):
+        if value:
+            self.declenchements += 1
+            return
+        for delai, niveau in self.fronts:
+            self.now += delai
+            self.niveau = niveau
+            self.callback(self.echo)
+
+
+class TestMesurerEcho(unittest.TestCase):
+
+    def mesurer(self, gpio, timeout=0.01):
+        with patch.object(check, "GPIO", gpio), patch.object(check.time, "perf_counter_ns", gpio.perf_counter_ns):
+            return check.mesurer_echo_ns(26, 19, timeout)
+
+    def test_rising_to_falling_duration(self):
+        gpio = FakeGPIO(19, [(100_000, 1), (1_000_000, 0)])
+        self.assertEqual(self.mesurer(gpio), 1_000_000)
+
+    def test_waits_for_echo_low_before_triggering(self):
+        # Fin de l'impulsion précédente : ECHO encore haut pendant trois lectures
+        gpio = FakeGPIO(19, [(100_000, 1), (2_000_000, 0)], niveau_initial=1, lectures_hautes=3)
+        self.assertEqual(self.mesurer(gpio), 2_000_000)
+        self.assertEqual(gpio.lectures_hautes, 0)
+        self.assertEqual(gpio.declenchements, 1)
+
+    def test_leading_falling_edge_is_ignored(self):
+        gpio = FakeGPIO(19, [(50_000, 0), (100_000, 1), (1_500_000, 0)])
+        self.assertEqual(self.mesurer(gpio), 1_500_000)
+
+    def test_missing_falling_edge_gives_none(self):
+        gpio = FakeGPIO(19, [(100_000, 1)])
+        self.assertIsNone(self.mesurer(gpio))
+
+    def test_echo_stuck_high_is_not_triggered(self):
+        gpio = FakeGPIO(19, [], niveau_initial=1)
+        self.assertIsNone(self.mesurer(gpio))
+        self.assertEqual(gpio.declenchements, 0)
+
+
+class TestExecuterVerifications(unittest.TestCase):
+
+    @staticmethod
+    def ok(nom):
+        return lambda: {"Nom": nom, "Etat": "✅ OK"}
+
+    def test_result_flags_and_errors(self):
+        self.assertTrue(check._executer_avec_timeout("a", self.ok("a"), 1.0)["OK"])
+
+        def panne():
+            raise OSError("bus I2C absent")
+
+        resultat = check._executer_avec_timeout("b", panne, 1.0)
+        self.assertEqual(resultat["Nom"], "b")
+        self.assertFalse(resultat["OK"])
+        self.assertIn("bus I2C absent", resultat["Etat"])
+        self.assertIn("Duree_ms", resultat)
+
+    def test_timeout_does_not_block(self):
+        libere = threading.Event()
+        self.addCleanup(libere.set)
+        resultat = check._executer_avec_timeout("bloquée", lambda: libere.wait() and {}, 0.05)
+        self.assertFalse(resultat["OK"])
+        self.assertIn("délai dépassé", resultat["Etat"])
+
+    def test_groups_run_in_parallel_and_checks_in_order(self):
+        ordre = []
+        autre_groupe = threading.Event()
+
+        def attend_l_autre_groupe():
+            # Ne réussit que si le second groupe s'exécute en même temps
+            autre_groupe.wait(1.0)
+            ordre.append("a1")
+            return {"Nom": "a1", "Etat": "✅ OK" if autre_groupe.is_set() else "❌ séquentiel"}
+
+        def etape(nom):
+            def run():
+                ordre.append(nom)
+                return {"Nom": nom, "Etat": "✅ OK"}
+            return run
+
+        def debloque():
+            autre_groupe.set()
+            return {"Nom": "b1", "Etat": "✅ OK"}
+
+        groupes = [
+            [("a1", attend_l_autre_groupe, 2.0), ("a2", etape("a2"), 1.0)],
+            [("b1", debloque, 1.0)],
+        ]
+        resultats, duree_totale_ms = check.executer_verifications(groupes)
+        self.assertEqual([r["Nom"] for r in resultats], ["a1", "a2", "b1"])
+        self.assertTrue(all(r["OK"] for r in resultats))
+        self.assertLess(ordre.index("a1"), ordre.index("a2"))
+        self.assertGreaterEqual(duree_totale_ms, 0)
+
+
+class TestRapport(unittest.TestCase):
+
+    def test_rapport_json(self):
+        results = [{"Nom": "a", "Etat": "✅ OK", "OK": True, "Duree_ms": 1.5},
+                   {"Nom": "b", "Etat": "❌ ERREUR -> x", "OK": False, "Duree_ms": 2.0}]
+        rapport = json.loads(check.rapport_json(results, 3.0))
+        self.assertFalse(rapport["ok"])
+        self.assertEqual(rapport["duree_totale_ms"], 3.0)
+        self.assertEqual(rapport["verifications"][0], {"nom": "a", "etat": "✅ OK", "ok": True, "duree_ms": 1.5})
+        self.assertTrue(json.loads(check.rapport_json(results[:1], 1.0))["ok"])
+
+    def test_json_option_on_mock_hardware(self):
+        env = dict(os.environ, VOITURE_MATERIEL="mock", PYTHONPATH=ROOT)
+        output = subprocess.run([sys.executable, os.path.join(ROOT, "projet_voiture", "CheckSensorBeforeRace.py"),
+                                 "--json"], capture_output=True, text=True, env=env, check=True, timeout=60)
+        rapport = json.loads(output.stdout)
+        noms = [verification["nom"] for verification in rapport["verifications"]]
+        self.assertEqual(noms, [nom for groupe in check.groupes_de_verifications() for nom, _, _ in groupe])
+        self.assertEqual(rapport["ok"], all(verification["ok"] for verification in rapport["verifications"]))
+        self.assertEqual(set(rapport["verifications"][0]), {"nom", "etat", "ok", "duree_ms"})
+
+
+class FakeTCS34725:
+    """Capteur RGB factice : rejoue une liste de lectures (une exception est levée)."""
+
+    def __init__(self, mesures):
+        self.mesures = iter(mesures)
+
+    @property
+    def color_raw(self):
+        mesure = next(self.mesures)
+        if isinstance(mesure, Exception):
+            raise mesure
+        return mesure
+
+
+class FakeLineSensor:
+
+    def __init__(self, *args, **kwargs):
+        self.valeurs = iter([0, 0, 1, 1])
+
+    @property
+    def value(self):
+        return next(self.valeurs)
+
+    def close(self):
+        pass
+
+
+class TestBanc(unittest.TestCase):
+
+    def setUp(self):
+        for name in ("GPIO", "board", "busio"):
+            patcher = patch.object(check, name, MagicMock())
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.sleeps = []
+        patcher = patch.object(check.time, "sleep", self.sleeps.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_statistiques(self):
+        stats = check._statistiques([1.0, 2.0, 3.0, 4.0])
+        self.assertEqual((stats["n"], stats["moyenne"], stats["min"], stats["max"]), (4, 2.5, 1.0, 4.0))
+        self.assertAlmostEqual(stats["ecart_type"], 1.118, places=3)
+        self.assertEqual(stats["p50"], 2.5)
+        self.assertEqual(check._statistiques([7.0])["p99"], 7.0)
+        self.assertIsNone(check._statistiques([]))
+
+    def test_ultrasons_period_is_bounded(self):
+        with self.assertRaises(ValueError):
+            check.banc_ultrasons(n=1, periode=0.0)
+
+    def test_rgb_sleeps_after_every_reading(self):
+        mesures = [(10, 20, 30, 60), OSError("I2C"), (0, 0, 0, 0), (12, 20, 30, 62)]
+        with patch.object(check, "adafruit_tcs34725", MagicMock()) as module:
+            module.TCS34725.return_value = FakeTCS34725(mesures)
+            rapport = check.banc_rgb(n=4, integration_time=2.4)
+        self.assertEqual(self.sleeps, [0.0024] * 4)
+        self.assertEqual(rapport["taux_perte"], 0.5)
+        self.assertEqual(rapport["canaux"]["r"]["moyenne"], 11.0)
+
+    def test_bench_report(self):
+        # Écho de 1 ms (17.15 cm) ; le capteur AVANT perd une mesure sur deux quand les trois tirent ensemble
+        salves = []
+
+        def mesurer_echos_ns(paires, timeout):
+            salves.append(len(paires))
+            perdu = len(paires) == 3 and len(salves) % 2 == 0
+            return [None if perdu and echo == 5 else 1_000_000 for _, echo in paires]
+
+        with patch.object(check, "mesurer_echos_ns", mesurer_echos_ns), \
+                patch.object(check, "adafruit_tcs34725", MagicMock()) as module, \
+                patch.object(check, "DigitalInputDevice", FakeLineSensor):
+            module.TCS34725.return_value = FakeTCS34725([(10, 20, 30, 60)] * 4)
+            rapport = json.loads(json.dumps(check.banc(n=4)))
+
+        ultrasons = rapport["ultrasons"]
+        self.assertEqual(salves, [1] * 12 + [3] * 4)
+        self.assertEqual(ultrasons["AVANT"]["distance_cm"]["moyenne"], 17.15)
+        self.assertEqual(ultrasons["AVANT"]["sensor_sample_count_recommande"], None)  # Aucun bruit
+        self.assertEqual(ultrasons["diaphonie"]["capteurs"]["AVANT"]["hausse_taux_perte"], 0.5)
+        self.assertEqual(ultrasons["diaphonie"]["capteurs"]["DROIT"]["taux_perte"], 0.0)
+        self.assertEqual(rapport["rgb"]["taux_perte"], 0.0)
+        self.assertEqual(rapport["line_follower"]["taux_transitions"], round(1 / 3, 4))
+        check.GPIO.cleanup.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import unittest
+import os
+import sys
+import threading
+import unittest.mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.ControlProcess import (TelemetryBlock, CommandRing, ControllerProxy, ControlService,
+                                           CMD_LANCER, CMD_TOUR_EN_8, CMD_ARRET, STATE_READY)
+
+
+class TestTelemetryBlock(unittest.TestCase):
+
+    def setUp(self):
+        self.writer = TelemetryBlock()
+        self.reader = TelemetryBlock(name=self.writer.name)
+        self.addCleanup(self.writer.close)
+        self.addCleanup(self.reader.close)
+
+    def test_unpublished_fields_are_none(self):
+        self.assertIsNone(self.reader.read()["front"])
+
+    def test_publish_is_visible_through_another_mapping(self):
+        self.writer.publish(front=42.5, speed=0.8)
+        data = self.reader.read()
+        self.assertEqual(data["front"], 42.5)
+        self.assertEqual(data["speed"], 0.8)
+        self.writer.publish(front=None)
+        self.assertIsNone(self.reader.read()["front"])
+
+    def test_reader_never_sees_torn_write(self):
+        """Les champs écrits ensemble sont toujours lus ensemble."""
+        stop = threading.Event()
+
+        def writer():
+            i = 0
+            while not stop.is_set():
+                i += 1
+                self.writer.publish(front=i, left=i, right=i)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(2000):
+                data = self.reader.read()
+                if data["front"] is not None:
+                    self.assertEqual(data["front"], data["left"])
+                    self.assertEqual(data["left"], data["right"])
+        finally:
+            stop.set()
+            thread.join()
+
+    def test_partially_visible_write_is_rejected(self):
+        """Octets de deux publications mélangés (écritures vues dans le désordre, ARM) : lecture refusée."""
+        self.writer.publish(front=1.0, left=1.0)
+        old = bytes(self.writer.shm.buf)
+        self.writer.publish(front=2.0, left=2.0)
+        new = bytes(self.writer.shm.buf)
+        self.writer.shm.buf[:len(new)] = new[:16] + old[16:]
+        with self.assertRaises(RuntimeError):
+            self.reader.read(retries=3)
+        self.writer.shm.buf[:len(new)] = new
+        self.assertEqual(self.reader.read()["left"], 2.0)
+
+
+class TestCommandRing(unittest.TestCase):
+
+    def setUp(self):
+        self.producer = CommandRing(capacity=4)
+        self.consumer = CommandRing(name=self.producer.name, capacity=4)
+        self.addCleanup(self.producer.close)
+        self.addCleanup(self.consumer.close)
+
+    def test_fifo_order_and_capacity(self):
+        for code in range(1, 5):
+            self.assertTrue(self.producer.push(code, code / 10))
+        self.assertFalse(self.producer.push(5))
+        self.assertEqual(self.consumer.pop(), (1, 0.1))
+        self.assertTrue(self.producer.push(5))
+        self.assertEqual([self.consumer.pop()[0] for _ in range(4)], [2, 3, 4, 5])
+        self.assertIsNone(self.consumer.pop())
+
+    def test_slot_not_yet_visible_is_kept_for_later(self):
+        """Nouveau ``head`` visible avant le contenu de la case (ARM) : la commande est relue, pas perdue."""
+        buf, slot = self.producer.shm.buf, slice(16, 16 + 32)  # Case 0 : en-tête de 16 octets, cases de 32
+        self.assertTrue(self.producer.push(CMD_LANCER))
+        self.assertEqual(self.consumer.pop(), (CMD_LANCER, 0.0))
+        old = bytes(buf[slot])
+        for code in range(1, 4):
+            self.producer.push(code)
+        self.assertTrue(self.producer.push(CMD_ARRET, 2.5))  # Réutilise la case 0
+        new = bytes(buf[slot])
+        buf[slot] = old  # Contenu du tour précédent encore visible
+        self.assertEqual([self.consumer.pop()[0] for _ in range(3)], [1, 2, 3])
+        self.assertIsNone(self.consumer.pop(retries=2))
+        buf[slot] = new[:16] + old[16:]  # Seule une partie de la case est visible
+        self.assertIsNone(self.consumer.pop(retries=2))
+        buf[slot] = new
+        self.assertEqual(self.consumer.pop(), (CMD_ARRET, 2.5))
+        self.assertIsNone(self.consumer.pop())
+
+
+class TestControllerProxy(unittest.TestCase):
+
+    def test_actions_become_commands(self):
+        telemetry, commands = TelemetryBlock(), CommandRing()
+        self.addCleanup(telemetry.close)
+        self.addCleanup(commands.close)
+        proxy = ControllerProxy(telemetry, commands)
+        proxy.run()
+        proxy.launch()
+        proxy.tour_en_8()
+        self.assertEqual([commands.pop()[0] for _ in range(3)], [CMD_LANCER, CMD_LANCER, CMD_TOUR_EN_8])
+        self.assertIsNone(commands.pop())
+
+
+class FakeCar:
+
+    def __init__(self):
+        self.calls = []
+        self.last_snapshot = None
+        self.speed_estimator = unittest.mock.MagicMock()
+        self.speed_estimator.state.return_value = {"speed": 0.5, "confidence": 0.9, "heading": 0.0,
+                                                   "odometer": 1.0, "x": 1.0, "y": 0.0, "efficiency": 1.0}
+        self.motor_ctrl = unittest.mock.MagicMock(commanded_speed=35)
+        self.servo_ctrl = unittest.mock.MagicMock(current_angle=0)
+
+    def tour_en_8(self):
+        self.calls.append("tour_en_8")
+
+    def cleanup(self):
+        self.calls.append("cleanup")
+
+
+class TestControlService(unittest.TestCase):
+
+    def test_commands_and_telemetry_through_proxy(self):
+        telemetry, commands = TelemetryBlock(), CommandRing()
+        self.addCleanup(telemetry.close)
+        self.addCleanup(commands.close)
+        car = FakeCar()
+        launcher = unittest.mock.MagicMock()
+        service = ControlService(car, launcher, None, telemetry, commands, poll_period=0.001)
+        proxy = ControllerProxy(telemetry, commands)
+
+        proxy.tour_en_8()
+        proxy.run()
+        commands.push(CMD_ARRET)
+        service.serve()
+        for thread in service._threads.values():
+            thread.join()
+
+        self.assertEqual(car.calls, ["tour_en_8", "cleanup"])
+        launcher.launch.assert_called_once()
+        service.publish()
+        self.assertEqual(proxy.get_speed(), 0.5)
+        self.assertEqual(proxy.get_distances(), {"front": None, "left": None, "right": None})
+        self.assertEqual(proxy.state(), STATE_READY)
+
+
+class TestControlProcess(unittest.TestCase):
+
+    def test_stop_without_start_releases_shared_memory(self):
+        from projet_voiture.ControlProcess import ControlProcess
+        process = ControlProcess()
+        name = process.telemetry.name
+        process.stop()
+        process.stop()
+        with self.assertRaises(FileNotFoundError):
+            TelemetryBlock(name=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
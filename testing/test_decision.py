@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.Decision import (decide, decide_many, analyse_surface, ACTIONS, TOUT_DROIT, URGENCE,
+                                     OBSTACLE_AVANT, OBSTACLE_DOUBLE, OBSTACLE_GAUCHE, OBSTACLE_DROIT)
+
+THRESHOLDS = (40, 41, 12)  # Urgence, avant, côtés (réglages par défaut)
+
+
+class TestDecide(unittest.TestCase):
+
+    def test_each_branch(self):
+        self.assertEqual(decide(100, 100, 100, *THRESHOLDS), TOUT_DROIT)
+        self.assertEqual(decide(39, 5, 5, *THRESHOLDS), URGENCE)
+        self.assertEqual(decide(40, 5, 5, *THRESHOLDS), OBSTACLE_AVANT)
+        self.assertEqual(decide(100, 5, 5, *THRESHOLDS), OBSTACLE_DOUBLE)
+        self.assertEqual(decide(100, 5, 100, *THRESHOLDS), OBSTACLE_GAUCHE)
+        self.assertEqual(decide(100, 100, 5, *THRESHOLDS), OBSTACLE_DROIT)
+
+    def test_thresholds_are_strict(self):
+        self.assertEqual(decide(41, 12, 12, *THRESHOLDS), TOUT_DROIT)
+
+
+class TestDecideMany(unittest.TestCase):
+
+    def test_matches_scalar_decision(self):
+        rng = np.random.default_rng(1)
+        # Valeurs entières : beaucoup de triplets tombent exactement sur les seuils
+        front, left, right = rng.integers(2, 60, size=(3, 5000))
+        codes = decide_many(front, left, right, *THRESHOLDS)
+        expected = [ACTIONS.index(decide(f, l, r, *THRESHOLDS)) for f, l, r in zip(front, left, right)]
+        self.assertEqual(codes.tolist(), expected)
+        self.assertEqual(codes.dtype, np.int8)
+
+    def test_thresholds_broadcast(self):
+        side_thresholds = np.array([[5], [20]])
+        codes = decide_many(100, np.array([10, 10]), np.array([100, 100]), 40, 41, side_thresholds)
+        self.assertEqual(codes.shape, (2, 2))
+        self.assertEqual([ACTIONS[code] for code in codes[:, 0]], [TOUT_DROIT, OBSTACLE_GAUCHE])
+
+
+class TestAnalyseSurface(unittest.TestCase):
+
+    def test_shares_cover_the_surface(self):
+        report = analyse_surface(*THRESHOLDS, resolution=10)
+        self.assertEqual(report["points"], 40 ** 3)
+        self.assertAlmostEqual(sum(report["shares"].values()), 1.0)
+
+    def test_side_turns_towards_the_obstacle_are_reported(self):
+        report = analyse_surface(*THRESHOLDS, resolution=10)
+        self.assertEqual(report["contradictions"], {OBSTACLE_GAUCHE: 1.0, OBSTACLE_DROIT: 1.0})
+
+    def test_dead_zones(self):
+        narrow = analyse_surface(*THRESHOLDS, resolution=2)["dead_zones"]  # Le point 40 cm est sur la grille
+        self.assertEqual(len(narrow), 1)
+        self.assertIn(OBSTACLE_AVANT, narrow[0])
+        unreachable = analyse_surface(60, 50, 12, resolution=10)["dead_zones"]
+        self.assertIn(f"'{OBSTACLE_AVANT}' n'est jamais choisie.", unreachable)
+        self.assertEqual(analyse_surface(30, 60, 12, resolution=10)["dead_zones"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.DynamicWindow import DynamicWindowPlanner
+
+
+class TestDynamicWindowPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = DynamicWindowPlanner()
+
+    def test_open_space_goes_straight_and_fast(self):
+        steer, speed = self.planner.plan({"front": None, "left": None, "right": None}, current_speed=35)
+        self.assertEqual(steer, 0)
+        self.assertEqual(speed, 60)
+
+    def test_steers_away_from_front_obstacle_towards_free_side(self):
+        steer, _ = self.planner.plan({"front": 0.5, "left": 0.3, "right": 1.5}, current_speed=35)
+        self.assertGreater(steer, 0)
+        steer, _ = self.planner.plan({"front": 0.5, "left": 1.5, "right": 0.3}, current_speed=35)
+        self.assertLess(steer, 0)
+
+    def test_no_safe_arc_returns_none(self):
+        self.assertIsNone(self.planner.plan({"front": 0.15, "left": 0.3, "right": 0.3}, current_speed=35))
+
+    def test_dynamic_window_limits_speed_change(self):
+        _, speed = self.planner.plan({"front": None, "left": None, "right": None}, current_speed=0)
+        self.assertLessEqual(speed, self.planner.candidate_speeds.min() + self.planner.speed_window)
+
+    def test_cost_is_bounded(self):
+        """Le nombre de points d'obstacle (donc le coût) ne dépend que de la configuration."""
+        near = self.planner.obstacle_points({"front": 0.5, "left": 0.3, "right": 0.3})
+        far = self.planner.obstacle_points({"front": 2.5, "left": 2.0, "right": 2.0})
+        self.assertEqual(near.shape, far.shape)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            DynamicWindowPlanner(min_speed=70, max_speed=60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import importlib
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture import Hardware
+from projet_voiture.Hardware import lazy, lazy_attr
+import MockHardware
+
+HARDWARE_MODULES = ("RPi", "RPi.GPIO", "smbus", "gpiozero", "board", "busio", "adafruit_tcs34725")
+PROJECT_MODULES = ("PWM", "ControllerMotor", "ControllerServo", "CapteurDistance", "CapteurRGB", "LineFollower",
+                   "Watchdog", "ControllerCar")
+
+
+class World:
+    """Monde simulé minimal : distance fixe par broche echo."""
+
+    def distance(self, echo):
+        return {9: 0.3, 5: None}.get(echo, 1.5)
+
+    def line(self, pin):
+        return pin == 20
+
+    def color(self):
+        return (10, 200, 10, 250)
+
+
+class TestHardwareBackends(unittest.TestCase):
+
+    def setUp(self):
+        # Modules du projet réimportés à neuf (d'autres tests remplacent PWM par un MagicMock)
+        patcher = patch.dict('sys.modules')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in PROJECT_MODULES:
+            sys.modules.pop(name, None)
+        self.addCleanup(Hardware.select, "reel")
+        self.addCleanup(MockHardware.state.reset)
+        Hardware.select("mock")
+        MockHardware.state.reset()
+
+    def test_import_loads_no_hardware_library(self):
+        code = ("import sys; sys.path.insert(0, %r); "
+                "import projet_voiture.ControllerCar, projet_voiture.WebServerCar, projet_voiture.CapteurRGB, "
+                "projet_voiture.LineFollower, projet_voiture.main; "
+                "print(sorted(set(%r) & set(sys.modules)))") % (os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                              HARDWARE_MODULES)
+        env = dict(os.environ, VOITURE_MATERIEL="reel")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+        self.assertEqual(output.stdout.strip().splitlines()[-1], "[]")
+
+    def test_unknown_backend_and_missing_world(self):
+        with self.assertRaises(ValueError):
+            Hardware.select("arduino")
+        with self.assertRaises(ValueError):
+            Hardware.select("simulation")
+
+    def test_motor_commands_reach_mock_gpio_and_i2c(self):
+        ControllerMotor = importlib.import_module("ControllerMotor").ControllerMotor
+        motor = ControllerMotor()
+        motor.forward(100)
+        pins = MockHardware.state.pins
+        self.assertEqual((pins[17], pins[18], pins[27], pins[22]), (1, 0, 1, 0))
+        pca = MockHardware.state.pca9685()
+        self.assertEqual([pca.channel(channel)["duty"] for channel in (4, 5)], [4095, 4095])
+
+    def test_no_motor_write_follows_emergency_stop(self):
+        ControllerMotor = importlib.import_module("ControllerMotor").ControllerMotor
+        EmergencyStop = importlib.import_module("Watchdog").EmergencyStop
+        motor = ControllerMotor(ramp=True, acceleration=20, tick=0.002)
+        self.addCleanup(motor.close)
+        stop = EmergencyStop(halt=motor.halt)
+        motor.forward(100)  # Rampe de 5 s : le thread écrit une nouvelle consigne à chaque période
+        time.sleep(0.05)
+        bus, pca = MockHardware.state.bus(), MockHardware.state.pca9685()
+        self.assertGreater(pca.channel(4)["duty"], 0)
+        stop.trigger()
+        transactions = bus.transactions
+        time.sleep(0.05)
+        self.assertEqual(bus.transactions, transactions)
+        self.assertEqual([pca.channel(channel)["full_off"] for channel in (4, 5)], [True, True])
+        motor.reset_after_emergency_stop()
+        motor.forward(100)
+        time.sleep(0.05)
+        self.assertGreater(pca.channel(4)["duty"], 0)  # Écritures de nouveau permises
+
+    def test_avoidance_turns_keep_the_historical_pulses(self):
+        car = importlib.import_module("ControllerCar").ControllerCar()
+        self.addCleanup(car.motor_ctrl.close)
+        car.duree_virage = 0.01
+        pulses = []
+        car.servo_ctrl.pwm.write = lambda channel, on, off: pulses.append(off)
+        car.handle_left_obstacle()
+        car.handle_right_obstacle()
+        # Virages par rotate (248 / 428), retour au centre par setToDegree(angle_central)
+        self.assertEqual(pulses, [248, 395, 428, 395])
+        self.assertEqual(car.servo_ctrl.current_angle, 0)
+
+    def test_distance_sensor_reads_mock_state(self):
+        CapteurDistance = importlib.import_module("CapteurDistance").CapteurDistance
+        MockHardware.state.distances[9] = 0.5
+        capteur = CapteurDistance(trigger=11, echo=9, sensor_sample_count=2, sensor_sample_delay=0.001)
+        self.assertAlmostEqual(capteur.get_distance(), 50.0)
+
+    def test_simulation_reads_world(self):
+        Hardware.select("simulation", world=World())
+        CapteurDistance = importlib.import_module("CapteurDistance").CapteurDistance
+        LineFollower = importlib.import_module("LineFollower").LineFollower
+        capteur = CapteurDistance(trigger=11, echo=9, sensor_sample_count=1, sensor_sample_delay=0.001)
+        self.assertAlmostEqual(capteur.get_distance(), 30.0)
+        self.assertTrue(LineFollower(gpio_pin=20).sensor.is_active)
+        rgb = lazy("adafruit_tcs34725").TCS34725(lazy("busio").I2C(None, None))
+        self.assertEqual(rgb.color_raw, (10, 200, 10, 250))
+
+    def test_backend_switch_reloads_proxies(self):
+        smbus = lazy("smbus")
+        self.assertIs(smbus.SMBus, MockHardware.SMBus)
+        Hardware.select("reel")
+        real = type(sys)("smbus")
+        real.SMBus = object
+        with patch.dict('sys.modules', {'smbus': real}):
+            self.assertIs(smbus.SMBus, object)
+
+    def test_proxy_forwards_patch(self):
+        busio = lazy("busio")
+        with patch.object(busio, "I2C", return_value="bus"):
+            self.assertEqual(busio.I2C(), "bus")
+        self.assertIs(busio.I2C, MockHardware.I2C)
+
+    def test_lazy_attribute_resolves_at_call(self):
+        sensor = lazy_attr("gpiozero", "DigitalInputDevice")(7)
+        MockHardware.state.lines[7] = True
+        self.assertTrue(sensor.is_active)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.Manoeuvre import Manoeuvre, ManoeuvreRunner, Step, LIBRE
+
+
+class TestManoeuvre(unittest.TestCase):
+
+    def setUp(self):
+        self.outputs = []
+        self.released = 0
+        self.sense_count = 0
+
+        def release():
+            self.released += 1
+
+        def sense():
+            self.sense_count += 1
+
+        self.runner = ManoeuvreRunner(
+            lambda angle: self.outputs.append(("servo", angle)),
+            lambda speed, spin, immediate: self.outputs.append(("moteur", speed, spin) + (("immédiat",) if immediate else ())),
+            release_steer=release,
+            sense=sense,
+            conditions={"toujours": lambda: True, "jamais": lambda: False},
+            tick=0.005,
+            apply_turn=lambda turn: self.outputs.append(("rotate", turn)),
+        )
+
+    def test_only_changed_outputs_are_written(self):
+        report = self.runner.run(Manoeuvre("test", [
+            Step(steer=45, speed=35, duration=0.01),
+            Step(steer=15, speed=35, duration=0.01),
+            Step(steer=45),
+            Step(steer=LIBRE),
+        ]))
+        self.assertEqual(self.outputs, [("servo", 45), ("moteur", 35, False), ("servo", 15), ("servo", 45)])
+        self.assertEqual(self.released, 1)
+        self.assertTrue(report["completed"])
+        self.assertEqual(len(report["steps"]), 4)
+        self.assertGreater(self.sense_count, 0)
+
+    def test_immediate_stop(self):
+        self.runner.run(Manoeuvre("urgence", [
+            Step(speed=35),
+            Step(speed=0),
+            Step(speed=0, immediate=True),  # Même vitesse, mais l'arrêt sans rampe doit être écrit
+        ]))
+        self.assertEqual(self.outputs, [("moteur", 35, False), ("moteur", 0, False), ("moteur", 0, False, "immédiat")])
+        with self.assertRaises(ValueError):
+            Step(speed=-40, immediate=True)
+
+    def test_computed_steer(self):
+        self.runner.run(Manoeuvre("calcul", [Step(steer=lambda: 75)]))
+        self.assertEqual(self.outputs, [("servo", 75)])
+
+    def test_relative_turns_go_through_apply_turn(self):
+        self.runner.run(Manoeuvre("virage", [
+            Step(turn=-30, speed=35),
+            Step(turn=lambda: -30),
+            Step(steer=45),
+            Step(turn=30),
+        ]))
+        self.assertEqual(self.outputs, [("rotate", -30), ("moteur", 35, False), ("servo", 45), ("rotate", 30)])
+        with self.assertRaises(ValueError):
+            Step(steer=45, turn=30)
+
+    def test_abort_condition_stops_manoeuvre(self):
+        report = self.runner.run(Manoeuvre("arret", [
+            Step(speed=35, duration=1, abort="toujours", name="avance"),
+            Step(speed=0),
+        ]))
+        self.assertFalse(report["completed"])
+        self.assertEqual(report["aborted_by"], "toujours")
+        self.assertEqual(self.outputs, [("moteur", 35, False)])
+        self.assertLess(report["actual_s"], 0.5)
+
+    def test_cancel_from_another_thread(self):
+        timer = threading.Timer(0.05, self.runner.cancel)
+        timer.start()
+        report = self.runner.run(Manoeuvre("longue", [Step(speed=50, spin=True, duration=5, abort="jamais")]))
+        timer.join()
+        self.assertEqual(report["aborted_by"], "annulation")
+        self.assertLess(report["actual_s"], 1)
+
+    def test_cancel_before_run_is_not_lost(self):
+        self.runner.cancel()  # Arrêt demandé entre deux manœuvres
+        report = self.runner.run(Manoeuvre("suivante", [Step(speed=35, duration=1)]))
+        self.assertEqual(report["aborted_by"], "annulation")
+        self.assertEqual(self.outputs, [])
+        self.assertEqual(self.runner.run(Manoeuvre("encore", [Step(speed=35)]))["aborted_by"], "annulation")
+        self.runner.resume()  # Nouvelle session explicite
+        self.assertTrue(self.runner.run(Manoeuvre("session", [Step(speed=35)]))["completed"])
+        self.assertEqual(self.outputs, [("moteur", 35, False)])
+
+    def test_unknown_condition(self):
+        with self.assertRaises(ValueError):
+            self.runner.run(Manoeuvre("inconnue", [Step(speed=0, abort="absente")]))
+
+    def test_load_from_json(self):
+        data = {"name": "slalom", "steps": [{"steer": 15, "speed": 35, "duration": 0.4},
+                                            {"turn": 30, "duration": 0.4, "abort": "jamais"}]}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "manoeuvres.json")
+            with open(path, "w") as f:
+                json.dump([data], f)
+            manoeuvres = Manoeuvre.load(path)
+        self.assertAlmostEqual(manoeuvres["slalom"].planned_duration, 0.8)
+        self.assertEqual(manoeuvres["slalom"].to_dict(), data)
+
+    def test_invalid_steps(self):
+        with self.assertRaises(ValueError):
+            Step(speed=150)
+        with self.assertRaises(ValueError):
+            Manoeuvre.from_dict({"name": "x", "steps": [{"vitesse": 10}]})
+        with self.assertRaises(ValueError):
+            Manoeuvre("vide", [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.OccupancyGrid import OccupancyGrid
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOccupancyGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.grid = OccupancyGrid(clock=self.clock)
+
+    def test_measurement_marks_obstacle_and_free_space(self):
+        self.grid.add_measurement("left", 0.5)
+        self.assertGreater(self.grid.occupancy(0.0, -0.5), 0.6)
+        self.assertLess(self.grid.occupancy(0.0, -0.25), 0.5)
+        self.assertEqual(self.grid.occupancy(0.0, 0.5), 0.5)  # Côté droit inconnu
+
+    def test_best_turn_remembers_walls(self):
+        """Un mur vu à gauche il y a une seconde oriente encore le virage vers la droite."""
+        for _ in range(3):
+            self.grid.add_distances({"left": 0.4, "right": 2.5, "front": 1.5})
+        self.clock.now += 1.0
+        self.assertEqual(self.grid.best_turn(), "right")
+
+    def test_walls_follow_car_motion(self):
+        """Après un demi-tour, le mur vu à gauche se retrouve du côté droit."""
+        for _ in range(3):
+            self.grid.add_measurement("left", 0.4)
+        self.grid.update_pose(0.0, 0.0, 180.0)
+        self.assertEqual(self.grid.best_turn(), "left")
+
+    def test_decay_forgets_old_obstacles(self):
+        self.grid.add_measurement("left", 0.4)
+        cost = self.grid.side_cost("left")
+        self.clock.now += self.grid.half_life
+        self.assertAlmostEqual(self.grid.side_cost("left"), cost / 2, places=3)
+        self.clock.now += 20 * self.grid.half_life
+        self.assertIsNone(self.grid.best_turn())
+
+    def test_memory_is_bounded_when_driving_far(self):
+        shape, nbytes = self.grid.grid.shape, self.grid.grid.nbytes
+        self.grid.add_measurement("left", 0.4)
+        for step in range(1, 200):
+            self.grid.update_pose(step * 0.5, 0.0, 0.0)
+            self.grid.add_measurement("front", 1.0)
+        self.assertEqual(self.grid.grid.shape, shape)
+        self.assertEqual(self.grid.grid.nbytes, nbytes)
+        self.assertEqual(self.grid.occupancy(0.0, -0.4), 0.5)  # Sorti de la grille : oublié
+        self.assertGreater(self.grid.occupancy(100.475, 0.0), 0.5)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            OccupancyGrid(size=4.0)
+        with self.assertRaises(ValueError):
+            self.grid.add_measurement("arriere", 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import importlib
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture import Hardware
+from projet_voiture.PCA9685Emulator import (I2CBus, SMBus, MODE1, PRESCALE, LED0_ON_L, ALL_LED_ON_L,
+                                            AUTO_INCREMENT, SLEEP)
+import MockHardware
+
+
+class TestPCA9685Registers(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = I2CBus()
+        self.smbus = SMBus(self.bus)
+        self.pca = self.bus.devices[0x40]
+
+    def test_power_on_state(self):
+        self.assertTrue(self.pca.sleeping)
+        self.assertTrue(all(self.pca.channel(c)["full_off"] for c in range(16)))
+        self.assertAlmostEqual(self.pca.frequency, 25e6 / (4096 * 31))
+
+    def test_prescale_only_written_in_sleep(self):
+        self.smbus.write_byte_data(0x40, MODE1, 0x01)
+        self.smbus.write_byte_data(0x40, PRESCALE, 101)
+        self.assertEqual(self.pca.registers[PRESCALE], 0x1E)
+        self.smbus.write_byte_data(0x40, MODE1, 0x01 | SLEEP)
+        self.smbus.write_byte_data(0x40, PRESCALE, 101)
+        self.assertEqual(self.pca.registers[PRESCALE], 101)
+
+    def test_block_write_needs_auto_increment(self):
+        self.smbus.write_i2c_block_data(0x40, LED0_ON_L, [0, 0, 0x00, 0x08])
+        self.assertEqual(self.pca.registers[LED0_ON_L], 0x08)  # Tous les octets dans le même registre
+        self.smbus.write_byte_data(0x40, MODE1, AUTO_INCREMENT)
+        self.smbus.write_i2c_block_data(0x40, LED0_ON_L, [0, 0, 0x00, 0x08])
+        self.assertEqual(self.pca.channel(0), {"on": 0, "off": 2048, "full_on": False, "full_off": False, "duty": 2048})
+
+    def test_all_led_broadcast(self):
+        self.smbus.write_byte_data(0x40, MODE1, AUTO_INCREMENT)
+        self.smbus.write_i2c_block_data(0x40, ALL_LED_ON_L, [0, 0, 0, 0x10])
+        self.assertTrue(all(self.pca.channel(c)["full_off"] for c in range(16)))
+        self.assertEqual(self.smbus.read_byte_data(0x40, ALL_LED_ON_L), 0)
+
+    def test_restart_bit_reads_zero(self):
+        self.smbus.write_byte_data(0x40, MODE1, 0x81)
+        self.assertEqual(self.smbus.read_byte_data(0x40, MODE1), 0x01)
+
+    def test_transactions_and_timing(self):
+        self.smbus.write_byte_data(0x40, MODE1, 0x01)
+        self.smbus.read_byte_data(0x40, MODE1)
+        stats = self.bus.stats()
+        self.assertEqual(stats["transactions"], 2)
+        self.assertEqual(stats["bytes"], 3 + 4)
+        self.assertAlmostEqual(stats["bus_time_ms"], (29 + 39) / 100.0)
+
+    def test_missing_device(self):
+        with self.assertRaises(OSError):
+            self.smbus.write_byte_data(0x41, MODE1, 0)
+
+
+class TestDriversOnEmulator(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.dict('sys.modules')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in ("PWM", "ControllerMotor", "ControllerServo"):
+            sys.modules.pop(name, None)
+        self.addCleanup(Hardware.select, "reel")
+        self.addCleanup(MockHardware.state.reset)
+        Hardware.select("mock")
+        MockHardware.state.reset()
+        self.pca = MockHardware.state.pca9685()
+        self.bus = MockHardware.state.bus(1)
+
+    def test_pwm_init_wakes_chip_at_60hz(self):
+        PWM = importlib.import_module("PWM").PWM
+        PWM()
+        self.assertFalse(self.pca.sleeping)
+        self.assertEqual(self.pca.registers[PRESCALE], 101)
+        self.assertAlmostEqual(self.pca.frequency, 59.8, places=1)
+
+    def test_forward_register_state_and_cost(self):
+        motor = importlib.import_module("ControllerMotor").ControllerMotor()
+        self.bus.reset_counters()
+        motor.forward(50)
+        duty = motor.commanded_duty[0]
+        for channel in (4, 5):
+            self.assertEqual(self.pca.channel(channel)["duty"], duty)
+        self.assertEqual(self.bus.transactions, 8)
+        motor.forward(50)
+        self.assertEqual(self.bus.transactions, 8)
+
+    def test_rotate_register_state(self):
+        servo = importlib.import_module("ControllerServo").ControllerServo()
+        servo.rotate(20)
+        self.assertEqual(self.pca.channel(0)["duty"], servo.lut.pulse(20))
+        servo.disable_pwm()
+        self.assertTrue(self.pca.channel(0)["full_off"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import importlib
+import os
+import sys
+import tempfile
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture import Hardware
+import MockHardware
+
+
+class TestBusDetection(unittest.TestCase):
+
+    def setUp(self):
+        # Module réimporté à neuf : d'autres tests remplacent PWM par un MagicMock
+        patcher = patch.dict('sys.modules')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.modules.pop("PWM", None)
+        self.pwm = importlib.import_module("PWM")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.model = os.path.join(self.tmp.name, "model")
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop(self.pwm.BUS_ENV, None)
+        patch.object(self.pwm, "MODEL_PATHS", (self.model,)).start()
+        patch.object(self.pwm, "DEV_DIR", self.tmp.name).start()
+        self.addCleanup(patch.stopall)
+
+    def board(self, model, buses):
+        with open(self.model, "wb") as f:
+            f.write(model.encode() + b"\x00")
+        for n in buses:
+            open(os.path.join(self.tmp.name, f"i2c-{n}"), "w").close()
+
+    def test_current_board_uses_bus_1(self):
+        self.board("Raspberry Pi 5 Model B Rev 1.0", [1, 13, 14])
+        self.assertEqual(self.pwm.board_model(), "Raspberry Pi 5 Model B Rev 1.0")
+        self.assertEqual(self.pwm.i2c_buses(), [1, 13, 14])
+        self.assertEqual(self.pwm.detect_bus_number(), 1)
+
+    def test_legacy_board_uses_bus_0(self):
+        self.board("Raspberry Pi Model B Rev 1", [0, 1])
+        self.assertEqual(self.pwm.detect_bus_number(), 0)
+
+    def test_result_is_cached(self):
+        self.board("Raspberry Pi 4 Model B Rev 1.4", [1])
+        self.assertEqual(self.pwm.detect_bus_number(), 1)
+        with patch.object(self.pwm, "i2c_buses", side_effect=AssertionError("détection refaite")):
+            self.assertEqual(self.pwm.detect_bus_number(), 1)
+
+    def test_override(self):
+        os.environ[self.pwm.BUS_ENV] = "3"
+        self.assertEqual(self.pwm.detect_bus_number(), 3)
+        os.environ[self.pwm.BUS_ENV] = "un"
+        with self.assertRaises(ValueError):
+            self.pwm.detect_bus_number()
+
+    def test_no_bus_is_a_clear_error(self):
+        self.board("Raspberry Pi 4 Model B Rev 1.4", [20, 21])
+        with self.assertRaises(RuntimeError) as context:
+            self.pwm.detect_bus_number()
+        self.assertIn("Raspberry Pi 4", str(context.exception))
+        self.assertIn("/dev/i2c-20", str(context.exception))
+
+    def test_scan_addresses(self):
+        output = ("     0  1  2  3  4  5  6  7  8  9  a  b  c  d  e  f\n"
+                  "00:                         -- -- -- -- -- -- -- -- \n"
+                  "40: 40 -- -- -- -- -- -- -- -- -- -- -- -- -- -- -- \n"
+                  "70: 70 -- -- -- -- -- -- UU                         \n")
+        with patch("subprocess.run", return_value=MagicMock(stdout=output)):
+            self.assertEqual(self.pwm.scan_addresses(1), [0x40, 0x70])
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            self.assertIsNone(self.pwm.scan_addresses(1))
+
+
+class TestPWMErrors(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.dict('sys.modules')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.modules.pop("PWM", None)
+        self.addCleanup(Hardware.select, "reel")
+        self.addCleanup(MockHardware.state.reset)
+        Hardware.select("mock")
+        MockHardware.state.reset()
+        self.module = importlib.import_module("PWM")
+
+    def test_frequency_getter(self):
+        self.assertEqual(self.module.PWM().frequency, 60)
+
+    def test_i2c_failure_raises_instead_of_quitting(self):
+        pwm = self.module.PWM()
+        pwm.address = 0x41  # Aucun esclave à cette adresse
+        with patch.object(self.module, "scan_addresses", return_value=[0x40]):
+            with self.assertRaises(RuntimeError) as context:
+                pwm.write(0, 0, 100)
+        self.assertIn("0x41", str(context.exception))
+        self.assertIsInstance(context.exception.__cause__, OSError)
+
+
+if __name__ == '__main__':
+    unittest.main()
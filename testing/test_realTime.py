@@ -0,0 +1,96 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.RealTime import RealTimeConfig, LoopTimer, IterationTimer, measure_jitter
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, duration):
+        self.now += duration + 0.001  # Réveil systématiquement en retard d'1 ms
+
+
+class TestRealTimeConfig(unittest.TestCase):
+
+    def test_invalid_settings_are_rejected(self):
+        with self.assertRaises(ValueError):
+            RealTimeConfig(policy="idle")
+        with self.assertRaises(ValueError):
+            RealTimeConfig(policy="fifo", priority=0)
+        with self.assertRaises(ValueError):
+            RealTimeConfig(cpu=(os.cpu_count() or 1))
+
+    def test_disabled_by_default(self):
+        self.assertFalse(RealTimeConfig().enabled)
+        self.assertEqual(RealTimeConfig().apply(), {})
+
+    def test_refused_settings_are_reported_not_raised(self):
+        config = RealTimeConfig(cpu=0, policy="fifo", priority=50)
+        with patch("os.sched_setaffinity", side_effect=PermissionError("Operation not permitted"), create=True), \
+                patch("os.sched_setscheduler", side_effect=PermissionError("Operation not permitted"), create=True), \
+                patch("os.SCHED_FIFO", 1, create=True):
+            report = config.apply()
+        self.assertEqual(set(report), {"affinite", "ordonnancement"})
+        self.assertIn("not permitted", report["affinite"])
+
+    def test_settings_are_applied_to_calling_thread(self):
+        config = RealTimeConfig(cpu=0, policy="rr", priority=10)
+        with patch("os.sched_setaffinity", create=True) as affinity, \
+                patch("os.sched_setscheduler", create=True) as scheduler, \
+                patch("os.SCHED_RR", 2, create=True):
+            report = config.apply()
+        affinity.assert_called_once_with(0, {0})
+        self.assertEqual(scheduler.call_args[0][:2], (0, 2))
+        self.assertEqual(report, {"affinite": "ok", "ordonnancement": "ok"})
+
+
+class TestLoopTimer(unittest.TestCase):
+
+    def test_lateness_and_overruns(self):
+        clock = FakeClock()
+        timer = LoopTimer(0.1, clock=clock, sleep=clock.sleep)
+        timer.restart()
+        for _ in range(5):
+            timer.wait()
+        clock.now += 0.5  # Période trop longue
+        timer.wait()
+        report = timer.report()
+        self.assertEqual(report["ticks"], 6)
+        self.assertEqual(report["overruns"], 1)
+        self.assertAlmostEqual(timer.lateness[0], 0.001)
+        self.assertGreater(report["max_late_ms"], 100)
+
+    def test_iteration_timer_measures_spread_around_median(self):
+        clock = FakeClock()
+        timer = IterationTimer(tolerance=0.02, clock=clock)
+        timer.restart()
+        for duration in (0.12, 0.12, 0.125, 0.12, 0.18):  # Lectures de ~120 ms, plus longues que 0.1 s
+            clock.now += duration
+            timer.record()
+        report = timer.report()
+        self.assertEqual((report["ticks"], report["overruns"]), (5, 1))
+        self.assertAlmostEqual(report["median_ms"], 120)
+        self.assertAlmostEqual(report["max_late_ms"], 60)
+        self.assertAlmostEqual(report["mean_late_ms"], 13)
+        clock.now += 5  # Manœuvre : pas comptée comme une itération
+        timer.restart()
+        self.assertEqual(timer.report()["ticks"], 5)
+        self.assertEqual(IterationTimer().report()["ticks"], 0)
+
+    def test_measure_jitter(self):
+        report = measure_jitter(None, period=0.005, duration=0.1)
+        self.assertGreater(report["ticks"], 10)
+        self.assertEqual(report["reglages"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.SensorSnapshot import SensorSnapshot
+
+
+class FakeSensors:
+    """Capteurs simulés : compte les lectures et avance l'horloge de 50 ms par lecture."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.reads = []
+        self.values = {"front": 80.0, "left": 30.0, "right": 60.0}
+
+    def clock(self):
+        return self.now
+
+    def read(self, sensor):
+        self.reads.append(sensor)
+        self.now += 0.05
+        return self.values[sensor]
+
+
+class TestSensorSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.sensors = FakeSensors()
+
+    def test_measure_all_sensors(self):
+        snapshot = SensorSnapshot.measure(self.sensors.read, clock=self.sensors.clock)
+        self.assertEqual(snapshot.distances(), {"front": 80.0, "left": 30.0, "right": 60.0})
+        self.assertEqual(self.sensors.reads, ["front", "left", "right"])
+        self.assertAlmostEqual(snapshot.age(now=0.15), 0.1)
+
+    def test_snapshot_is_immutable(self):
+        snapshot = SensorSnapshot.measure(self.sensors.read, clock=self.sensors.clock)
+        with self.assertRaises(AttributeError):
+            snapshot.front = 10
+
+    def test_partial_refresh_keeps_other_values(self):
+        snapshot = SensorSnapshot.measure(self.sensors.read, clock=self.sensors.clock)
+        self.sensors.values["left"] = 90.0
+        self.sensors.values["front"] = 5.0
+        refreshed = SensorSnapshot.measure(self.sensors.read, ("left",), base=snapshot, clock=self.sensors.clock)
+        self.assertEqual(refreshed.left, 90.0)
+        self.assertEqual(refreshed.front, 80.0)
+        self.assertEqual(snapshot.left, 30.0)
+        self.assertTrue(refreshed.is_fresh(0.01, ("left",), now=self.sensors.now))
+        self.assertFalse(refreshed.is_fresh(0.01, now=self.sensors.now))
+
+    def test_partial_measure_requires_base(self):
+        with self.assertRaises(ValueError):
+            SensorSnapshot.measure(self.sensors.read, ("left",))
+        with self.assertRaises(ValueError):
+            SensorSnapshot.measure(self.sensors.read, ("arriere",), base=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
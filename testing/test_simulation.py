@@ -0,0 +1,214 @@
+import unittest
+import importlib
+import io
+import math
+import os
+import sys
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# NumPy chargé une seule fois, hors des tests : sys.modules est restauré après chaque test
+importlib.import_module("numpy")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture import Hardware
+import MockHardware
+
+PROJECT_MODULES = ("PWM", "ControllerMotor", "ControllerServo", "CapteurDistance", "ControllerCar",
+                   "Simulation", "ParameterSweep")
+
+
+class SimulationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # Modules du projet réimportés à neuf (d'autres tests remplacent PWM par un MagicMock)
+        patcher = patch.dict('sys.modules')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in PROJECT_MODULES:
+            sys.modules.pop(name, None)
+        self.addCleanup(Hardware.select, "reel")
+        self.addCleanup(MockHardware.state.reset)
+        self.simulation = importlib.import_module("Simulation")
+
+
+class TestTrackAndWorld(SimulationTestCase):
+
+    def test_raycast_and_clearance(self):
+        track = self.simulation.Track.oval(obstacles=())
+        self.assertAlmostEqual(track.raycast(2.0, 0.6, 0.0, 10.0), 4.0)          # Mur extérieur droit (x = 6)
+        self.assertAlmostEqual(track.raycast(2.0, 0.6, math.pi / 2, 10.0), 0.6)  # Îlot central (y = 1.2)
+        self.assertIsNone(track.raycast(2.0, 0.6, 0.0, 3.0))                     # Au-delà de la portée
+        self.assertAlmostEqual(track.clearance(2.0, 0.6), 0.6)
+
+    def test_kinematics_and_collision(self):
+        world = self.simulation.SimulatedWorld(self.simulation.Track.oval(obstacles=()), sensor_noise=0)
+        world.command = 50
+        world.advance(3.0)
+        self.assertAlmostEqual(world.speed, 1.0, places=2)      # 50 % de 2 m/s
+        self.assertAlmostEqual(world.y, 0.6)                    # Roues droites
+        self.assertAlmostEqual(world.time, 3.0)
+        world.advance(5.0)
+        self.assertEqual(world.collisions, 1)                   # Bloquée contre le mur, comptée une fois
+        self.assertAlmostEqual(world.x, 6.0 - world.radius, places=1)
+        self.assertAlmostEqual(world.measure("front"), 0.0, places=1)
+
+    def test_lap_counting(self):
+        world = self.simulation.SimulatedWorld(self.simulation.Track.oval(obstacles=()))
+        center_x, center_y = world.track.center
+        start = math.atan2(world.y - center_y, world.x - center_x)
+        for step in range(1, 102):
+            # Déplacement forcé autour du centre, dans le sens trigonométrique, depuis le départ
+            angle = start + 2 * math.pi * step / 100
+            world.x, world.y = center_x + 1.5 * math.cos(angle), center_y + 1.5 * math.sin(angle)
+            world.advance(0.01)
+        self.assertEqual(len(world.lap_times), 1)
+        self.assertAlmostEqual(world.progress, 1.01, places=2)
+
+
+class TestSimulatedCar(SimulationTestCase):
+
+    def test_controller_logic_runs_in_virtual_time(self):
+        metrics = self.simulation.simulate(duration=20)
+        self.assertGreaterEqual(metrics["sim_time_s"], 20)
+        self.assertLess(metrics["wall_time_s"], 20)
+        self.assertGreater(metrics["manoeuvres"], 0)  # Le mur du premier virage déclenche les manœuvres
+        self.assertGreater(metrics["progress"], 0)
+
+    def test_reproducible_and_sensitive_to_tuning(self):
+        first = self.simulation.simulate({"motor_speed_forwards": 40}, duration=10, seed=3)
+        second = self.simulation.simulate({"motor_speed_forwards": 40}, duration=10, seed=3)
+        for key in ("progress", "collisions", "manoeuvres", "distance_m"):
+            self.assertEqual(first[key], second[key])
+        slow = self.simulation.simulate({"motor_speed_forwards": 20}, duration=3, seed=3)
+        fast = self.simulation.simulate({"motor_speed_forwards": 60}, duration=3, seed=3)
+        self.assertGreater(fast["distance_m"], slow["distance_m"])
+
+    def test_sensor_statuses_degrade_instead_of_stopping(self):
+        capteur = importlib.import_module("CapteurDistance")
+        world = self.simulation.SimulatedWorld(self.simulation.Track.oval())
+        Hardware.select("simulation", world=world)
+        car = self.simulation.SimulatedCar(world, duration=5)
+        read = car.distance_from_reading
+        self.assertEqual(read("front", capteur.Reading(55.0, capteur.OK)), 55.0)
+        self.assertEqual(read("front", capteur.Reading(1.0, capteur.TROP_PROCHE)), capteur.DISTANCE_MIN)
+        self.assertEqual(read("front", capteur.Reading(450.0, capteur.SATURE)), 400)
+        self.assertEqual(read("left", capteur.Reading(None, capteur.PAS_D_ECHO)), 400)  # Aucune mesure connue
+        car.take_snapshot()
+        held = car.last_snapshot.left
+        with redirect_stdout(io.StringIO()):
+            values = [read("left", capteur.Reading(None, capteur.PAS_D_ECHO)) for _ in range(car.echo_loss_limit + 1)]
+        self.assertEqual(values, [held] * car.echo_loss_limit + [400])
+
+        # Un écho perdu sur trois : la course va jusqu'au bout
+        class FlakySensor:
+            def __init__(self, sensor):
+                self.sensor, self.reads = sensor, 0
+
+            @property
+            def distance(self):
+                self.reads += 1
+                if self.reads % 3 == 0:
+                    raise RuntimeError("pas d'écho")
+                return self.sensor.distance
+
+        car.capteur_front.capteur.sensor = FlakySensor(car.capteur_front.capteur.sensor)
+        with redirect_stdout(io.StringIO()):
+            car.run()
+        self.assertGreaterEqual(world.time, 5)
+        self.assertGreater(car.get_sensor_counts()["front"][capteur.PAS_D_ECHO], 0)
+
+    def test_threshold_loop_records_jitter(self):
+        world = self.simulation.SimulatedWorld(self.simulation.Track.oval())
+        Hardware.select("simulation", world=world)
+        car = self.simulation.SimulatedCar(world, duration=2)
+        self.assertIsNone(car.get_loop_jitter())
+        with redirect_stdout(io.StringIO()):
+            car.run()
+        jitter = car.get_loop_jitter()
+        self.assertGreater(jitter["ticks"], 0)
+        self.assertGreater(jitter["median_ms"], 0)  # Durée d'une itération (lectures comprises)
+        self.assertLess(jitter["overruns"], jitter["ticks"])
+
+    def test_cancel_between_manoeuvres_is_kept_until_run(self):
+        world = self.simulation.SimulatedWorld(self.simulation.Track.oval())
+        Hardware.select("simulation", world=world)
+        car = self.simulation.SimulatedCar(world, duration=10)
+        reports = []
+        run = car.manoeuvres.run
+        car.manoeuvres.run = lambda manoeuvre: reports.append(run(manoeuvre)) or reports[-1]
+        with redirect_stdout(io.StringIO()):
+            car.cleanup()  # Annule : la manœuvre suivante ne doit pas démarrer
+            self.assertEqual(car.handle_left_obstacle()["aborted_by"], "annulation")
+            car.run()     # Nouvelle session : les manœuvres s'exécutent de nouveau
+        self.assertTrue(any(report["completed"] for report in reports[1:]))
+
+    def test_speed_getters_are_read_only(self):
+        world = self.simulation.SimulatedWorld(self.simulation.Track.oval())
+        Hardware.select("simulation", world=world)
+        car = self.simulation.SimulatedCar(world, duration=1)
+        car.apply_speed(50)
+        car.update_speed_estimate()
+        world.advance(0.5)
+        car.update_speed_estimate()
+        before = car.speed_estimator.state()
+        world.advance(0.5)  # Le temps passe, mais seule la boucle de contrôle fait avancer l'estimation
+        self.assertEqual(car.get_speed_estimate(), before)
+        self.assertEqual(car.get_speed(), before["speed"])
+        self.assertEqual(car.speed_estimator.state(), before)
+
+    def test_fast_boot_centres_wheels_without_sweep(self):
+        world = self.simulation.SimulatedWorld(self.simulation.Track.oval())
+        Hardware.select("simulation", world=world)
+        car = self.simulation.SimulatedCar(world, duration=1)
+        car.servo_ctrl.setToDegree(car.angle_central + 30)
+        start = world.time
+        self.assertFalse(car.init_servo(sweep=False))
+        self.assertEqual(car.servo_ctrl.current_angle, 0)
+        self.assertEqual(world.time, start)  # Aucun balayage
+
+    def test_invalid_tuning_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.simulation.simulate({"side_threshold": -5}, duration=1)
+
+
+class TestParameterSweep(SimulationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.sweep = importlib.import_module("ParameterSweep")
+
+    def test_grid_and_parsing(self):
+        grid = self.sweep.parse_assignments(["side_threshold=10,15", "duree_virage=0.3,0.5"], ",")
+        self.assertEqual(grid, {"side_threshold": [10, 15], "duree_virage": [0.3, 0.5]})
+        self.assertEqual(len(self.sweep.grid_configs(grid)), 4)
+        with self.assertRaises(ValueError):
+            self.sweep.parse_assignments(["vitesse=10"], ",")
+
+    def test_random_configs_are_valid(self):
+        configs = self.sweep.random_configs(50, seed=1)
+        self.assertEqual(len(configs), 50)
+        tuning = importlib.import_module("Tuning")
+        for config in configs:
+            self.assertEqual(tuning.validate(dict(tuning.DEFAULTS, **config)), [])
+        self.assertEqual(configs, self.sweep.random_configs(50, seed=1))
+
+    def test_score(self):
+        base = {"progress": 0.5, "sim_time_s": 60, "collisions": 0, "manoeuvres": 0, "error": None}
+        self.assertAlmostEqual(self.sweep.score(base, 60), 120)
+        self.assertAlmostEqual(self.sweep.score(dict(base, collisions=2, manoeuvres=5), 60),
+                               120 + 2 * self.sweep.COLLISION_PENALTY + 5 * self.sweep.MANOEUVRE_PENALTY)
+        # Arrêt sur erreur à 10 s : immobile jusqu'à la fin de la course
+        self.assertAlmostEqual(self.sweep.score(dict(base, sim_time_s=10, error="x"), 60), 120 + self.sweep.ERROR_PENALTY)
+        self.assertEqual(self.sweep.score(dict(base, progress=0), 60), math.inf)
+
+    def test_sweep_skips_invalid_and_sorts(self):
+        configs = [{"motor_speed_forwards": 20}, {"motor_speed_forwards": 50}, {"front_threshold": 10}]
+        results, rejected = self.sweep.run_sweep(configs, processes=2, duration=5)
+        self.assertEqual(rejected, 1)
+        self.assertEqual(len(results), 2)
+        self.assertLessEqual(results[0][1]["score"], results[1][1]["score"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.SpeedEstimator import SpeedEstimator
+
+
+class TestSpeedEstimator(unittest.TestCase):
+
+    def test_model_speed_with_dead_band(self):
+        estimator = SpeedEstimator(gain=0.02, dead_band=10)
+        self.assertEqual(estimator.model_speed(5), 0.0)
+        self.assertAlmostEqual(estimator.model_speed(60), 1.0)
+        self.assertAlmostEqual(estimator.model_speed(-60), -1.0)
+
+    def test_speed_converges_to_model_without_measurement(self):
+        """Sans capteur avant, la vitesse suit le modèle avec le retard du premier ordre et la confiance baisse."""
+        estimator = SpeedEstimator(gain=0.02, time_constant=0.3)
+        t = 0.0
+        estimator.update(50, timestamp=t)
+        for _ in range(100):
+            t += 0.02
+            state = estimator.update(50, timestamp=t)
+        self.assertAlmostEqual(state["speed"], 1.0, places=2)
+        self.assertAlmostEqual(state["odometer"], 2.0 - 0.3, delta=0.05)
+        self.assertLess(state["confidence"], 0.5)
+
+    def test_front_distance_corrects_model(self):
+        """Le modèle surestime la vitesse : la variation de distance avant ramène l'estimation à 0.5 m/s."""
+        estimator = SpeedEstimator(gain=0.02, time_constant=0.05)
+        t, distance = 0.0, 3.0
+        estimator.update(50, front_distance=distance, timestamp=t)
+        for _ in range(100):
+            t += 0.05
+            distance -= 0.5 * 0.05
+            state = estimator.update(50, front_distance=distance, timestamp=t)
+        self.assertAlmostEqual(state["speed"], 0.5, delta=0.1)
+        self.assertGreater(state["confidence"], 0.5)
+
+    def test_jump_in_front_distance_is_rejected(self):
+        """Un nouvel obstacle qui apparaît devant ne doit pas être pris pour une vitesse énorme."""
+        estimator = SpeedEstimator(gain=0.02, time_constant=0.05)
+        t = 0.0
+        for distance in (3.0, 2.975, 2.95, 2.925, 1.0):
+            state = estimator.update(50, front_distance=distance, timestamp=t)
+            t += 0.05
+        self.assertEqual(estimator.rejected, 1)
+        self.assertLess(state["speed"], 1.5)
+
+    def test_heading_integrates_steering(self):
+        estimator = SpeedEstimator(gain=0.02, time_constant=0.01, wheelbase=0.15)
+        t = 0.0
+        estimator.update(50, steering_angle=30, timestamp=t)
+        for _ in range(50):
+            t += 0.01
+            state = estimator.update(50, steering_angle=30, timestamp=t)
+        self.assertGreater(state["heading"], 0)
+        self.assertGreater(state["y"], 0)
+
+    def test_fit_model(self):
+        estimator = SpeedEstimator()
+        gain, dead_band = estimator.fit_model([0, 20, 40, 60, 80], [0, 0.2, 0.6, 1.0, 1.4])
+        self.assertAlmostEqual(gain, 0.02)
+        self.assertAlmostEqual(dead_band, 10)
+
+    def test_reset(self):
+        estimator = SpeedEstimator()
+        estimator.update(100, timestamp=0.0)
+        estimator.update(100, timestamp=1.0)
+        estimator.reset()
+        self.assertEqual(estimator.state()["speed"], 0.0)
+        self.assertEqual(estimator.state()["odometer"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import math
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.Trajectory import Trajectory
+
+
+class FakeClock:
+    """Horloge simulée : chaque sommeil dure 2 ms de plus que demandé (gigue du système)."""
+
+    def __init__(self, overshoot=0.002):
+        self.now = 0.0
+        self.overshoot = overshoot
+
+    def clock(self):
+        self.now += 1e-6
+        return self.now
+
+    def sleep(self, duration):
+        self.now += duration + self.overshoot
+
+
+class TestTrajectory(unittest.TestCase):
+
+    def test_compile_keeps_only_changes(self):
+        trajectory = Trajectory.compile(12, 0.03,
+                                        servo=lambda t: 45 + 20 * math.sin(2 * math.pi * t / 12),
+                                        motor=lambda t: 35)
+        angles = [a for _, a, _ in trajectory.setpoints if a is not None]
+        speeds = [s for _, _, s in trajectory.setpoints if s is not None]
+        self.assertEqual(speeds, [35])
+        self.assertLess(len(trajectory), 400)
+        self.assertTrue(all(isinstance(a, int) for a in angles))
+        self.assertTrue(all(a != b for a, b in zip(angles, angles[1:])))
+        self.assertEqual(min(angles), 25)
+        self.assertEqual(max(angles), 65)
+
+    def test_playback_does_not_drift(self):
+        """Avec un sommeil qui dépasse toujours de 2 ms, le retard ne s'accumule pas."""
+        fake = FakeClock()
+        trajectory = Trajectory([(i * 0.01, i, None) for i in range(100)], duration=1.0)
+        applied = []
+        report = trajectory.play(applied.append, None, clock=fake.clock, sleep=fake.sleep)
+        self.assertEqual(applied, list(range(100)))
+        self.assertEqual(report["writes"], 100)
+        self.assertLess(report["max_late_ms"], 2.5)
+        self.assertLess(abs(report["duration_error_ms"]), 2.5)
+
+    def test_stop_event_interrupts_playback(self):
+        fake = FakeClock(overshoot=0)
+        stop = threading.Event()
+        applied = []
+
+        def apply_motor(speed):
+            applied.append(speed)
+            if len(applied) == 3:
+                stop.set()
+
+        trajectory = Trajectory([(i * 0.1, None, i) for i in range(10)], duration=1.0)
+        report = trajectory.play(None, apply_motor, stop_event=stop, clock=fake.clock, sleep=fake.sleep)
+        self.assertEqual(applied, [0, 1, 2])
+        self.assertEqual(report["writes"], 3)
+
+    def test_unsorted_setpoints_are_rejected(self):
+        with self.assertRaises(ValueError):
+            Trajectory([(0.2, 1, None), (0.1, 2, None)], duration=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+from unittest.mock import MagicMock
+import json
+import os
+import sys
+import tempfile
+import types
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from projet_voiture.Tuning import TuningConfig, DEFAULTS, validate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTuningConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "tuning.json")
+        self.clock = FakeClock()
+
+    def write(self, content):
+        with open(self.path, "w") as f:
+            json.dump(content, f)
+        # Date de modification distincte même si deux écritures tombent dans la même tranche
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def test_defaults_without_file(self):
+        tuning = TuningConfig(self.path)
+        self.assertEqual(tuning.values, DEFAULTS)
+        self.assertIsNone(tuning.poll())
+
+    def test_partial_file_overrides_defaults(self):
+        self.write({"side_threshold": 15})
+        tuning = TuningConfig(self.path)
+        self.assertEqual(tuning.values["side_threshold"], 15)
+        self.assertEqual(tuning.values["front_threshold"], DEFAULTS["front_threshold"])
+
+    def test_validation(self):
+        values = dict(DEFAULTS)
+        self.assertEqual(validate(values), [])
+        self.assertTrue(validate(dict(values, side_threshold="12")))
+        self.assertTrue(validate(dict(values, motor_speed_forwards=True)))
+        self.assertTrue(validate(dict(values, motor_speed_forwards=120)))
+        self.assertTrue(validate(dict(values, inconnu=1)))
+        self.assertTrue(validate(dict(values, emergency_threshold=50)))  # Au-delà du seuil avant
+        self.assertTrue(validate(dict(values, angle_central=70, angle_virage_droite=30)))  # Butée du servo
+
+    def test_update_is_applied_by_poll_only(self):
+        tuning = TuningConfig(self.path, clock=self.clock)
+        tuning.update({"motor_speed_forwards": 50, "duree_virage": 0.3})
+        self.assertEqual(tuning.values["motor_speed_forwards"], 35)  # Pas au milieu d'une itération
+        self.assertEqual(tuning.describe()["values"]["motor_speed_forwards"], 50)
+        self.assertEqual(tuning.poll(), {"motor_speed_forwards": 50, "duree_virage": 0.3})
+        self.assertEqual(tuning.values["motor_speed_forwards"], 50)
+        # Écrit sur disque, sans rechargement de sa propre écriture
+        self.clock.now = 10
+        self.assertIsNone(tuning.poll())
+        self.assertEqual(TuningConfig(self.path).values["motor_speed_forwards"], 50)
+
+    def test_invalid_update_keeps_current_values(self):
+        tuning = TuningConfig(self.path)
+        with self.assertRaises(ValueError):
+            tuning.update({"motor_speed_forwards": 50, "side_threshold": -1})
+        self.assertIsNone(tuning.poll())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_file_change_is_reloaded(self):
+        tuning = TuningConfig(self.path, check_interval=0.5, clock=self.clock)
+        self.assertIsNone(tuning.poll())
+        self.write({"front_threshold": 60, "emergency_threshold": 50})
+        self.clock.now = 0.2
+        self.assertIsNone(tuning.poll())  # Intervalle de vérification non écoulé
+        self.clock.now = 0.6
+        self.assertEqual(tuning.poll(), {"front_threshold": 60, "emergency_threshold": 50})
+
+    def test_invalid_file_change_is_refused(self):
+        tuning = TuningConfig(self.path, clock=self.clock)
+        tuning.poll()
+        self.write({"front_threshold": 10})  # Sous le seuil d'urgence
+        self.clock.now = 1
+        self.assertIsNone(tuning.poll())
+        self.assertEqual(tuning.values, DEFAULTS)
+        self.assertTrue(tuning.describe()["error"])
+
+    def test_server_instance_is_never_pending(self):
+        server = TuningConfig(self.path, polled=False)
+        car = TuningConfig(self.path, clock=self.clock)
+        server.update({"motor_speed_forwards": 50})
+        self.assertFalse(server.describe()["pending"])
+        self.assertEqual(server.values["motor_speed_forwards"], 50)
+        self.clock.now = 1
+        self.assertEqual(car.poll(), {"motor_speed_forwards": 50})  # Par le fichier
+
+    def test_update_merges_onto_hand_edits(self):
+        server = TuningConfig(self.path, polled=False)
+        server.update({"motor_speed_forwards": 50})
+        self.write({"motor_speed_forwards": 50, "side_threshold": 20})  # Modification à la main
+        self.assertEqual(server.describe()["values"]["side_threshold"], 20)
+        server.update({"duree_virage": 0.3})
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.assertEqual((saved["side_threshold"], saved["motor_speed_forwards"], saved["duree_virage"]), (20, 50, 0.3))
+
+    def test_hand_edit_before_update_is_kept_pending(self):
+        tuning = TuningConfig(self.path, clock=self.clock)
+        self.write({"side_threshold": 20})
+        tuning.update({"duree_virage": 0.3})
+        self.assertEqual(tuning.poll(), {"side_threshold": 20, "duree_virage": 0.3})
+
+
+class TestTuningIntegration(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tuning = TuningConfig(os.path.join(self.tmp_dir.name, "tuning.json"))
+
+    def test_reload_tuning_sets_attributes(self):
+        from projet_voiture.ControllerCar import ControllerCar
+        car = types.SimpleNamespace(tuning=self.tuning)
+        car.apply_tuning = lambda values: ControllerCar.apply_tuning(car, values)
+        ControllerCar.apply_tuning(car, self.tuning.values)
+        self.tuning.update({"side_threshold": 20})
+        self.assertEqual(ControllerCar.reload_tuning(car), {"side_threshold": 20})
+        self.assertEqual(car.side_threshold, 20)
+        self.assertEqual(ControllerCar.reload_tuning(car), {})
+
+    def test_api_config(self):
+        from projet_voiture.WebServerCar import VoitureServer
+        server = VoitureServer(autonomous_controller=MagicMock(tuning=self.tuning), basic_controller=MagicMock())
+        client = server.app.test_client()
+        self.assertEqual(client.get('/api/config').get_json()["values"], DEFAULTS)
+        response = client.post('/api/config', json={"duree_virage": 0.6})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["values"]["duree_virage"], 0.6)
+        self.assertEqual(client.post('/api/config', json={"duree_virage": 60}).status_code, 400)
+        self.assertEqual(self.tuning.poll(), {"duree_virage": 0.6})
+
+
+if __name__ == '__main__':
+    unittest.main()
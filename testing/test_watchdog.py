@@ -0,0 +1,104 @@
+import unittest
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+with patch.dict('sys.modules', {'smbus': MagicMock()}):
+    from projet_voiture.Watchdog import EmergencyStop, Watchdog, MODE1, ALL_LED_ON_L, ALL_OFF_BLOCK, AUTO_INCREMENT
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEmergencyStop(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = MagicMock()
+        self.bus.read_byte_data.return_value = 0x81  # RESTART | ALLCALL
+        self.stop = EmergencyStop(address=0x40, bus=self.bus)
+
+    def test_auto_increment_prepared_at_construction(self):
+        self.bus.write_byte_data.assert_called_once_with(0x40, MODE1, 0x01 | AUTO_INCREMENT)
+
+    def test_trigger_writes_all_off_in_one_block(self):
+        self.bus.reset_mock()
+        latency = self.stop.trigger()
+        self.bus.read_byte_data.assert_not_called()
+        self.bus.write_i2c_block_data.assert_called_once_with(0x40, ALL_LED_ON_L, ALL_OFF_BLOCK)
+        self.assertGreaterEqual(latency, 0.0)
+
+    def test_halt_precedes_the_stop_write(self):
+        calls = []
+        self.bus.write_i2c_block_data.side_effect = lambda *args: calls.append("arrêt")
+        stop = EmergencyStop(address=0x40, bus=self.bus, halt=lambda: calls.append("figé"))
+        stop.trigger()
+        self.assertEqual(calls, ["figé", "arrêt"])
+
+
+class TestWatchdog(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.stop_path = MagicMock(return_value=0.0004)
+        self.on_trip = MagicMock()
+        self.watchdog = Watchdog(self.stop_path, deadline=0.5, period=10, on_trip=self.on_trip, clock=self.clock)
+        self.addCleanup(self.watchdog.close)
+
+    def test_disarmed_watchdog_never_trips(self):
+        self.clock.now = 10
+        self.assertFalse(self.watchdog.check())
+        self.stop_path.assert_not_called()
+
+    def test_fed_loop_does_not_trip(self):
+        self.watchdog.arm()
+        for _ in range(10):
+            self.clock.now += 0.3
+            self.watchdog.feed()
+            self.assertFalse(self.watchdog.check())
+
+    def test_missed_deadline_stops_once_and_is_recorded(self):
+        self.watchdog.arm()
+        self.clock.now += 0.6
+        self.assertTrue(self.watchdog.check())
+        self.assertFalse(self.watchdog.check())
+        self.stop_path.assert_called_once()
+        self.on_trip.assert_called_once()
+        report = self.watchdog.report()
+        self.assertEqual(report["missed"], 1)
+        self.assertAlmostEqual(report["max_stop_ms"], 0.4)
+        self.assertAlmostEqual(report["events"][0]["late_s"], 0.6)
+
+    def test_failed_stop_is_recorded(self):
+        self.stop_path.side_effect = OSError("Remote I/O error")
+        self.watchdog.arm()
+        self.clock.now += 1
+        self.assertTrue(self.watchdog.check())
+        self.assertEqual(self.watchdog.report()["events"][0]["error"], "Remote I/O error")
+
+    def test_rearm_clears_trip(self):
+        self.watchdog.arm()
+        self.clock.now += 1
+        self.watchdog.check()
+        self.watchdog.arm()
+        self.assertFalse(self.watchdog.tripped)
+
+    def test_thread_detects_stall(self):
+        stop_path = MagicMock(return_value=0.0)
+        watchdog = Watchdog(stop_path, deadline=0.05, period=0.01)
+        self.addCleanup(watchdog.close)
+        watchdog.arm()
+        time.sleep(0.2)
+        self.assertTrue(watchdog.tripped)
+        stop_path.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()